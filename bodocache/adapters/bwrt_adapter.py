@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Sequence
+import ctypes
+import ctypes.util
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
 
 try:  # pragma: no cover - optional fast path
     from bwrt import _bwrt as bw  # type: ignore
@@ -27,37 +31,76 @@ else:
     _HAVE_CTYPES = False
 
 
-def _ptr_from_obj(obj: Any) -> int:
+# Memoized pointer extractors keyed by object type. submit_and_wait calls
+# _ptr_from_obj for A/B/C on every wave, and callers pass the same array type
+# throughout, so probe an object's interfaces once per type and reuse a
+# specialised extractor afterwards (one dict hit, no getattr chains).
+_extractors: Dict[type, Callable[[Any], int]] = {}
+
+
+def _cuda_ptr(cai: dict) -> int:
+    data = cai["data"][0]
+    if data is None:
+        # Zero-size allocations may advertise a null pointer.
+        return 0
+    if isinstance(data, (tuple, list)):
+        return int(data[0])
+    return int(data)
+
+
+def _select_extractor(obj: Any) -> Callable[[Any], int] | None:
     if isinstance(obj, int):
-        return obj
-    ai = getattr(obj, "__array_interface__", None) or getattr(obj, "array_interface", None)
-    if ai and "data" in ai:
-        return int(ai["data"][0])
-    cai = getattr(obj, "__cuda_array_interface__", None) or getattr(obj, "cuda_array_interface", None)
-    if cai and "data" in cai:
-        data = cai["data"][0]
-        if isinstance(data, (tuple, list)):
-            return int(data[0])
-        return int(data)
+        return lambda o: int(o)
+    if getattr(obj, "__array_interface__", None):
+        return lambda o: int(o.__array_interface__["data"][0])
+    if getattr(obj, "array_interface", None):
+        return lambda o: int(o.array_interface["data"][0])
+    if getattr(obj, "__cuda_array_interface__", None):
+        return lambda o: _cuda_ptr(o.__cuda_array_interface__)
+    if getattr(obj, "cuda_array_interface", None):
+        return lambda o: _cuda_ptr(o.cuda_array_interface)
     buf = getattr(obj, "data", None)
     if buf is not None and hasattr(buf, "ptr"):
-        return int(buf.ptr)
-    raise TypeError(
-        "Provide int pointer, NumPy/CuPy array, or object with array_interface/cuda_array_interface"
-    )
+        return lambda o: int(o.data.ptr)
+    return None
+
+
+def _ptr_from_obj(obj: Any) -> int:
+    extractor = _extractors.get(type(obj))
+    if extractor is None:
+        extractor = _select_extractor(obj)
+        if extractor is None:
+            raise TypeError(
+                "Provide int pointer, NumPy/CuPy array, or object with array_interface/cuda_array_interface"
+            )
+        _extractors[type(obj)] = extractor
+    return extractor(obj)
 
 
 def _normalise_tile_order(to_seq: Any) -> List[Tuple[int, int]] | None:
     if to_seq is None:
         return None
     if isinstance(to_seq, (list, tuple)):
+        if not to_seq:
+            return []
+        # Fast path: homogeneous pair (or flat index) sequences convert in one
+        # NumPy pass; fall back to the per-item loop for ragged input.
+        try:
+            arr = np.asarray(to_seq, dtype=np.int64)
+        except (TypeError, ValueError):
+            arr = None
+        if arr is not None:
+            if arr.ndim == 2 and arr.shape[1] == 2:
+                return [(int(r), int(c)) for r, c in arr.tolist()]
+            if arr.ndim == 1:
+                # Flattened indices; decode later if runtime provides dims.
+                return [(int(i), 0) for i in arr.tolist()]
         out: List[Tuple[int, int]] = []
         for item in to_seq:
             if isinstance(item, (list, tuple)) and len(item) == 2:
                 out.append((int(item[0]), int(item[1])))
             else:
                 try:
-                    # Treat as flattened index; decode later if runtime provides dims.
                     idx = int(item)
                     out.append((idx, 0))
                 except Exception:  # pragma: no cover - defensive
@@ -69,80 +112,220 @@ def _normalise_tile_order(to_seq: Any) -> List[Tuple[int, int]] | None:
 def _flatten_tile_order(tile_pairs: List[Tuple[int, int]] | None) -> List[int] | None:
     if not tile_pairs:
         return None
-    return [int(r) << 16 | int(c) for r, c in tile_pairs]
+    # Bit-pack (row, col) -> row<<16|col in a single vector op.
+    arr = np.asarray(tile_pairs, dtype=np.int64).reshape(-1, 2)
+    return ((arr[:, 0] << 16) | arr[:, 1]).tolist()
+
+
+# Fixed-capacity packed C mirror of WaveSpec. Filling this struct is plain
+# memory writes, versus ~1us of type-dispatched setter per attribute on the
+# pybind object, so the C entry point is preferred when libbwrt exports it.
+_MAX_TILES = 1024
+_MAX_PACK = 16
+
+
+class _CWaveSpec(ctypes.Structure):
+    _fields_ = [
+        ("bm", ctypes.c_int32),
+        ("bn", ctypes.c_int32),
+        ("bk", ctypes.c_int32),
+        ("cluster_x", ctypes.c_int32),
+        ("cluster_y", ctypes.c_int32),
+        ("swap_begin", ctypes.c_int32),
+        ("swap_end", ctypes.c_int32),
+        ("tmem_columns", ctypes.c_int32),
+        ("tmem_phases", ctypes.c_int32),
+        ("tmem_double_buffer", ctypes.c_uint8),
+        ("n_tile", ctypes.c_int32),
+        ("tile_flat", ctypes.c_int32 * _MAX_TILES),
+        ("n_pack", ctypes.c_int32),
+        ("pack_order", ctypes.c_int32 * _MAX_PACK),
+    ]
+
+
+def _fill_cwavespec(spec_any: Any) -> _CWaveSpec:
+    if not isinstance(spec_any, dict):
+        raise TypeError("C wavespec path expects a dict spec")
+    spec = _CWaveSpec()
+    spec.bm = int(spec_any.get("bm", 0))
+    spec.bn = int(spec_any.get("bn", 0))
+    spec.bk = int(spec_any.get("bk", 0))
+    cluster = spec_any.get("cluster_shape", (spec_any.get("cluster_x", 1), spec_any.get("cluster_y", 1)))
+    spec.cluster_x, spec.cluster_y = int(cluster[0]), int(cluster[1])
+    swap_window = spec_any.get("swap_window", (spec_any.get("swap_begin", 0), spec_any.get("swap_end", 1)))
+    spec.swap_begin, spec.swap_end = int(swap_window[0]), int(swap_window[1])
+    tmem = spec_any.get("tmem_layout", {})
+    if isinstance(tmem, dict):
+        spec.tmem_columns = int(tmem.get("columns", 0))
+        spec.tmem_phases = int(tmem.get("phases", 0))
+        spec.tmem_double_buffer = 1 if tmem.get("double_buffer", False) else 0
+    tile_flat = _flatten_tile_order(_normalise_tile_order(spec_any.get("tile_order"))) or []
+    if len(tile_flat) > _MAX_TILES:
+        raise ValueError(f"tile_order too long for C wavespec: {len(tile_flat)} > {_MAX_TILES}")
+    spec.n_tile = len(tile_flat)
+    spec.tile_flat[:len(tile_flat)] = tile_flat
+    pack_order = [int(x) for x in spec_any.get("pack_order", [])]
+    if len(pack_order) > _MAX_PACK:
+        raise ValueError(f"pack_order too long for C wavespec: {len(pack_order)} > {_MAX_PACK}")
+    spec.n_pack = len(pack_order)
+    spec.pack_order[:len(pack_order)] = pack_order
+    return spec
+
+
+def _load_bwrt_clib():
+    """Load libbwrt's C submit entry point if the shared library exports it."""
+    try:
+        path = ctypes.util.find_library("bwrt")
+        if path is None:
+            return None
+        lib = ctypes.CDLL(path)
+        fn = getattr(lib, "bwrt_submit_wave_c", None)
+        if fn is None:
+            return None
+        fn.restype = ctypes.c_int
+        fn.argtypes = (
+            ctypes.c_int,
+            ctypes.POINTER(_CWaveSpec),
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+        )
+        return lib
+    except OSError:  # pragma: no cover - defensive
+        return None
+
+
+_bwrt_clib = _load_bwrt_clib()
 
 
 class BwRuntimeAdapter:
-    """Thin wrapper that normalises bw-runtime's pybind / ctypes APIs."""
+    """Thin wrapper that normalises bw-runtime's pybind / ctypes APIs.
+
+    The backend is selected once at construction: instantiating this class
+    returns a subclass specialised for whichever binding is installed, so the
+    per-wave `_to_spec` path carries no backend branching or hasattr probes.
+    """
+
+    def __new__(cls, device_index: int = 0):
+        if cls is BwRuntimeAdapter:
+            if _bwrt_clib is not None:
+                cls = _CStructBwAdapter
+            elif _HAVE_PYBIND:
+                cls = _PybindBwAdapter
+            elif _HAVE_CTYPES:
+                cls = _CtypesBwAdapter
+            else:
+                raise RuntimeError(
+                    "bwrt runtime is not installed; install bwrt wheel with either pybind or ctypes backend"
+                )
+        return super().__new__(cls)
 
     def __init__(self, device_index: int = 0) -> None:
-        if _HAVE_PYBIND:
-            self._fast = True
-            self._runtime = bw.Runtime(device_index)  # type: ignore[attr-defined]
-        elif _HAVE_CTYPES:
-            self._fast = False
-            self._runtime = _BwRt(device_index=device_index)  # type: ignore[operator]
-        else:
-            raise RuntimeError(
-                "bwrt runtime is not installed; install bwrt wheel with either pybind or ctypes backend"
-            )
+        raise NotImplementedError  # pragma: no cover - subclasses override
 
     def _to_spec(self, spec_any: Any):
-        if _HAVE_PYBIND:
-            if isinstance(spec_any, dict):
-                bm = int(spec_any.get("bm", 0))
-                bn = int(spec_any.get("bn", 0))
-                bk = int(spec_any.get("bk", 0))
-                cluster = spec_any.get("cluster_shape", (1, 1))
-                cx, cy = int(cluster[0]), int(cluster[1])
-                swap_window = spec_any.get("swap_window", (0, 1))
-                sb, se = int(swap_window[0]), int(swap_window[1])
-                tile_pairs = _normalise_tile_order(spec_any.get("tile_order"))
-                pack_order = [int(x) for x in spec_any.get("pack_order", [])]
-                tmem = spec_any.get("tmem_layout", {})
-                io_extents = spec_any.get("io_extents", [])
-            else:
-                bm = int(spec_any.bm)
-                bn = int(spec_any.bn)
-                bk = int(spec_any.bk)
-                cluster = getattr(spec_any, "cluster_shape", (getattr(spec_any, "cluster_x", 1), getattr(spec_any, "cluster_y", 1)))
-                cx, cy = int(cluster[0]), int(cluster[1])
-                swap_window = getattr(spec_any, "swap_window", (getattr(spec_any, "swap_begin", 0), getattr(spec_any, "swap_end", 1)))
-                sb, se = int(swap_window[0]), int(swap_window[1])
-                tile_pairs = _normalise_tile_order(getattr(spec_any, "tile_order", None))
-                if not tile_pairs:
-                    tile_pairs = _normalise_tile_order(getattr(spec_any, "tile_order_flat", None))
-                pack_order = [int(x) for x in getattr(spec_any, "pack_order", [])]
-                tmem = getattr(spec_any, "tmem_layout", {})
-                io_extents = getattr(spec_any, "io_extents", [])
-            spec = bw.WaveSpec()  # type: ignore[attr-defined]
-            spec.bm, spec.bn, spec.bk = bm, bn, bk
-            if hasattr(spec, "cluster_shape"):
-                spec.cluster_shape = (cx, cy)
-            if hasattr(spec, "cluster_x"):
-                spec.cluster_x, spec.cluster_y = cx, cy
-            spec.swap_begin, spec.swap_end = sb, se
-            if hasattr(spec, "swap_window"):
-                spec.swap_window = (sb, se)
-            if hasattr(spec, "pack_order"):
-                spec.pack_order = pack_order
+        raise NotImplementedError  # pragma: no cover - subclasses override
+
+    def submit_and_wait(self, wavespec_any: Any, A: Any, B: Any, C: Any):
+        raise NotImplementedError  # pragma: no cover - subclasses override
+
+    def set_weights(self, weights: Any) -> None:
+        raise NotImplementedError  # pragma: no cover - subclasses override
+
+
+class _PybindBwAdapter(BwRuntimeAdapter):
+    """pybind backend: WaveSpec attributes are probed once at construction."""
+
+    _fast = True
+
+    def __init__(self, device_index: int = 0) -> None:
+        self._runtime = bw.Runtime(device_index)  # type: ignore[attr-defined]
+        # Probe the WaveSpec surface once so _to_spec is straight-line code.
+        probe = bw.WaveSpec()  # type: ignore[attr-defined]
+        self._has_cluster_shape = hasattr(probe, "cluster_shape")
+        self._has_cluster_x = hasattr(probe, "cluster_x")
+        self._has_swap_window = hasattr(probe, "swap_window")
+        self._has_pack_order = hasattr(probe, "pack_order")
+        self._has_tile_order = hasattr(probe, "tile_order")
+        self._has_tile_order_flat = hasattr(probe, "tile_order_flat")
+        self._has_tmem_columns = hasattr(probe, "tmem_columns")
+        self._has_tmem_layout = hasattr(probe, "tmem_layout")
+        self._has_io_extents = hasattr(probe, "io_extents")
+
+    def _to_spec(self, spec_any: Any):
+        if isinstance(spec_any, dict):
+            bm = int(spec_any.get("bm", 0))
+            bn = int(spec_any.get("bn", 0))
+            bk = int(spec_any.get("bk", 0))
+            cluster = spec_any.get("cluster_shape", (1, 1))
+            cx, cy = int(cluster[0]), int(cluster[1])
+            swap_window = spec_any.get("swap_window", (0, 1))
+            sb, se = int(swap_window[0]), int(swap_window[1])
+            tile_pairs = _normalise_tile_order(spec_any.get("tile_order"))
+            pack_order = [int(x) for x in spec_any.get("pack_order", [])]
+            tmem = spec_any.get("tmem_layout", {})
+            io_extents = spec_any.get("io_extents", [])
+        else:
+            bm = int(spec_any.bm)
+            bn = int(spec_any.bn)
+            bk = int(spec_any.bk)
+            cluster = getattr(spec_any, "cluster_shape", (getattr(spec_any, "cluster_x", 1), getattr(spec_any, "cluster_y", 1)))
+            cx, cy = int(cluster[0]), int(cluster[1])
+            swap_window = getattr(spec_any, "swap_window", (getattr(spec_any, "swap_begin", 0), getattr(spec_any, "swap_end", 1)))
+            sb, se = int(swap_window[0]), int(swap_window[1])
+            tile_pairs = _normalise_tile_order(getattr(spec_any, "tile_order", None))
+            if not tile_pairs:
+                tile_pairs = _normalise_tile_order(getattr(spec_any, "tile_order_flat", None))
+            pack_order = [int(x) for x in getattr(spec_any, "pack_order", [])]
+            tmem = getattr(spec_any, "tmem_layout", {})
+            io_extents = getattr(spec_any, "io_extents", [])
+        spec = bw.WaveSpec()  # type: ignore[attr-defined]
+        spec.bm, spec.bn, spec.bk = bm, bn, bk
+        if self._has_cluster_shape:
+            spec.cluster_shape = (cx, cy)
+        if self._has_cluster_x:
+            spec.cluster_x, spec.cluster_y = cx, cy
+        spec.swap_begin, spec.swap_end = sb, se
+        if self._has_swap_window:
+            spec.swap_window = (sb, se)
+        if self._has_pack_order:
+            spec.pack_order = pack_order
+        if self._has_tile_order and tile_pairs is not None:
+            spec.tile_order = [(int(r), int(c)) for r, c in tile_pairs]  # type: ignore[attr-defined]
+        elif self._has_tile_order_flat:
             tile_flat = _flatten_tile_order(tile_pairs)
-            if hasattr(spec, "tile_order") and tile_pairs is not None:
-                spec.tile_order = [(int(r), int(c)) for r, c in tile_pairs]  # type: ignore[attr-defined]
-            elif hasattr(spec, "tile_order_flat") and tile_flat is not None:
+            if tile_flat is not None:
                 spec.tile_order_flat = tile_flat  # type: ignore[attr-defined]
-            if hasattr(spec, "tmem_columns") and isinstance(tmem, dict):
-                spec.tmem_columns = int(tmem.get("columns", 0))
-                spec.tmem_phases = int(tmem.get("phases", 0))
-                spec.tmem_double_buffer = bool(tmem.get("double_buffer", False))
-            if hasattr(spec, "tmem_layout") and isinstance(tmem, dict):
-                spec.tmem_layout = tmem  # type: ignore[attr-defined]
-            if hasattr(spec, "io_extents"):
-                spec.io_extents = list(io_extents)
-            return spec
+        if self._has_tmem_columns and isinstance(tmem, dict):
+            spec.tmem_columns = int(tmem.get("columns", 0))
+            spec.tmem_phases = int(tmem.get("phases", 0))
+            spec.tmem_double_buffer = bool(tmem.get("double_buffer", False))
+        if self._has_tmem_layout and isinstance(tmem, dict):
+            spec.tmem_layout = tmem  # type: ignore[attr-defined]
+        if self._has_io_extents:
+            spec.io_extents = list(io_extents)
+        return spec
+
+    def submit_and_wait(self, wavespec_any: Any, A: Any, B: Any, C: Any):
+        spec = self._to_spec(wavespec_any)
+        evt = self._runtime.submit_wave(spec, A, B, C)
+        self._runtime.wait(evt, 0)
+        return self._runtime.sample()
+
+    def set_weights(self, weights: Any) -> None:
+        self._runtime.set_weights(weights)
+
+
+class _CtypesBwAdapter(BwRuntimeAdapter):
+    """ctypes backend: specs pass through the wavespec_adapter helpers."""
+
+    _fast = False
+
+    def __init__(self, device_index: int = 0) -> None:
+        self._runtime = _BwRt(device_index=device_index)  # type: ignore[operator]
+
+    def _to_spec(self, spec_any: Any):
         if isinstance(spec_any, dict):
-            if not _HAVE_CTYPES:
-                raise RuntimeError("bwrt ctypes adapter unavailable; install bwrt runtime")
             cluster = spec_any.get("cluster_shape", (spec_any.get("cluster_x", 1), spec_any.get("cluster_y", 1)))
             swap_window = spec_any.get("swap_window", (spec_any.get("swap_begin", 0), spec_any.get("swap_end", 1)))
             enriched = dict(spec_any)
@@ -154,16 +337,10 @@ class BwRuntimeAdapter:
             if tile_flat and "tile_order_flat" not in enriched:
                 enriched["tile_order_flat"] = tile_flat
             return _ws_from_dict(enriched)  # type: ignore[misc]
-        if not _HAVE_CTYPES:
-            raise RuntimeError("bwrt ctypes adapter unavailable; install bwrt runtime")
         return _ws_from_proto(spec_any)  # type: ignore[misc]
 
     def submit_and_wait(self, wavespec_any: Any, A: Any, B: Any, C: Any):
         spec = self._to_spec(wavespec_any)
-        if self._fast:
-            evt = self._runtime.submit_wave(spec, A, B, C)
-            self._runtime.wait(evt, 0)
-            return self._runtime.sample()
         a_ptr = _ptr_from_obj(A)
         b_ptr = _ptr_from_obj(B)
         c_ptr = _ptr_from_obj(C)
@@ -172,19 +349,51 @@ class BwRuntimeAdapter:
         return self._runtime.sample()
 
     def set_weights(self, weights: Any) -> None:
-        if self._fast:
-            self._runtime.set_weights(weights)
-            return
         w_ptr = _ptr_from_obj(weights)
         self._runtime.set_weights(w_ptr)
 
 
+class _CStructBwAdapter(BwRuntimeAdapter):
+    """libbwrt C entry point: specs marshal as one packed ctypes struct.
+
+    Used when the installed libbwrt exports bwrt_submit_wave_c; the pybind
+    surface remains available separately for introspection.
+    """
+
+    _fast = False
+
+    def __init__(self, device_index: int = 0) -> None:
+        self._device_index = int(device_index)
+        self._lib = _bwrt_clib
+
+    def _to_spec(self, spec_any: Any) -> _CWaveSpec:
+        return _fill_cwavespec(spec_any)
+
+    def submit_and_wait(self, wavespec_any: Any, A: Any, B: Any, C: Any):
+        spec = self._to_spec(wavespec_any)
+        rc = self._lib.bwrt_submit_wave_c(
+            self._device_index,
+            ctypes.byref(spec),
+            _ptr_from_obj(A),
+            _ptr_from_obj(B),
+            _ptr_from_obj(C),
+        )
+        if rc != 0:
+            raise RuntimeError(f"bwrt_submit_wave_c failed with rc={rc}")
+        sample = getattr(self._lib, "bwrt_sample", None)
+        return sample() if sample is not None else None
+
+    def set_weights(self, weights: Any) -> None:
+        set_w = getattr(self._lib, "bwrt_set_weights", None)
+        if set_w is None:
+            raise RuntimeError("libbwrt does not export bwrt_set_weights")
+        set_w(self._device_index, ctypes.c_void_p(_ptr_from_obj(weights)))
+
+
 __all__: Iterable[str] = ("BwRuntimeAdapter", "_ptr_from_obj")
 
 
 if __name__ == "__main__":  # pragma: no cover - manual smoke test
-    import numpy as np
-
     adapter = BwRuntimeAdapter()
     spec = {
         "pack_order": [0, 1],
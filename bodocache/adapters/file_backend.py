@@ -23,12 +23,50 @@ class FileBackend:
     def exists(self, key: PageKey) -> bool:
         return self._path(key).exists()
 
-    def get(self, key: PageKey) -> Optional[bytes]:
+    def get(self, key: PageKey) -> Optional[memoryview]:
+        """Read a page, returning a memoryview over a freshly allocated buffer.
+
+        Callers that own a buffer pool should prefer get_into to skip the
+        allocation entirely.
+        """
         p = self._path(key)
         try:
-            return p.read_bytes()
+            size = os.stat(p).st_size
         except FileNotFoundError:
             return None
+        buf = bytearray(size)
+        n = self.get_into(key, buf)
+        if n is None:
+            return None
+        return memoryview(buf)[:n]
+
+    def get_into(self, key: PageKey, out_buf) -> Optional[int]:
+        """Read a page directly into a caller-provided writable buffer.
+
+        Returns the number of bytes read, or None if the page is missing.
+        Raises ValueError if the buffer is too small.
+        """
+        p = self._path(key)
+        try:
+            fd = os.open(str(p), os.O_RDONLY | os.O_CLOEXEC)
+        except FileNotFoundError:
+            return None
+        try:
+            size = os.fstat(fd).st_size
+            mv = memoryview(out_buf).cast('B')
+            if mv.readonly:
+                raise ValueError("out_buf must be writable")
+            if mv.nbytes < size:
+                raise ValueError(f"out_buf too small: need {size}, have {mv.nbytes}")
+            pos = 0
+            while pos < size:
+                n = os.readv(fd, [mv[pos:size]])
+                if n == 0:
+                    raise IOError(f"short read: expected {size} bytes, got {pos}")
+                pos += n
+            return pos
+        finally:
+            os.close(fd)
 
     def set(self, key: PageKey, value: bytes):
         p = self._path(key)
@@ -1,38 +1,215 @@
 from __future__ import annotations
 
+import ctypes
+import mmap
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Tuple
 
+import numpy as np
+
+try:  # pragma: no cover - optional native bulk-read helper
+    import bodocache_segio as _segio  # type: ignore
+except Exception:  # pragma: no cover - build with -DUSE_SEGIO=ON
+    _segio = None  # type: ignore
+
+# O_DIRECT requires the buffer, file offset, and transfer size to be aligned
+# to the logical block size; 4KiB covers common devices.
+DIRECT_IO_ALIGN = 4096
+
+
+def acquire_aligned_buffer(nbytes: int, align: int = DIRECT_IO_ALIGN) -> memoryview:
+    """Allocate a writable buffer whose base address is `align`-aligned.
+
+    Over-allocates by one alignment unit and slices to the aligned offset, so
+    the returned memoryview is suitable for O_DIRECT reads.
+    """
+    backing = np.empty(nbytes + align, dtype=np.uint8)
+    addr = backing.ctypes.data
+    shift = (-addr) % align
+    return memoryview(backing)[shift:shift + nbytes]
+
+
+def _buffer_address(mv: memoryview) -> int:
+    return ctypes.addressof(ctypes.c_char.from_buffer(mv))
+
 
 class SegmentedFileBackend:
     """
     Segment-per-layer file backend.
     Each (model_id, model_version, layer) maps to one file with fixed-size pages.
     Page offset = page_id * page_bytes.
+
+    Open segment descriptors are kept in a small LRU cache so the hot read
+    path is a single pread per range instead of open/seek/read/close.
     """
 
-    def __init__(self, root: str):
+    # Bound on cached open descriptors across all segments.
+    FD_CACHE_SIZE = 128
+    # Bound on cached read-only segment mappings.
+    MMAP_CACHE_SIZE = 64
+    # Reads at least this large get POSIX_FADV_WILLNEED before the pread so
+    # the kernel starts readahead for the whole super-range immediately.
+    FADVISE_THRESHOLD = 1 << 20
+
+    def __init__(self, root: str, use_mmap: bool = True, use_fadvise: bool = True):
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
+        # key -> (fd, seg_size). Guarded by _lock; seg_size is kept in sync
+        # with writes issued through this backend.
+        self._fd_cache: "OrderedDict[Tuple[str, str, int, bool], Tuple[int, int]]" = OrderedDict()
+        # Read-only mappings for read-mostly reuse: repeated reads become a
+        # single memcpy out of the page cache with no syscall per call.
+        self.use_mmap = use_mmap
+        self.use_fadvise = use_fadvise
+        self._mmap_cache: "OrderedDict[Tuple[str, str, int], Tuple[mmap.mmap, int]]" = OrderedDict()
+        # Segments already created via ensure_segment; lets repeat calls skip
+        # the mkdir/exists stat syscalls entirely.
+        self._ensured: set = set()
+        self._lock = threading.Lock()
 
     def _seg_path(self, model_id: str, model_version: str, layer: int) -> Path:
         return self.root / model_id / model_version / f"layer_{layer}.seg"
 
+    def _get_fd(self, model_id: str, model_version: str, layer: int, direct: bool = False) -> Tuple[int, int]:
+        """Return (fd, seg_size) for a segment, opening and caching on miss.
+
+        With `direct=True` the descriptor is opened with O_DIRECT (bypassing
+        the page cache); such descriptors are cached under a separate key.
+        """
+        key = (model_id, model_version, layer, direct)
+        with self._lock:
+            ent = self._fd_cache.get(key)
+            if ent is not None:
+                self._fd_cache.move_to_end(key)
+                return ent
+        p = self._seg_path(model_id, model_version, layer)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_RDWR | os.O_CREAT | os.O_CLOEXEC
+        if direct:
+            flags |= os.O_DIRECT
+        fd = os.open(str(p), flags, 0o644)
+        seg_size = os.fstat(fd).st_size
+        self._ensured.add((model_id, model_version, layer))
+        with self._lock:
+            ent = self._fd_cache.get(key)
+            if ent is not None:
+                # Raced with another opener; keep the cached one.
+                os.close(fd)
+                self._fd_cache.move_to_end(key)
+                return ent
+            self._fd_cache[key] = (fd, seg_size)
+            while len(self._fd_cache) > self.FD_CACHE_SIZE:
+                _, (old_fd, _) = self._fd_cache.popitem(last=False)
+                os.close(old_fd)
+        return fd, seg_size
+
+    def _update_size(self, model_id: str, model_version: str, layer: int, new_size: int) -> None:
+        with self._lock:
+            for direct in (False, True):
+                key = (model_id, model_version, layer, direct)
+                ent = self._fd_cache.get(key)
+                if ent is not None and new_size > ent[1]:
+                    self._fd_cache[key] = (ent[0], new_size)
+
+    def _get_mmap(self, model_id: str, model_version: str, layer: int, need: int):
+        """Return a read-only mapping covering at least `need` bytes, or None.
+
+        Mappings are cached per segment and remapped lazily when the segment
+        has grown past the mapped size.
+        """
+        key = (model_id, model_version, layer)
+        with self._lock:
+            ent = self._mmap_cache.get(key)
+            if ent is not None and ent[1] >= need:
+                self._mmap_cache.move_to_end(key)
+                return ent[0]
+        fd, seg_size = self._get_fd(model_id, model_version, layer)
+        if seg_size < need or seg_size == 0:
+            return None
+        try:
+            mm = mmap.mmap(fd, seg_size, prot=mmap.PROT_READ)
+        except (ValueError, OSError):  # pragma: no cover - mmap unsupported
+            return None
+        try:
+            mm.madvise(mmap.MADV_WILLNEED)
+        except (AttributeError, OSError):  # pragma: no cover - advisory only
+            pass
+        with self._lock:
+            old = self._mmap_cache.pop(key, None)
+            if old is not None:
+                old[0].close()
+            self._mmap_cache[key] = (mm, seg_size)
+            while len(self._mmap_cache) > self.MMAP_CACHE_SIZE:
+                _, (old_mm, _) = self._mmap_cache.popitem(last=False)
+                old_mm.close()
+        return mm
+
+    def _advise_willneed(self, fd: int, off: int, size: int) -> None:
+        if self.use_fadvise and size >= self.FADVISE_THRESHOLD:
+            try:
+                os.posix_fadvise(fd, off, size, os.POSIX_FADV_WILLNEED)
+            except OSError:  # pragma: no cover - advisory only
+                pass
+
+    def advise_dontneed_range(
+        self, model_id: str, model_version: str, layer: int, start_pid: int, end_pid: int, page_bytes: int
+    ) -> None:
+        """Tell the kernel a consumed range will not be reread soon.
+
+        Agents can call this after the last wave touching a layer to keep
+        one-shot sweeps from evicting hotter data out of the page cache.
+        """
+        if end_pid < start_pid:
+            return
+        fd, _ = self._get_fd(model_id, model_version, layer)
+        off = start_pid * page_bytes
+        size = (end_pid - start_pid + 1) * page_bytes
+        try:
+            os.posix_fadvise(fd, off, size, os.POSIX_FADV_DONTNEED)
+        except OSError:  # pragma: no cover - advisory only
+            pass
+
+    def close(self) -> None:
+        """Close all cached segment descriptors and mappings."""
+        with self._lock:
+            for mm, _ in self._mmap_cache.values():
+                try:
+                    mm.close()
+                except (BufferError, OSError):
+                    pass
+            self._mmap_cache.clear()
+            for fd, _ in self._fd_cache.values():
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._fd_cache.clear()
+
+    def __del__(self):  # pragma: no cover - best-effort cleanup
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def ensure_segment(self, model_id: str, model_version: str, layer: int):
+        key = (model_id, model_version, layer)
+        if key in self._ensured:
+            return
         p = self._seg_path(model_id, model_version, layer)
         p.parent.mkdir(parents=True, exist_ok=True)
         if not p.exists():
             p.touch()
+        self._ensured.add(key)
 
     def write_page(self, model_id: str, model_version: str, layer: int, page_id: int, page_bytes: int, data: bytes):
         assert len(data) == page_bytes, "data length must equal page_bytes"
-        self.ensure_segment(model_id, model_version, layer)
-        p = self._seg_path(model_id, model_version, layer)
-        with p.open('r+b') as f:
-            off = page_id * page_bytes
-            f.seek(off)
-            f.write(data)
+        fd, _ = self._get_fd(model_id, model_version, layer)
+        off = page_id * page_bytes
+        os.pwrite(fd, data, off)
+        self._update_size(model_id, model_version, layer, off + page_bytes)
 
     def read_range(self, model_id: str, model_version: str, layer: int, start_pid: int, end_pid: int, page_bytes: int) -> bytes:
         """Read a consecutive page range [start_pid, end_pid] inclusive as one coalesced IO.
@@ -41,20 +218,21 @@ class SegmentedFileBackend:
         """
         if end_pid < start_pid:
             return b""
-        self.ensure_segment(model_id, model_version, layer)
-        p = self._seg_path(model_id, model_version, layer)
+        fd, seg_size = self._get_fd(model_id, model_version, layer)
         size = (end_pid - start_pid + 1) * page_bytes
-        with p.open('rb') as f:
-            off = start_pid * page_bytes
-            f.seek(0, os.SEEK_END)
-            seg_size = f.tell()
-            if off + size > seg_size:
-                raise IOError(f"segment too small for read: need {off+size} bytes, have {seg_size} (layer={layer} start={start_pid} end={end_pid})")
-            f.seek(off)
-            buf = f.read(size)
-            if len(buf) != size:
-                raise IOError(f"short read: expected {size} bytes, got {len(buf)}")
-            return buf
+        off = start_pid * page_bytes
+        if off + size > seg_size:
+            raise IOError(f"segment too small for read: need {off+size} bytes, have {seg_size} (layer={layer} start={start_pid} end={end_pid})")
+        if self.use_mmap:
+            mm = self._get_mmap(model_id, model_version, layer, off + size)
+            if mm is not None:
+                # One copy out of the page cache, no syscall.
+                return bytes(memoryview(mm)[off:off + size])
+        self._advise_willneed(fd, off, size)
+        buf = os.pread(fd, size, off)
+        if len(buf) != size:
+            raise IOError(f"short read: expected {size} bytes, got {len(buf)}")
+        return buf
 
     def read_range_into(
         self,
@@ -72,27 +250,120 @@ class SegmentedFileBackend:
         """
         if end_pid < start_pid:
             return 0
-        self.ensure_segment(model_id, model_version, layer)
-        p = self._seg_path(model_id, model_version, layer)
+        fd, seg_size = self._get_fd(model_id, model_version, layer)
         size = (end_pid - start_pid + 1) * page_bytes
         mv = memoryview(out_buf)
         if mv.readonly:
             raise ValueError("out_buf must be writable")
         if mv.nbytes < size:
             raise ValueError(f"out_buf too small: need {size}, have {mv.nbytes}")
-        with p.open('rb') as f:
-            off = start_pid * page_bytes
-            f.seek(0, os.SEEK_END)
-            seg_size = f.tell()
-            if off + size > seg_size:
-                raise IOError(
-                    f"segment too small for read: need {off+size} bytes, have {seg_size} "
-                    f"(layer={layer} start={start_pid} end={end_pid})"
-                )
-            f.seek(off)
-            # Use readinto for zero-copy into provided buffer
-            view = mv.cast('B')[:size]
-            n = f.readinto(view)
+        off = start_pid * page_bytes
+        if off + size > seg_size:
+            raise IOError(
+                f"segment too small for read: need {off+size} bytes, have {seg_size} "
+                f"(layer={layer} start={start_pid} end={end_pid})"
+            )
+        view = mv.cast('B')[:size]
+        if self.use_mmap:
+            mm = self._get_mmap(model_id, model_version, layer, off + size)
+            if mm is not None:
+                # Single memcpy from the mapping into the caller's buffer.
+                view[:] = memoryview(mm)[off:off + size]
+                return size
+        # Scatter read straight into the provided buffer; no seek, reentrant.
+        self._advise_willneed(fd, off, size)
+        n = os.preadv(fd, [view], off)
+        if n != size:
+            raise IOError(f"short read: expected {size} bytes, got {n}")
+        return n
+
+    def read_range_into_bulk(
+        self,
+        model_id: str,
+        model_version: str,
+        layer: int,
+        offsets,
+        sizes,
+        out_buf,
+    ) -> int:
+        """Read many (offset, size) extents from one segment into out_buf.
+
+        Extents are packed back-to-back into the buffer in order. When the
+        native bodocache_segio module is built, the pread loop runs in C with
+        the GIL released, so planner threads are not blocked by the I/O;
+        otherwise it degrades to per-extent os.preadv calls. Returns total
+        bytes read.
+        """
+        offsets = np.ascontiguousarray(offsets, dtype=np.uint64)
+        sizes = np.ascontiguousarray(sizes, dtype=np.uint64)
+        if offsets.shape != sizes.shape:
+            raise ValueError("offsets/sizes length mismatch")
+        if len(offsets) == 0:
+            return 0
+        fd, seg_size = self._get_fd(model_id, model_version, layer)
+        if int((offsets + sizes).max()) > seg_size:
+            raise IOError(
+                f"segment too small for bulk read: need {int((offsets + sizes).max())} bytes, "
+                f"have {seg_size} (layer={layer})"
+            )
+        total = int(sizes.sum())
+        mv = memoryview(out_buf)
+        if mv.readonly:
+            raise ValueError("out_buf must be writable")
+        if mv.nbytes < total:
+            raise ValueError(f"out_buf too small: need {total}, have {mv.nbytes}")
+        if _segio is not None:
+            return int(_segio.read_range_into_bulk(fd, offsets, sizes, mv))
+        view = mv.cast('B')
+        pos = 0
+        for off, size in zip(offsets.tolist(), sizes.tolist()):
+            n = os.preadv(fd, [view[pos:pos + size]], off)
             if n != size:
                 raise IOError(f"short read: expected {size} bytes, got {n}")
-            return n
+            pos += size
+        return pos
+
+    def read_range_into_direct(
+        self,
+        model_id: str,
+        model_version: str,
+        layer: int,
+        start_pid: int,
+        end_pid: int,
+        page_bytes: int,
+        out_buf,
+    ) -> int:
+        """read_range_into variant that bypasses the page cache via O_DIRECT.
+
+        Large coalesced reads are consumed once and shipped onward, so the
+        kernel->user double copy through the page cache is pure overhead. The
+        fast path requires the destination address, file offset, and size to
+        all be block-aligned (use acquire_aligned_buffer); on any alignment or
+        O_DIRECT failure it falls back to the buffered path.
+        """
+        if end_pid < start_pid:
+            return 0
+        size = (end_pid - start_pid + 1) * page_bytes
+        off = start_pid * page_bytes
+        mv = memoryview(out_buf)
+        if mv.readonly:
+            raise ValueError("out_buf must be writable")
+        if mv.nbytes < size:
+            raise ValueError(f"out_buf too small: need {size}, have {mv.nbytes}")
+        aligned = (
+            size % 512 == 0
+            and off % 512 == 0
+            and _buffer_address(mv) % DIRECT_IO_ALIGN == 0
+        )
+        if aligned:
+            try:
+                fd, seg_size = self._get_fd(model_id, model_version, layer, direct=True)
+                if off + size <= seg_size:
+                    view = mv.cast('B')[:size]
+                    n = os.preadv(fd, [view], off)
+                    if n == size:
+                        return n
+            except OSError:
+                # Filesystem without O_DIRECT support (e.g. tmpfs).
+                pass
+        return self.read_range_into(model_id, model_version, layer, start_pid, end_pid, page_bytes, out_buf)
@@ -42,3 +42,27 @@ class SegmentedUringBackend:
         offset = start_pid * page_bytes
         return int(self._uring.read_range_into(str(p), int(offset), int(size), out_buf))
 
+    def read_ranges_into(self, specs, out_bufs) -> list[int]:
+        """Submit a batch of range reads as one io_uring wave.
+
+        `specs` is a sequence of (model_id, model_version, layer, start_pid,
+        end_pid, page_bytes) tuples; `out_bufs` the matching writable buffers.
+        With a batch-capable native module this is a single SQ submit and one
+        reap for the whole wave; otherwise it degrades to per-range calls.
+        Returns the bytes read per range.
+        """
+        paths: list[str] = []
+        offsets: list[int] = []
+        sizes: list[int] = []
+        for model_id, model_version, layer, start_pid, end_pid, page_bytes in specs:
+            paths.append(str(self._seg_path(model_id, model_version, int(layer))))
+            offsets.append(int(start_pid) * int(page_bytes))
+            sizes.append(max(0, int(end_pid) - int(start_pid) + 1) * int(page_bytes))
+        batched = getattr(self._uring, "read_ranges_into", None)
+        if batched is not None:
+            return [int(x) for x in batched(paths, offsets, sizes, list(out_bufs))]
+        return [
+            int(self._uring.read_range_into(path, off, size, buf)) if size > 0 else 0
+            for path, off, size, buf in zip(paths, offsets, sizes, out_bufs)
+        ]
+
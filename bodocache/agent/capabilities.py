@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+# Frozen: the cached instance is shared by every caller, so it must not
+# be mutable through any one of them.
+@dataclass(frozen=True)
 class BackendCaps:
     cuda: bool = False
     hip: bool = False
@@ -12,24 +15,33 @@ class BackendCaps:
     io_uring: bool = False
 
 
+@functools.lru_cache(maxsize=1)
 def detect_backends() -> BackendCaps:
-    caps = BackendCaps()
+    """Probe which native modules are importable.
+
+    The result is cached for the process lifetime — callers probing per wave
+    pay one dict hit instead of repeated import machinery. Test suites that
+    manipulate the import path should call detect_backends.cache_clear().
+    """
     # CUDA/HIP/L0 are inferred by import of native module if built;
-    # expose booleans so apps can choose preferred backend.
+    # expose booleans so apps can choose preferred backend. A probe that
+    # raises anything (bad .so, init failure) means the backend is absent.
+    cuda = False
     try:
         import bodocache_agent_copy_engine as ce  # type: ignore
         # Heuristic: backend macro not visible; we inspect symbols by name
         # or try to instantiate and catch errors per platform.
         # Here we simply note presence of a native engine.
-        caps.cuda = True  # Mark generic native available; precise detection left to environment
+        cuda = True  # Mark generic native available; precise detection left to environment
     except Exception:
         pass
     # HIP and L0 detection are platform-specific; leave false unless explicitly built
     # io_uring module
+    io_uring = False
     try:
         import bodocache_agent_io_uring  # type: ignore
-        caps.io_uring = True
+        io_uring = True
     except Exception:
         pass
-    return caps
+    return BackendCaps(cuda=cuda, io_uring=io_uring)
 
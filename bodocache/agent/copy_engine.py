@@ -4,6 +4,37 @@ import time
 from dataclasses import dataclass
 from typing import Any, Callable, List, Optional, Protocol
 
+import numpy as np
+
+
+class HostBuffer(np.ndarray):
+    """Staging buffer handed out by acquire_host_buffer.
+
+    An ndarray subclass, so it supports the buffer protocol and
+    `__array_interface__` natively — NumPy/Numba consumers can view the
+    staging area zero-copy. Engines that pin the buffer and obtain a device
+    alias (cudaHostGetDevicePointer) can call register_device_pointer, after
+    which the buffer also advertises `__cuda_array_interface__` (v3) so
+    CuPy-style consumers can wrap it without a copy.
+    """
+
+    _device_ptr: Optional[int] = None
+
+    def register_device_pointer(self, ptr: int) -> None:
+        self._device_ptr = int(ptr)
+
+    @property
+    def __cuda_array_interface__(self) -> dict:
+        if self._device_ptr is None:
+            # Not pinned/registered; behave as if the attribute is absent.
+            raise AttributeError("__cuda_array_interface__")
+        return {
+            "shape": self.shape,
+            "typestr": "|u1",
+            "data": (self._device_ptr, False),
+            "version": 3,
+        }
+
 
 @dataclass
 class CopyOp:
@@ -15,7 +46,9 @@ class CopyOp:
     """
 
     # In a native engine, `src` would be a pointer into pinned host memory.
-    # In the sim backend we pass Python `bytes`.
+    # In the sim backend this is a HostBuffer, which exposes
+    # __array_interface__ (and __cuda_array_interface__ once registered) so
+    # downstream consumers can view the staging memory without copying.
     src: Any
     # Destination descriptor (engine/adapter-specific). For native engines,
     # this would be a device pointer plus shape/stride metadata managed by the
@@ -25,6 +58,12 @@ class CopyOp:
     stream_id: int = 0
     gpu_id: int = 0
     deadline_ms: int = 0
+    # Consumer stream from the destination's __cuda_array_interface__ (v3):
+    # 1 = legacy default stream, 2 = per-thread default stream, other ints are
+    # raw stream handles. None means the destination did not advertise one and
+    # the engine picks via stream_id. Native engines should enqueue the copy
+    # on this stream (cudaMemcpyAsync) instead of synchronizing.
+    stream_handle: Optional[int] = None
 
 
 class AbstractCopyEngine(Protocol):
@@ -39,16 +78,27 @@ class SimCopyEngine:
     compiled backend. It immediately invokes the callback for each op.
     """
 
+    # Simulated per-op latency. Zero by default: a per-op time.sleep() costs a
+    # >=100us syscall each, so a large batch would spend almost all its time
+    # idle. Set >0 to opt back into a hint of asynchrony.
+    per_op_delay_s: float = 0.0
+
     def submit(self, ops: List[CopyOp], callback: Callable[[CopyOp], None]) -> None:  # type: ignore[override]
-        # Micro-sleep to mimic async behavior without blocking too long.
+        # One coalesced sleep for the whole batch (capped), then dispatch
+        # callbacks in a tight loop.
+        if ops and self.per_op_delay_s > 0.0:
+            time.sleep(min(self.per_op_delay_s * len(ops), 1e-3))
         for op in ops:
-            # 0.05ms per op for a tiny hint of asynchrony
-            time.sleep(0.00005)
             callback(op)
 
     def acquire_host_buffer(self, nbytes: int):  # type: ignore[override]
-        # Return a writable bytearray as a stand-in for pinned memory.
-        return memoryview(bytearray(nbytes))
+        # Stand-in for pinned memory. Aligned so backends can use their
+        # O_DIRECT fast path when reading into it, and wrapped as a
+        # HostBuffer so consumers can view it zero-copy.
+        from bodocache.adapters.segmented_file_backend import acquire_aligned_buffer
+
+        mv = acquire_aligned_buffer(nbytes)
+        return np.frombuffer(mv, dtype=np.uint8).view(HostBuffer)
 
 
 def load_native_copy_engine() -> Optional[AbstractCopyEngine]:
@@ -1,20 +1,106 @@
 from __future__ import annotations
 
+import threading
 import time
-from typing import Callable, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from bodocache.adapters.segmented_file_backend import SegmentedFileBackend
 from .copy_engine import AbstractCopyEngine, CopyOp, get_copy_engine
 
 
+def _merge_ranges_kernel(layers, pbs, starts, ends):
+    """Linear scan over (layer, page_bytes, start_pid)-sorted plan columns.
+
+    Returns (bounds, sup_end): bounds[k]:bounds[k+1] are the row positions of
+    super-range k, and sup_end[k] its merged inclusive end page.
+    """
+    n = len(layers)
+    bounds = np.empty(n + 1, np.int64)
+    sup_end = np.empty(n, np.int64)
+    bounds[0] = 0
+    nb = 1
+    cur_end = ends[0]
+    for i in range(1, n):
+        if layers[i] != layers[i - 1] or pbs[i] != pbs[i - 1] or starts[i] > cur_end + 1:
+            sup_end[nb - 1] = cur_end
+            bounds[nb] = i
+            nb += 1
+            cur_end = ends[i]
+        elif ends[i] > cur_end:
+            cur_end = ends[i]
+    sup_end[nb - 1] = cur_end
+    bounds[nb] = n
+    return bounds[:nb + 1], sup_end[:nb]
+
+
+try:  # pragma: no cover - optional JIT for large plans
+    from numba import njit
+
+    _merge_ranges = njit(cache=True)(_merge_ranges_kernel)
+except ImportError:  # pragma: no cover - numba not installed
+    _merge_ranges = _merge_ranges_kernel
+
+
+@dataclass(frozen=True)
+class PlanArrays:
+    """Struct-of-arrays view of a plan at the NodeAgent boundary.
+
+    Columns are contiguous int64 ndarrays (plus optional object arrays for
+    node/route_hint), so the executor's hot loop is plain array indexing with
+    no per-row namedtuple construction or Series dispatch. Producers that
+    already hold columnar data can build this directly and skip pandas.
+    """
+
+    layer: np.ndarray
+    start_pid: np.ndarray
+    end_pid: np.ndarray
+    page_bytes: np.ndarray
+    node: Optional[np.ndarray] = None
+    route_hint: Optional[np.ndarray] = None
+    overlap: Optional[np.ndarray] = None
+    gpu_id: Optional[np.ndarray] = None
+    deadline_ms: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.layer)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, default_page_bytes: int) -> "PlanArrays":
+        n = len(df)
+        if "page_bytes" in df.columns:
+            pbs = df["page_bytes"].to_numpy(np.int64, copy=False)
+        else:
+            pbs = np.full(n, default_page_bytes, np.int64)
+        return cls(
+            layer=df["layer"].to_numpy(np.int64, copy=False),
+            start_pid=df["start_pid"].to_numpy(np.int64, copy=False),
+            end_pid=df["end_pid"].to_numpy(np.int64, copy=False),
+            page_bytes=pbs,
+            node=df["node"].to_numpy() if "node" in df.columns else None,
+            route_hint=df["route_hint"].to_numpy() if "route_hint" in df.columns else None,
+            overlap=df["overlap"].to_numpy(np.int64) if "overlap" in df.columns else None,
+            gpu_id=df["gpu_id"].to_numpy(np.int64) if "gpu_id" in df.columns else None,
+            deadline_ms=df["deadline_ms"].to_numpy(np.int64) if "deadline_ms" in df.columns else None,
+        )
+
+
 class NodeAgent:
     """Python Node Agent that executes a plan using a segmented file backend.
 
     This models STORAGE->CPU transfers as coalesced reads from segment files.
     """
 
+    # Minimum number of coalesced super-ranges before the bulk-read API is
+    # worth the batching overhead.
+    BULK_READ_THRESHOLD = 4
+    # Pinned staging buffers kept in flight on the engine path: the disk read
+    # for op i overlaps the DMA of op i-1 instead of serializing read + dma.
+    STAGING_RING_SIZE = 2
+
     def __init__(
         self,
         backend: SegmentedFileBackend,
@@ -28,26 +114,78 @@ class NodeAgent:
 
     def execute(
         self,
-        plan_df: pd.DataFrame,
+        plan_df: Union[pd.DataFrame, PlanArrays],
         model_id: str,
         model_version: str,
         on_ready: Optional[Callable[[Dict[str, Any]], None]] = None,
         dest_resolver: Optional[Callable[[Dict[str, Any]], Any]] = None,
         prefer_native_engine: bool = True,
     ) -> Dict[str, Any]:
-        if plan_df.empty:
+        # Accept either a pandas plan (converted to columns once) or a
+        # PlanArrays built upstream.
+        if isinstance(plan_df, pd.DataFrame):
+            if plan_df.empty:
+                return {"ops": 0, "bytes": 0, "duration_ms": 0.0}
+            plan = PlanArrays.from_dataframe(plan_df, self.page_bytes)
+        else:
+            plan = plan_df
+        n = len(plan)
+        if n == 0:
             return {"ops": 0, "bytes": 0, "duration_ms": 0.0}
         t0 = time.time()
-        total_bytes = 0
-        for r in plan_df.itertuples(index=False):
-            layer = int(r.layer)
-            start_pid = int(r.start_pid)
-            end_pid = int(r.end_pid)
-            page_bytes = int(getattr(r, "page_bytes", self.page_bytes))
-            route_hint = getattr(r, "route_hint", None)
-            # Compute total bytes for this coalesced read
-            nbytes = (end_pid - start_pid + 1) * page_bytes if end_pid >= start_pid else 0
-            total_bytes += nbytes
+
+        layers = plan.layer
+        start_pids = plan.start_pid
+        end_pids = plan.end_pid
+        pbs = plan.page_bytes
+        nbytes_arr = np.where(end_pids >= start_pids, (end_pids - start_pids + 1) * pbs, 0)
+        total_bytes = int(nbytes_arr.sum())
+
+        nodes = plan.node
+        route_hints = plan.route_hint
+        overlaps = plan.overlap
+        gpu_ids = plan.gpu_id
+        deadlines = plan.deadline_ms
+
+        # Ring of pinned staging buffers for the engine path. A slot is only
+        # reused after its previous DMA has completed, so storage reads and
+        # device copies pipeline instead of serializing.
+        ring_size = max(1, int(self.STAGING_RING_SIZE))
+        ring: list = [None] * ring_size
+        ring_events: list = [None] * ring_size
+
+        if dest_resolver is None:
+            # Pure CPU path: adjacent/overlapping ranges within a layer can be
+            # merged into super-ranges, so many small preads become few large
+            # ones. Callbacks still fan out per original plan row.
+            io_ops = self._execute_coalesced(
+                model_id,
+                model_version,
+                layers,
+                start_pids,
+                end_pids,
+                pbs,
+                nbytes_arr,
+                nodes,
+                route_hints,
+                on_ready,
+            )
+            dt = (time.time() - t0) * 1000.0
+            return {
+                "ops": int(n),
+                "bytes": int(total_bytes),
+                "duration_ms": float(dt),
+                "io_ops": int(io_ops),
+            }
+
+        for i in range(n):
+            layer = int(layers[i])
+            start_pid = int(start_pids[i])
+            end_pid = int(end_pids[i])
+            page_bytes = int(pbs[i])
+            node = nodes[i] if nodes is not None else ""
+            route_hint = route_hints[i] if route_hints is not None else None
+            nbytes = int(nbytes_arr[i])
 
             # If a device copy engine is available and a destination is provided, enqueue a copy.
             # Otherwise, treat the read as "ready" immediately.
@@ -55,28 +193,44 @@ class NodeAgent:
                 # Try to lazily load a native engine if requested and not provided.
                 self.copy_engine = get_copy_engine(prefer_native=prefer_native_engine)
 
-            dst = dest_resolver({
-                "node": getattr(r, "node", ""),
+            # One event dict per row, shared by dest_resolver, the engine
+            # completion callback, and the fallback on_ready. Handlers that
+            # retain the dict own it from that point on.
+            evt = {
+                "node": node,
                 "layer": layer,
                 "start_pid": start_pid,
                 "end_pid": end_pid,
                 "bytes": nbytes,
                 "route_hint": route_hint,
-            }) if dest_resolver is not None else None
+                "plan_idx": i,
+            }
+            dst = dest_resolver(evt) if dest_resolver is not None else None
 
             if self.copy_engine is not None and dst is not None:
                 # Use pinned buffer path if supported by the engine
                 src_buf = None
                 acquire = getattr(self.copy_engine, "acquire_host_buffer", None)
                 if callable(acquire) and nbytes > 0:
-                    try:
-                        src_buf = acquire(nbytes)  # expected to be a writable memoryview
-                    except Exception:
-                        src_buf = None
+                    slot = i % ring_size
+                    pending = ring_events[slot]
+                    if pending is not None:
+                        pending.wait()
+                        ring_events[slot] = None
+                    src_buf = ring[slot]
+                    if src_buf is None or memoryview(src_buf).nbytes < nbytes:
+                        try:
+                            src_buf = acquire(nbytes)  # expected to be a writable memoryview
+                        except Exception:
+                            src_buf = None
+                        ring[slot] = src_buf
 
                 if src_buf is not None:
-                    # Read directly into pinned buffer and submit device copy
-                    self.backend.read_range_into(
+                    # Read directly into pinned buffer and submit device copy.
+                    # Prefer the backend's O_DIRECT path when it has one; it
+                    # falls back to buffered I/O on alignment mismatch.
+                    read_into = getattr(self.backend, "read_range_into_direct", None) or self.backend.read_range_into
+                    read_into(
                         model_id,
                         model_version,
                         layer,
@@ -85,28 +239,27 @@ class NodeAgent:
                         page_bytes,
                         src_buf,
                     )
+                    # Forward the destination's consumer stream (CAI v3) so
+                    # stream-aware engines can enqueue without a sync.
+                    dst_cai = getattr(dst, "__cuda_array_interface__", None)
+                    stream_handle = dst_cai.get("stream") if dst_cai is not None else None
                     op = CopyOp(
                         src=src_buf,
                         dst=dst,
                         bytes=nbytes,
-                        stream_id=int(getattr(r, "overlap", 1)) - 1 if hasattr(r, "overlap") else 0,
-                        gpu_id=int(getattr(r, "gpu_id", 0)) if hasattr(r, "gpu_id") else 0,
-                        deadline_ms=int(getattr(r, "deadline_ms", 0)) if hasattr(r, "deadline_ms") else 0,
+                        stream_id=int(overlaps[i]) - 1 if overlaps is not None else 0,
+                        gpu_id=int(gpu_ids[i]) if gpu_ids is not None else 0,
+                        deadline_ms=int(deadlines[i]) if deadlines is not None else 0,
+                        stream_handle=int(stream_handle) if stream_handle is not None else None,
                     )
 
-                    def _done(_op: CopyOp, _r=r, _bytes=nbytes) -> None:
-                        _route_hint = getattr(_r, "route_hint", None)
+                    done_event = threading.Event()
+                    ring_events[slot] = done_event
+
+                    def _done(_op: CopyOp, _evt=evt, _done_event=done_event) -> None:
                         if on_ready is not None:
-                            on_ready(
-                                {
-                                    "node": getattr(_r, "node", ""),
-                                    "layer": int(_r.layer),
-                                    "start_pid": int(_r.start_pid),
-                                    "end_pid": int(_r.end_pid),
-                                    "bytes": _bytes,
-                                    "route_hint": _route_hint,
-                                }
-                            )
+                            on_ready(_evt)
+                        _done_event.set()
 
                     # Submit as a single-op batch to keep context simple.
                     self.copy_engine.submit([op], _done)
@@ -122,18 +275,92 @@ class NodeAgent:
                 page_bytes,
             )
             if on_ready is not None and nbytes > 0:
-                on_ready(
-                    {
-                        "node": getattr(r, "node", ""),
-                        "layer": layer,
-                        "start_pid": start_pid,
-                        "end_pid": end_pid,
-                        "bytes": len(data),
-                        "route_hint": route_hint,
-                    }
-                )
+                evt["bytes"] = len(data)
+                on_ready(evt)
         dt = (time.time() - t0) * 1000.0
-        return {"ops": int(len(plan_df)), "bytes": int(total_bytes), "duration_ms": float(dt)}
+        return {"ops": int(n), "bytes": int(total_bytes), "duration_ms": float(dt), "io_ops": int(n)}
+
+    def _execute_coalesced(
+        self,
+        model_id: str,
+        model_version: str,
+        layers: np.ndarray,
+        start_pids: np.ndarray,
+        end_pids: np.ndarray,
+        pbs: np.ndarray,
+        nbytes_arr: np.ndarray,
+        nodes,
+        route_hints,
+        on_ready: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> int:
+        """Merge adjacent plan ranges per (layer,page_bytes) and read each
+        super-range once, fanning out on_ready per original row.
+
+        Returns the number of coalesced reads issued.
+        """
+        valid = np.flatnonzero(end_pids >= start_pids)
+        if len(valid) == 0:
+            return 0
+        # Sort by (layer, page_bytes, start_pid) so mergeable rows are adjacent,
+        # then find super-range boundaries with the (JIT-compiled) scan kernel.
+        order = valid[np.lexsort((start_pids[valid], pbs[valid], layers[valid]))]
+        ls = np.ascontiguousarray(layers[order])
+        ps = np.ascontiguousarray(pbs[order])
+        ss = np.ascontiguousarray(start_pids[order])
+        es = np.ascontiguousarray(end_pids[order])
+        bounds, sup_end = _merge_ranges(ls, ps, ss, es)
+        super_ranges = [
+            (
+                int(ls[bounds[k]]),
+                int(ps[bounds[k]]),
+                int(ss[bounds[k]]),
+                int(sup_end[k]),
+                order[bounds[k]:bounds[k + 1]],
+            )
+            for k in range(len(sup_end))
+        ]  # (layer, page_bytes, start, end, member row indices)
+
+        batched = getattr(self.backend, "read_ranges_into", None)
+        bulk = getattr(self.backend, "read_range_into_bulk", None)
+        if batched is not None:
+            # io_uring-style backend: submit the whole wave as one batch.
+            specs = [
+                (model_id, model_version, layer, s, e, pb)
+                for layer, pb, s, e, _ in super_ranges
+            ]
+            bufs = [bytearray((e - s + 1) * pb) for layer, pb, s, e, _ in super_ranges]
+            batched(specs, bufs)
+        elif bulk is not None and len(super_ranges) >= self.BULK_READ_THRESHOLD:
+            # Group per (layer, page_bytes) and hand each group to the bulk
+            # pread helper as one call (GIL-dropping when the native module
+            # is built).
+            by_seg: Dict[tuple, list] = {}
+            for layer, pb, s, e, _ in super_ranges:
+                by_seg.setdefault((layer, pb), []).append((s * pb, (e - s + 1) * pb))
+            for (layer, pb), extents in by_seg.items():
+                offsets = np.array([o for o, _ in extents], dtype=np.uint64)
+                sizes = np.array([sz for _, sz in extents], dtype=np.uint64)
+                buf = bytearray(int(sizes.sum()))
+                bulk(model_id, model_version, layer, offsets, sizes, buf)
+        else:
+            for layer, pb, s, e, _ in super_ranges:
+                self.backend.read_range(model_id, model_version, layer, s, e, pb)
+
+        if on_ready is not None:
+            for _, _, _, _, members in super_ranges:
+                for i in members:
+                    on_ready(
+                        {
+                            "node": nodes[i] if nodes is not None else "",
+                            "layer": int(layers[i]),
+                            "start_pid": int(start_pids[i]),
+                            "end_pid": int(end_pids[i]),
+                            "bytes": int(nbytes_arr[i]),
+                            "route_hint": route_hints[i] if route_hints is not None else None,
+                            "plan_idx": int(i),
+                        }
+                    )
+        return len(super_ranges)
 
     def prefetch_wave(
         self,
@@ -151,18 +378,23 @@ class NodeAgent:
         io_extents = wave.get("io_extents", [])
         total_bytes = 0
         t0 = time.time()
-        for layer, start_pid, end_pid in io_extents:
-            page_bytes = int(wave.get("page_bytes", getattr(self, "page_bytes", 256 * 1024)))
+        page_bytes = int(wave.get("page_bytes", getattr(self, "page_bytes", 256 * 1024)))
+        if io_extents:
+            ext = np.asarray(io_extents, dtype=np.int64).reshape(len(io_extents), 3)
+        else:
+            ext = np.empty((0, 3), dtype=np.int64)
+        for i in range(len(ext)):
+            layer, start_pid, end_pid = int(ext[i, 0]), int(ext[i, 1]), int(ext[i, 2])
             if end_pid < start_pid:
                 continue
-            nbytes = (int(end_pid) - int(start_pid) + 1) * page_bytes
-            _ = self.backend.read_range(model_id, model_version, int(layer), int(start_pid), int(end_pid), page_bytes)
+            nbytes = (end_pid - start_pid + 1) * page_bytes
+            _ = self.backend.read_range(model_id, model_version, layer, start_pid, end_pid, page_bytes)
             total_bytes += nbytes
             if on_ready is not None:
                 on_ready({
-                    "layer": int(layer),
-                    "start_pid": int(start_pid),
-                    "end_pid": int(end_pid),
+                    "layer": layer,
+                    "start_pid": start_pid,
+                    "end_pid": end_pid,
                     "bytes": int(nbytes),
                 })
         dt = (time.time() - t0) * 1000.0
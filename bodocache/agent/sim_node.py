@@ -1,37 +1,232 @@
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 import pandas as pd
 
+try:  # pragma: no cover - optional JIT for large plans
+    from numba import njit as _njit, prange
+except ImportError:  # pragma: no cover - numba not installed
+    _njit = None
+    prange = range
+
+
+def _assign_streams_kernel(dur_arr, group_start, group_end, streams_per_tier,
+                           cum_deadline_layer, layer_arr, deadline_arr):
+    """Greedy earliest-stream assignment over (node,tier_dst)-sorted plan columns.
+
+    Groups are contiguous row spans [group_start[g], group_end[g]); each group
+    gets streams_per_tier equal streams, and dur_arr holds each op's
+    precomputed per-stream duration (the overlap/bandwidth math is vectorized
+    by the caller, so only the serial argmin lives here). Returns (finish_ms,
+    req_deadline) arrays aligned with the input rows. The required deadline is
+    the per-layer cumulative compute arrival when cum_deadline_layer is
+    non-empty, else the op's own deadline_ms.
+    """
+    n = dur_arr.shape[0]
+    finish = np.empty(n, np.float64)
+    req_deadline = np.empty(n, np.float64)
+    n_layers = cum_deadline_layer.shape[0]
+    # Earliest-stream selection: linear argmin for few streams, a binary
+    # min-heap ordered on (time, stream idx) once the O(S) scan would lose to
+    # O(log S). Tie-breaking on the lower stream index keeps both paths
+    # bit-identical to the original scan.
+    use_heap = streams_per_tier >= 8
+    stream_time = np.zeros(streams_per_tier, np.float64)
+    heap_idx = np.zeros(streams_per_tier, np.int64)
+    for g in range(group_start.shape[0]):
+        for s in range(streams_per_tier):
+            stream_time[s] = 0.0
+            heap_idx[s] = s
+        for i in range(group_start[g], group_end[g]):
+            if use_heap:
+                # Pop the root and push the op's finish time back for the
+                # same stream in one replace + sift-down.
+                fin = stream_time[0] + dur_arr[i]
+                stream_time[0] = fin
+                pos = 0
+                while True:
+                    c = 2 * pos + 1
+                    if c >= streams_per_tier:
+                        break
+                    r = c + 1
+                    if r < streams_per_tier and (
+                        stream_time[r] < stream_time[c]
+                        or (stream_time[r] == stream_time[c] and heap_idx[r] < heap_idx[c])
+                    ):
+                        c = r
+                    if stream_time[c] < stream_time[pos] or (
+                        stream_time[c] == stream_time[pos] and heap_idx[c] < heap_idx[pos]
+                    ):
+                        tmp_t = stream_time[pos]
+                        stream_time[pos] = stream_time[c]
+                        stream_time[c] = tmp_t
+                        tmp_i = heap_idx[pos]
+                        heap_idx[pos] = heap_idx[c]
+                        heap_idx[c] = tmp_i
+                        pos = c
+                    else:
+                        break
+                finish[i] = fin
+            else:
+                sidx = 0
+                best = stream_time[0]
+                for s in range(1, streams_per_tier):
+                    t = stream_time[s]
+                    if t < best:
+                        best = t
+                        sidx = s
+                finish[i] = best + dur_arr[i]
+                stream_time[sidx] = finish[i]
+            if n_layers > 0:
+                ly = layer_arr[i]
+                if 0 <= ly < n_layers:
+                    req_deadline[i] = cum_deadline_layer[ly]
+                else:
+                    req_deadline[i] = 0.0
+            else:
+                req_deadline[i] = deadline_arr[i]
+    return finish, req_deadline
+
+
+_assign_streams = _njit(cache=True)(_assign_streams_kernel) if _njit else _assign_streams_kernel
+
 
-def simulate_plan(plan_df: pd.DataFrame, tier_caps_df: pd.DataFrame, window_ms: int = 20) -> pd.DataFrame:
+def _plan_metrics_kernel(bytes_arr, bw_arr, deadline_arr, group_start, group_end, window_ms):
+    """Fused per-group cumsum/finish/deadline/on-time pass for simulate_plan.
+
+    One cache-resident loop per group instead of four sequential array passes
+    with temporaries; groups are independent, so the outer loop parallelizes
+    under numba's prange.
+    """
+    n = bytes_arr.shape[0]
+    cum_out = np.empty(n, np.int64)
+    finish = np.empty(n, np.float64)
+    drel = np.empty(n, np.float64)
+    on_time = np.empty(n, np.int64)
+    for g in prange(group_start.shape[0]):
+        cum = np.int64(0)
+        base = deadline_arr[group_start[g]]
+        for i in range(group_start[g], group_end[g]):
+            cum += bytes_arr[i]
+            bw = bw_arr[i]
+            # `not (bw > 0)` also catches the NaN caps a left merge leaves
+            # for unknown tiers, which `bw <= 0` would let through.
+            if not (bw > 0.0):
+                bw = 1.0
+            f = cum / bw * window_ms
+            d = deadline_arr[i] - base
+            cum_out[i] = cum
+            finish[i] = f
+            drel[i] = d
+            on_time[i] = 1 if f <= d else 0
+    return cum_out, finish, drel, on_time
+
+
+_plan_metrics = (
+    _njit(cache=True, parallel=True)(_plan_metrics_kernel) if _njit else _plan_metrics_kernel
+)
+
+
+@functools.lru_cache(maxsize=32)
+def cum_deadline_from_lat_ms(lat_items: tuple) -> np.ndarray:
+    """Dense cum-deadline array from layer latencies given as sorted items.
+
+    Callers holding a layer->lat_ms dict that rarely changes can pass
+    tuple(sorted(d.items())) and reuse the cached array across windows via
+    simulate_plan_streams(cum_deadline_arr=...), skipping the per-window
+    sort + cumsum entirely.
+    """
+    if not lat_items:
+        return np.empty(0, np.float64)
+    layers = np.fromiter((k for k, _ in lat_items), np.int64, count=len(lat_items))
+    cum = np.cumsum(np.fromiter((v for _, v in lat_items), np.float64, count=len(lat_items)))
+    dense = np.zeros(int(layers[-1]) + 1, np.float64)
+    dense[layers] = cum
+    return dense
+
+
+def _dense_cum_deadline(layer_lat_df: pd.DataFrame | None) -> np.ndarray:
+    """Cumulative per-layer compute arrival as a dense array indexed by layer.
+
+    Layers are small integer ids, so a float64 array sized max_layer+1 turns
+    the per-op deadline lookup into a plain load; layers absent from
+    layer_lat_df read 0.0. Empty result means no latencies were provided.
+    """
+    if layer_lat_df is None or len(layer_lat_df) == 0:
+        return np.empty(0, np.float64)
+    lat_layers = layer_lat_df["layer"].to_numpy(np.int64)
+    order = np.argsort(lat_layers, kind="stable")
+    lat_layers = lat_layers[order]
+    cum = np.cumsum(layer_lat_df["lat_ms"].to_numpy(np.float64)[order])
+    dense = np.zeros(int(lat_layers[-1]) + 1, np.float64)
+    dense[lat_layers] = cum
+    return dense
+
+
+def _check_pre_sorted(df: pd.DataFrame, cols: list[str], ascending: list[bool]) -> None:
+    """Debug-mode guard for pre_sorted=True callers (no-op under -O)."""
+    if not __debug__:
+        return
+    expect = df.sort_values(by=cols, ascending=ascending, kind="stable").index
+    assert expect.equals(df.index), f"plan_df not sorted by {cols}"
+
+
+def simulate_plan(plan_df: pd.DataFrame, tier_caps_df: pd.DataFrame, window_ms: int = 20,
+                  pre_sorted: bool = False) -> pd.DataFrame:
     """Simulate execution of a plan per (node,tier_dst) using simple bandwidth models.
 
     - Assumes each (node,tier) has bandwidth_caps bytes per window_ms.
     - Computes finish_time for each op as cumulative_bytes/bandwidth_caps * window_ms.
     - Computes timeliness vs relative deadlines (relative to min deadline per group).
+    - pre_sorted=True skips the per-window sort when the caller guarantees
+      (node, tier_dst, deadline_ms) order (checked in debug mode).
     Returns a DataFrame with per-op metrics.
     """
     if plan_df.empty:
         return plan_df.assign(finish_ms=np.float64(0.0),
                               deadline_rel_ms=np.float64(0.0),
                               on_time=np.int64(1))
-    df = plan_df.copy()
+    # merge() allocates a fresh frame, so no defensive copy of plan_df is
+    # needed; derived columns below never touch the caller's frame.
     caps = tier_caps_df[["tier", "bandwidth_caps"]].rename(columns={"tier": "tier_dst"})
-    df = df.merge(caps, on="tier_dst", how="left")
-    df = df.sort_values(by=["node", "tier_dst", "deadline_ms"]).reset_index(drop=True)
-    grp = ["node", "tier_dst"]
-    df["cum_bytes"] = df.groupby(grp)["bytes"].cumsum()
-    denom = df["bandwidth_caps"].astype(np.float64).where(lambda x: x > 0, 1.0)
-    df["finish_ms"] = (df["cum_bytes"].astype(np.float64) / denom) * float(window_ms)
-    base_deadline = df.groupby(grp)["deadline_ms"].transform("min")
-    df["deadline_rel_ms"] = (df["deadline_ms"] - base_deadline).astype(np.float64)
-    df["on_time"] = (df["finish_ms"] <= df["deadline_rel_ms"]).astype(np.int64)
+    df = plan_df.merge(caps, on="tier_dst", how="left")
+    if pre_sorted:
+        _check_pre_sorted(df, ["node", "tier_dst", "deadline_ms"], [True, True, True])
+    else:
+        df = df.sort_values(by=["node", "tier_dst", "deadline_ms"]).reset_index(drop=True)
+    # The frame is sorted by the group keys, so per-group cumsum and min reduce
+    # to one linear scan over contiguous spans — no pandas groupby needed.
+    n = len(df)
+    node_codes, _ = pd.factorize(df["node"], sort=False)
+    tier_arr = df["tier_dst"].to_numpy(np.int64)
+    change = np.empty(n, np.bool_)
+    change[0] = True
+    change[1:] = (node_codes[1:] != node_codes[:-1]) | (tier_arr[1:] != tier_arr[:-1])
+    boundaries = np.flatnonzero(change)
+    bytes_arr = df["bytes"].to_numpy(np.int64)
+    caps_arr = df["bandwidth_caps"].to_numpy(np.float64)
+    deadline_arr = df["deadline_ms"].to_numpy(np.float64)
+    # Fused kernel: per-group cumsum, finish, relative deadline (min is the
+    # first row of each span since groups are deadline-sorted) and on_time
+    # in a single pass; columns are assigned to the frame once.
+    cum_bytes, finish_ms, deadline_rel_ms, on_time = _plan_metrics(
+        bytes_arr, caps_arr, deadline_arr,
+        boundaries, np.append(boundaries[1:], n), float(window_ms),
+    )
+    df["cum_bytes"] = cum_bytes
+    df["finish_ms"] = finish_ms
+    df["deadline_rel_ms"] = deadline_rel_ms
+    df["on_time"] = on_time
     return df
 
 
 def summarize_metrics(exec_df: pd.DataFrame) -> dict:
-    if exec_df.empty:
+    # Reduce over raw ndarray views; these columns are always dense numerics
+    # from simulate_plan*, so pandas' nanops dispatch buys nothing here.
+    on_time = exec_df["on_time"].to_numpy() if "on_time" in exec_df.columns else np.empty(0)
+    if on_time.size == 0:
         return {
             "prefetch_timeliness": 1.0,
             "avg_finish_ms": 0.0,
@@ -39,10 +234,10 @@ def summarize_metrics(exec_df: pd.DataFrame) -> dict:
             "ops": 0,
     }
     return {
-        "prefetch_timeliness": float(exec_df["on_time"].mean()),
-        "avg_finish_ms": float(exec_df["finish_ms"].mean()),
-        "avg_io_bytes": float(exec_df["bytes"].mean()),
-        "ops": int(len(exec_df)),
+        "prefetch_timeliness": float(on_time.mean()),
+        "avg_finish_ms": float(exec_df["finish_ms"].to_numpy().mean()),
+        "avg_io_bytes": float(exec_df["bytes"].to_numpy().mean()),
+        "ops": int(on_time.size),
     }
 
 
@@ -53,10 +248,13 @@ def simulate_plan_streams(
     streams_per_tier: int = 4,
     use_overlap: bool = True,
     layer_lat_df: pd.DataFrame | None = None,
+    pre_sorted: bool = False,
+    cum_deadline_arr: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """Multistream simulation with overlap/priority hints.
 
-    - Sort by (node,tier_dst, priority desc, deadline asc).
+    - Sort by (node,tier_dst, priority desc, deadline asc); pre_sorted=True
+      skips this when the caller guarantees the order (checked in debug mode).
     - Each (node,tier) has N equal-bandwidth streams: bw_stream = bandwidth_caps / N.
     - If use_overlap, an op gets speedup = min(overlap, N); effective bytes = bytes / speedup.
     - Assign each op to earliest-available stream and compute finish time.
@@ -66,45 +264,72 @@ def simulate_plan_streams(
         return plan_df.assign(finish_ms=np.float64(0.0),
                               deadline_rel_ms=np.float64(0.0),
                               on_time=np.int64(1))
-    df = plan_df.copy()
+    # merge() allocates a fresh frame, so no defensive copy of plan_df is
+    # needed; derived columns below never touch the caller's frame.
     caps = tier_caps_df[["tier", "bandwidth_caps"]].rename(columns={"tier": "tier_dst"})
-    df = df.merge(caps, on="tier_dst", how="left")
-    df = df.sort_values(by=["node", "tier_dst", "priority"], ascending=[True, True, False]).reset_index(drop=True)
-    # Build per-layer cumulative compute deadline if provided
-    cum_deadline = None
-    if layer_lat_df is not None and len(layer_lat_df) > 0:
-        lat = layer_lat_df.sort_values('layer')
-        lat['cum_ms'] = lat['lat_ms'].astype(float).cumsum()
-        cum_deadline = dict(zip(lat['layer'].tolist(), lat['cum_ms'].tolist()))
-
-    results = []
-    for (node, tier), grp in df.groupby(["node", "tier_dst"], sort=False):
-        bw_total = float(grp["bandwidth_caps"].iloc[0])
-        bw_per = bw_total / max(1, streams_per_tier)
-        # Stream availability times (ms)
-        stream_time = [0.0 for _ in range(max(1, streams_per_tier))]
-        for row in grp.itertuples(index=False):
-            # Effective bytes with overlap
-            ov = int(getattr(row, "overlap", 1)) if use_overlap else 1
-            eff = max(1, min(ov, streams_per_tier))
-            bytes_eff = float(row.bytes) / float(eff)
-            dur_ms = (bytes_eff / max(1.0, bw_per)) * float(window_ms)
-            # Assign to earliest-available stream
-            sidx = min(range(len(stream_time)), key=lambda i: stream_time[i])
-            start = stream_time[sidx]
-            finish = start + dur_ms
-            stream_time[sidx] = finish
-            # Required time: from base window start to compute arrival for layer
-            req_deadline = float(row.deadline_ms)
-            if cum_deadline is not None:
-                req_deadline = float(cum_deadline.get(int(getattr(row, 'layer', 0)), 0.0))
-            results.append((node, row.tier_dst, getattr(row, 'pcluster', -1), getattr(row, 'layer', -1), float(row.priority), req_deadline, finish, float(row.bytes)))
-
-    out = pd.DataFrame.from_records(
-        results,
-        columns=["node", "tier_dst", "pcluster", "layer", "priority", "deadline_ms", "finish_ms", "bytes"],
+    df = plan_df.merge(caps, on="tier_dst", how="left")
+    if pre_sorted:
+        _check_pre_sorted(df, ["node", "tier_dst", "priority"], [True, True, False])
+    else:
+        df = df.sort_values(by=["node", "tier_dst", "priority"], ascending=[True, True, False]).reset_index(drop=True)
+
+    n = len(df)
+    streams = max(1, int(streams_per_tier))
+    bytes_arr = df["bytes"].to_numpy(np.float64)
+    priority_arr = df["priority"].to_numpy(np.float64)
+    deadline_arr = df["deadline_ms"].to_numpy(np.float64)
+    if use_overlap and "overlap" in df.columns:
+        ov_arr = df["overlap"].to_numpy(np.int64)
+    else:
+        ov_arr = np.ones(n, np.int64)
+    if "layer" in df.columns:
+        layer_arr = df["layer"].to_numpy(np.int64)
+        layer_out = layer_arr
+    else:
+        layer_arr = np.zeros(n, np.int64)
+        layer_out = np.full(n, -1, np.int64)
+
+    # Contiguous (node, tier_dst) group spans over the sorted frame
+    tier_arr = df["tier_dst"].to_numpy(np.int64)
+    node_codes, _ = pd.factorize(df["node"], sort=False)
+    change = np.empty(n, np.bool_)
+    change[0] = True
+    change[1:] = (node_codes[1:] != node_codes[:-1]) | (tier_arr[1:] != tier_arr[:-1])
+    group_start = np.flatnonzero(change).astype(np.int64)
+    group_end = np.append(group_start[1:], n).astype(np.int64)
+    caps_arr = df["bandwidth_caps"].to_numpy(np.float64)
+    bw_per = np.fmax(caps_arr[group_start] / streams, 1.0)
+
+    # Prefer a caller-supplied precomputed array (see cum_deadline_from_lat_ms)
+    # over re-deriving it from layer_lat_df every window.
+    if cum_deadline_arr is not None:
+        cum_deadline_layer = np.asarray(cum_deadline_arr, np.float64)
+    else:
+        cum_deadline_layer = _dense_cum_deadline(layer_lat_df)
+
+    # Per-op duration is branch-free vectorized math; only the stream argmin
+    # is inherently serial and stays in the kernel.
+    eff_arr = np.clip(ov_arr, 1, streams).astype(np.float64)
+    bw_row = np.repeat(bw_per, group_end - group_start)
+    dur_arr = (bytes_arr / eff_arr) / bw_row * float(window_ms)
+
+    finish_ms, req_deadline = _assign_streams(
+        dur_arr, group_start, group_end, streams,
+        cum_deadline_layer, layer_arr, deadline_arr,
     )
+
+    pcl = df["pcluster"].to_numpy(np.int64) if "pcluster" in df.columns else np.full(n, -1, np.int64)
+    out = pd.DataFrame({
+        "node": df["node"].to_numpy(),
+        "tier_dst": tier_arr,
+        "pcluster": pcl,
+        "layer": layer_out,
+        "priority": priority_arr,
+        "deadline_ms": req_deadline,
+        "finish_ms": finish_ms,
+        "bytes": bytes_arr,
+    })
     # On-time if finished before required compute arrival for that layer
-    out['on_time'] = (out['finish_ms'] <= out['deadline_ms']).astype(np.int64)
-    out['deadline_rel_ms'] = out['deadline_ms']
+    out['on_time'] = (finish_ms <= req_deadline).astype(np.int64)
+    out['deadline_rel_ms'] = req_deadline
     return out
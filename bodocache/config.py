@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass, field
 from typing import Dict, Any
 
 import yaml
 
+try:  # libyaml C loader: ~10x faster parse, identical output
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - pyyaml built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 
 DEFAULTS = {
     'window_ms': 20,
@@ -28,8 +34,8 @@ DEFAULTS = {
 def load_yaml(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
         return {}
-    with open(path, 'r') as f:
-        return yaml.safe_load(f) or {}
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_SafeLoader) or {}
 
 
 def merge_dict(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
@@ -50,20 +56,22 @@ def load_config(runtime_path: str = 'configs/runtime.yaml', staged_path: str | N
     return cfg
 
 
-# Typed config wrappers for ergonomics and safety
-@dataclass
+# Typed config wrappers for ergonomics and safety. Frozen + slots so the
+# cached instance below can be shared safely across planner windows; use
+# dataclasses.replace() to derive overridden copies.
+@dataclass(frozen=True, slots=True)
 class Thresholds:
     pmin: float = 1.0
     umin: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Popularity:
     alpha: float = 1.0
     beta: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ABFlags:
     enable_prefix_fanout: bool = True
     enable_tenant_credits: bool = True
@@ -73,7 +81,7 @@ class ABFlags:
     enforce_tier_caps: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuntimeConfig:
     window_ms: int = 20
     min_io_bytes: int = 524288
@@ -84,34 +92,52 @@ class RuntimeConfig:
     tenant_credits_bytes: int = 32 * 1024 * 1024
 
 
-def _get(d: Dict[str, Any], key: str, default):
-    return d.get(key, default)
+def _mtime(path: str | None) -> float:
+    try:
+        return os.stat(path).st_mtime if path else -1.0
+    except OSError:
+        return -1.0
 
 
-def load_config_typed(runtime_path: str = 'configs/runtime.yaml', staged_path: str | None = None) -> RuntimeConfig:
+@functools.lru_cache(maxsize=16)
+def _load_config_typed_cached(runtime_path: str, staged_path: str | None,
+                              rt_mtime: float, st_mtime: float) -> RuntimeConfig:
+    # rt_mtime/st_mtime only participate in the cache key; a touched file
+    # changes the key and forces a re-parse.
     raw = load_config(runtime_path=runtime_path, staged_path=staged_path)
-    thresholds = Thresholds(
-        pmin=float(_get(_get(raw, 'thresholds', {}), 'pmin', 1.0)),
-        umin=float(_get(_get(raw, 'thresholds', {}), 'umin', 0.0)),
-    )
-    popularity = Popularity(
-        alpha=float(_get(_get(raw, 'popularity', {}), 'alpha', 1.0)),
-        beta=float(_get(_get(raw, 'popularity', {}), 'beta', 0.0)),
-    )
-    ab_flags = ABFlags(
-        enable_prefix_fanout=bool(_get(_get(raw, 'ab_flags', {}), 'enable_prefix_fanout', True)),
-        enable_tenant_credits=bool(_get(_get(raw, 'ab_flags', {}), 'enable_tenant_credits', True)),
-        enable_admission=bool(_get(_get(raw, 'ab_flags', {}), 'enable_admission', True)),
-        enable_eviction=bool(_get(_get(raw, 'ab_flags', {}), 'enable_eviction', True)),
-        enable_overlap=bool(_get(_get(raw, 'ab_flags', {}), 'enable_overlap', True)),
-        enforce_tier_caps=bool(_get(_get(raw, 'ab_flags', {}), 'enforce_tier_caps', True)),
-    )
+    raw_thr = raw.get('thresholds') or {}
+    raw_pop = raw.get('popularity') or {}
+    raw_ab = raw.get('ab_flags') or {}
     return RuntimeConfig(
-        window_ms=int(_get(raw, 'window_ms', 20)),
-        min_io_bytes=int(_get(raw, 'min_io_bytes', 524288)),
-        max_ops_per_tier=int(_get(raw, 'max_ops_per_tier', 64)),
-        thresholds=thresholds,
-        popularity=popularity,
-        ab_flags=ab_flags,
-        tenant_credits_bytes=int(_get(raw, 'tenant_credits_bytes', 32 * 1024 * 1024)),
+        window_ms=int(raw.get('window_ms', 20)),
+        min_io_bytes=int(raw.get('min_io_bytes', 524288)),
+        max_ops_per_tier=int(raw.get('max_ops_per_tier', 64)),
+        thresholds=Thresholds(
+            pmin=float(raw_thr.get('pmin', 1.0)),
+            umin=float(raw_thr.get('umin', 0.0)),
+        ),
+        popularity=Popularity(
+            alpha=float(raw_pop.get('alpha', 1.0)),
+            beta=float(raw_pop.get('beta', 0.0)),
+        ),
+        ab_flags=ABFlags(
+            enable_prefix_fanout=bool(raw_ab.get('enable_prefix_fanout', True)),
+            enable_tenant_credits=bool(raw_ab.get('enable_tenant_credits', True)),
+            enable_admission=bool(raw_ab.get('enable_admission', True)),
+            enable_eviction=bool(raw_ab.get('enable_eviction', True)),
+            enable_overlap=bool(raw_ab.get('enable_overlap', True)),
+            enforce_tier_caps=bool(raw_ab.get('enforce_tier_caps', True)),
+        ),
+        tenant_credits_bytes=int(raw.get('tenant_credits_bytes', 32 * 1024 * 1024)),
+    )
+
+
+def load_config_typed(runtime_path: str = 'configs/runtime.yaml', staged_path: str | None = None) -> RuntimeConfig:
+    """Load the typed config, cached on (path, mtime).
+
+    Callers reloading every planner window get the shared frozen instance
+    back until one of the files actually changes on disk.
+    """
+    return _load_config_typed_cached(
+        runtime_path, staged_path, _mtime(runtime_path), _mtime(staged_path)
     )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import Iterable, List, Optional
 
@@ -7,11 +8,13 @@ import numpy as np
 import pandas as pd
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class KVRequest:
     """A single KV page interval request originating from an engine.
 
     All fields map directly to columns expected by the planner scheduler.
+    Frozen with slots: instances are built per page range in hot loops, so
+    dropping the per-instance __dict__ keeps them small and cheap.
     """
 
     req_id: str
@@ -30,6 +33,38 @@ class KVRequest:
     deadline_ms: int = 0
 
 
+# Struct-of-arrays layout for requests; field order matches the requests_df
+# column order so build_dataframes can adopt the columns directly.
+REQUEST_DTYPE = np.dtype(
+    [
+        ("req_id", "O"),
+        ("node", "O"),
+        ("model_id", "O"),
+        ("model_version", "O"),
+        ("prefix_id", "O"),
+        ("layer", "i8"),
+        ("page_start", "i8"),
+        ("page_end", "i8"),
+        ("tier_src", "i8"),
+        ("tier_dst", "i8"),
+        ("deadline_ms", "i8"),
+        ("page_bytes", "i8"),
+        ("tenant", "O"),
+        ("est_fill_ms", "f8"),
+    ]
+)
+
+# Optional fields and their KVRequest defaults for from_soa callers
+_SOA_DEFAULTS = {
+    "page_bytes": 256 * 1024,
+    "tenant": "default",
+    "est_fill_ms": 1.0,
+    "tier_src": 0,
+    "tier_dst": 2,
+    "deadline_ms": 0,
+}
+
+
 @dataclass
 class PlannerInputs:
     """Planner side inputs for a single planning window."""
@@ -44,6 +79,87 @@ class PlannerInputs:
     tenant_caps: Optional[List[tuple[str, int, int]]] = None  # (tenant, tier, cap)
     # Per-layer latencies (ms)
     layer_lat_ms: Optional[dict[int, float]] = None
+    # Columnar alternative to `requests` (REQUEST_DTYPE structured array);
+    # when set, build_dataframes skips the per-request Python loop entirely.
+    request_array: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_soa(cls, arrays, **kwargs) -> "PlannerInputs":
+        """Build inputs from columnar request data, bypassing KVRequest.
+
+        `arrays` is either a REQUEST_DTYPE structured ndarray or a dict of
+        per-field arrays; omitted optional fields take KVRequest defaults.
+        Adapters that emit into preallocated buffers avoid allocating a
+        dataclass per request and the N x 14 field boxing in
+        build_dataframes.
+        """
+        if isinstance(arrays, np.ndarray):
+            if arrays.dtype != REQUEST_DTYPE:
+                raise ValueError("structured array must use REQUEST_DTYPE")
+            rec = arrays
+        else:
+            n = len(next(iter(arrays.values()))) if arrays else 0
+            rec = np.empty(n, REQUEST_DTYPE)
+            for name in REQUEST_DTYPE.names if n else ():
+                if name in arrays:
+                    rec[name] = arrays[name]
+                elif name in _SOA_DEFAULTS:
+                    rec[name] = _SOA_DEFAULTS[name]
+                else:
+                    raise ValueError(f"missing required request field: {name}")
+        return cls(requests=[], request_array=rec, **kwargs)
+
+
+@functools.lru_cache(maxsize=8)
+def _tier_union(bw_keys: tuple, free_keys: tuple) -> tuple:
+    # The tier set is tiny and static across windows; cache the sorted union
+    # so the hot planner path skips set construction and sorting.
+    return tuple(sorted({0, 1, 2} | set(bw_keys) | set(free_keys)))
+
+
+# Side-frame caches: caps, tenant caps and layer latencies rarely change
+# between consecutive planning windows, so the frames are memoized on their
+# (hashable) contents. Cached frames are shared across calls; the planner
+# only reads them, and derived copies are made via rename/selection.
+@functools.lru_cache(maxsize=16)
+def _tier_caps_frame(bw_items: tuple, free_items: tuple) -> pd.DataFrame:
+    bw_caps = dict(bw_items)
+    free = dict(free_items)
+    rows = [
+        (tier, int(bw_caps.get(tier, 0)), int(free.get(tier, 1 << 60)))
+        for tier in _tier_union(tuple(bw_caps), tuple(free))
+    ]
+    return pd.DataFrame(rows, columns=["tier", "bandwidth_caps", "free_bytes"])
+
+
+@functools.lru_cache(maxsize=32)
+def _tenant_caps_frame(items: tuple) -> pd.DataFrame:
+    trows = [(t, int(tier), int(cap)) for (t, tier, cap) in items]
+    return pd.DataFrame(trows, columns=["tenant", "tier", "bandwidth_caps"])
+
+
+@functools.lru_cache(maxsize=32)
+def _default_tenant_caps_frame(tenants: tuple) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "tenant": np.repeat(np.asarray(tenants, dtype=object), 3),
+            "tier": np.tile(np.array([0, 1, 2], np.int64), len(tenants)),
+            "bandwidth_caps": np.full(3 * len(tenants), 1 << 60, np.int64),
+        }
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _layer_lat_frame(items: tuple) -> pd.DataFrame:
+    lrows = [(int(k), float(v)) for k, v in items]
+    return pd.DataFrame(lrows, columns=["layer", "lat_ms"])
+
+
+@functools.lru_cache(maxsize=32)
+def _default_layer_lat_frame(layers: tuple) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"layer": np.asarray(layers, np.int64), "lat_ms": np.ones(len(layers), np.float64)}
+    )
 
 
 def _default_bandwidth_caps(window_ms: int) -> dict[int, int]:
@@ -56,6 +172,15 @@ def _default_bandwidth_caps(window_ms: int) -> dict[int, int]:
 
 def build_dataframes(pi: PlannerInputs):
     """Construct the DataFrames required by scheduler.run_window from inputs."""
+    rec = pi.request_array
+    if rec is not None and len(rec) > 0:
+        n = len(rec)
+        # Columnar fast path: adopt the structured array's fields directly
+        requests_df = pd.DataFrame({name: rec[name] for name in REQUEST_DTYPE.names})
+        layer = np.ascontiguousarray(rec["layer"])
+        page_start = np.ascontiguousarray(rec["page_start"])
+        page_bytes = np.ascontiguousarray(rec["page_bytes"])
+        return _build_side_frames(pi, requests_df, layer, page_start, page_bytes)
     if not pi.requests:
         # Empty frames with correct columns
         cols_req = [
@@ -81,78 +206,118 @@ def build_dataframes(pi: PlannerInputs):
         ll = pd.DataFrame(columns=["layer", "lat_ms"])
         return empty, heat, caps, tcaps, ll
 
-    # requests_df
-    rows = [
-        (
-            r.req_id,
-            r.node,
-            r.model_id,
-            r.model_version,
-            r.prefix_id,
-            int(r.layer),
-            int(r.page_start),
-            int(r.page_end),
-            int(r.tier_src),
-            int(r.tier_dst),
-            int(r.deadline_ms),
-            int(r.page_bytes),
-            r.tenant,
-            float(r.est_fill_ms),
-        )
-        for r in pi.requests
-    ]
+    # requests_df: fill per-column arrays in one pass so pandas adopts them
+    # without re-inferring dtypes or boxing N x 14 scalars through tuples.
+    n = len(pi.requests)
+    req_id = np.empty(n, object)
+    node = np.empty(n, object)
+    model_id = np.empty(n, object)
+    model_version = np.empty(n, object)
+    prefix_id = np.empty(n, object)
+    tenant = np.empty(n, object)
+    layer = np.empty(n, np.int64)
+    page_start = np.empty(n, np.int64)
+    page_end = np.empty(n, np.int64)
+    tier_src = np.empty(n, np.int64)
+    tier_dst = np.empty(n, np.int64)
+    deadline_ms = np.empty(n, np.int64)
+    page_bytes = np.empty(n, np.int64)
+    est_fill_ms = np.empty(n, np.float64)
+    for i, r in enumerate(pi.requests):
+        req_id[i] = r.req_id
+        node[i] = r.node
+        model_id[i] = r.model_id
+        model_version[i] = r.model_version
+        prefix_id[i] = r.prefix_id
+        layer[i] = r.layer
+        page_start[i] = r.page_start
+        page_end[i] = r.page_end
+        tier_src[i] = r.tier_src
+        tier_dst[i] = r.tier_dst
+        deadline_ms[i] = r.deadline_ms
+        page_bytes[i] = r.page_bytes
+        tenant[i] = r.tenant
+        est_fill_ms[i] = r.est_fill_ms
     requests_df = pd.DataFrame(
-        rows,
-        columns=[
-            "req_id",
-            "node",
-            "model_id",
-            "model_version",
-            "prefix_id",
-            "layer",
-            "page_start",
-            "page_end",
-            "tier_src",
-            "tier_dst",
-            "deadline_ms",
-            "page_bytes",
-            "tenant",
-            "est_fill_ms",
-        ],
+        {
+            "req_id": req_id,
+            "node": node,
+            "model_id": model_id,
+            "model_version": model_version,
+            "prefix_id": prefix_id,
+            "layer": layer,
+            "page_start": page_start,
+            "page_end": page_end,
+            "tier_src": tier_src,
+            "tier_dst": tier_dst,
+            "deadline_ms": deadline_ms,
+            "page_bytes": page_bytes,
+            "tenant": tenant,
+            "est_fill_ms": est_fill_ms,
+        }
     )
 
-    # heat_df: default decay_hits=1, tenant_weight=1.0, size_bytes=page_bytes
-    heat_df = requests_df[["layer", "page_start", "page_bytes"]].copy()
-    heat_df = heat_df.rename(columns={"page_start": "page_id", "page_bytes": "size_bytes"})
-    heat_df["decay_hits"] = np.int64(1)
-    heat_df["tenant_weight"] = np.float64(1.0)
-    heat_df = heat_df.groupby(["layer", "page_id"], as_index=False).agg(
-        decay_hits=("decay_hits", "sum"), tenant_weight=("tenant_weight", "first"), size_bytes=("size_bytes", "max")
+    return _build_side_frames(pi, requests_df, layer, page_start, page_bytes)
+
+
+def _build_side_frames(pi: PlannerInputs, requests_df: pd.DataFrame,
+                       layer: np.ndarray, page_start: np.ndarray, page_bytes: np.ndarray):
+    """Derive heat/caps/tenant/latency frames for a non-empty request set."""
+    n = len(requests_df)
+    # heat_df: default decay_hits=1, tenant_weight=1.0, size_bytes=page_bytes.
+    # Grouping by (layer, page_id) over sorted arrays: hit counts are span
+    # sizes and size_bytes is a reduceat max — no groupby machinery. When both
+    # keys fit their halves of an int64 (the normal case), pack them so the
+    # sort runs over a single key array.
+    if (
+        layer.min() >= 0
+        and layer.max() < (1 << 31)
+        and page_start.min() >= 0
+        and page_start.max() < (1 << 32)
+    ):
+        order = np.argsort((layer << 32) | page_start, kind="stable")
+    else:
+        order = np.lexsort((page_start, layer))
+    l_sorted = layer[order]
+    p_sorted = page_start[order]
+    pb_sorted = page_bytes[order]
+    change = np.empty(n, np.bool_)
+    change[0] = True
+    change[1:] = (l_sorted[1:] != l_sorted[:-1]) | (p_sorted[1:] != p_sorted[:-1])
+    bounds = np.flatnonzero(change)
+    heat_df = pd.DataFrame(
+        {
+            "layer": l_sorted[bounds],
+            "page_id": p_sorted[bounds],
+            "decay_hits": np.diff(np.append(bounds, n)),
+            "tenant_weight": np.float64(1.0),
+            "size_bytes": np.maximum.reduceat(pb_sorted, bounds),
+        }
     )
 
     # tier_caps_df
     bw_caps = pi.bandwidth_caps or _default_bandwidth_caps(pi.window_ms)
     free = pi.free_bytes or {0: 1 << 60, 1: 1 << 60, 2: 1 << 60}
-    caps_rows = [
-        (tier, int(bw_caps.get(tier, 0)), int(free.get(tier, 1 << 60))) for tier in sorted(set([0, 1, 2]).union(bw_caps.keys()).union(free.keys()))
-    ]
-    tier_caps_df = pd.DataFrame(caps_rows, columns=["tier", "bandwidth_caps", "free_bytes"])
+    tier_caps_df = _tier_caps_frame(
+        tuple(sorted(bw_caps.items())), tuple(sorted(free.items()))
+    )
 
-    # tenant_caps_df: if not provided, set very large caps
+    # tenant_caps_df: if not provided, set very large caps for each tenant
+    # seen in the requests
     if pi.tenant_caps:
-        trows = [(t, int(tier), int(cap)) for (t, tier, cap) in pi.tenant_caps]
+        tenant_caps_df = _tenant_caps_frame(tuple(pi.tenant_caps))
     else:
-        tenants = requests_df["tenant"].unique().tolist()
-        trows = [(t, int(tier), int(1 << 60)) for t in tenants for tier in [0, 1, 2]]
-    tenant_caps_df = pd.DataFrame(trows, columns=["tenant", "tier", "bandwidth_caps"])
+        tenant_caps_df = _default_tenant_caps_frame(
+            tuple(requests_df["tenant"].unique().tolist())
+        )
 
     # layer_lat_df
     if pi.layer_lat_ms:
-        lrows = [(int(k), float(v)) for k, v in sorted(pi.layer_lat_ms.items())]
+        layer_lat_df = _layer_lat_frame(tuple(sorted(pi.layer_lat_ms.items())))
     else:
-        layers = requests_df["layer"].unique().tolist()
-        lrows = [(int(ly), 1.0) for ly in layers]
-    layer_lat_df = pd.DataFrame(lrows, columns=["layer", "lat_ms"])
+        layer_lat_df = _default_layer_lat_frame(
+            tuple(requests_df["layer"].unique().tolist())
+        )
 
     return requests_df, heat_df, tier_caps_df, tenant_caps_df, layer_lat_df
 
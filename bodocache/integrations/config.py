@@ -5,6 +5,11 @@ from typing import Any, Dict, Optional
 
 try:
     import yaml  # type: ignore
+
+    try:  # libyaml C loader when available
+        from yaml import CSafeLoader as _SafeLoader  # type: ignore
+    except ImportError:
+        from yaml import SafeLoader as _SafeLoader  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     yaml = None  # type: ignore
 
@@ -39,8 +44,8 @@ def apply_kv_overrides(cfg: VLLMCacheConfig, overrides: KVOverrides | Dict[str,
 def load_kv_overrides(path: str) -> KVOverrides:
     if yaml is None:
         raise ImportError("pyyaml is required to load overrides from YAML")
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    with open(path, "rb") as f:
+        data = yaml.load(f, Loader=_SafeLoader) or {}
     kv = data.get("kv", {})
     return KVOverrides(
         block_size=kv.get("block_size"),
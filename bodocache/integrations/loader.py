@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import functools
 import importlib
 from typing import Any, Callable
 
 
+@functools.lru_cache(maxsize=1024)
 def load_callable(spec: str) -> Callable[..., Any]:
     """Load a callable from a `module:function` spec string.
 
     Example: `mypkg.mymodule:myfunc`
+
+    Resolutions are memoized per spec, so hot integration paths that pass
+    the same spec every window skip the import system after the first call.
     """
-    if ":" not in spec:
+    mod_name, sep, func_name = spec.partition(":")
+    if not sep:
         raise ValueError("spec must be 'module:function'")
-    mod_name, func_name = spec.split(":", 1)
     mod = importlib.import_module(mod_name)
     fn = getattr(mod, func_name)
     if not callable(fn):
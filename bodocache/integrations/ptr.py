@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from typing import Any
+import ctypes
+from typing import Any, Iterable, List
 
-import types
+# Configure the C-API entry point once at import time; per-call argtypes
+# assignment was pure overhead on hot prefetch paths.
+# PyCapsule* PyCapsule_New(void *pointer, const char *name, PyCapsule_Destructor destructor)
+_PyCapsule_New = ctypes.pythonapi.PyCapsule_New
+_PyCapsule_New.restype = ctypes.py_object
+_PyCapsule_New.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
+_CAP_NAME = b"device_ptr"
 
 
 def device_ptr_capsule(ptr: int) -> Any:
@@ -11,16 +18,16 @@ def device_ptr_capsule(ptr: int) -> Any:
     Many frameworks (e.g., PyTorch) provide an integer pointer via `.data_ptr()`.
     This helper wraps that integer as a capsule consumable by the native copy engine.
     """
-    import ctypes
-    import sys
+    return _PyCapsule_New(ptr, _CAP_NAME, None)
 
-    name = b"device_ptr"
-    # Create a capsule using CPython C-API via ctypes
-    # PyCapsule* PyCapsule_New(void *pointer, const char *name, PyCapsule_Destructor destructor)
-    PyCapsule_New = ctypes.pythonapi.PyCapsule_New
-    PyCapsule_New.restype = ctypes.py_object
-    PyCapsule_New.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
-    return PyCapsule_New(ctypes.c_void_p(ptr), name, None)
+
+def device_ptr_capsules(ptrs: Iterable[int]) -> List[Any]:
+    """Wrap a batch of integer device pointers as capsules.
+
+    One configured C-API call per pointer; accepts any iterable of ints,
+    including NumPy integer arrays.
+    """
+    return [_PyCapsule_New(int(p), _CAP_NAME, None) for p in ptrs]
 
 
 def from_torch_tensor(tensor: Any) -> Any:
@@ -30,4 +37,3 @@ def from_torch_tensor(tensor: Any) -> Any:
     """
     ptr = int(getattr(tensor, "data_ptr")())
     return device_ptr_capsule(ptr)
-
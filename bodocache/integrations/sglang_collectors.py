@@ -1,30 +1,70 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
 
 from .ptr import from_torch_tensor
 
 
-def make_sglang_collector(engine: Any):
+def csr_from_layer_blocks(layer_to_blocks: Dict[int, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten a layer->blocks mapping into CSR arrays.
+
+    Returns (layer_ids, block_ids, offsets): blocks for layer_ids[i] live at
+    block_ids[offsets[i]:offsets[i+1]]. No per-id Python int boxing — engine
+    arrays are adopted by np.asarray without a copy when dtypes match.
+    """
+    n = len(layer_to_blocks)
+    layer_ids = np.fromiter(layer_to_blocks.keys(), np.int32, count=n)
+    offsets = np.zeros(n + 1, np.int32)
+    arrs = []
+    for i, v in enumerate(layer_to_blocks.values()):
+        a = np.asarray(v, dtype=np.int32)
+        offsets[i + 1] = offsets[i] + a.size
+        arrs.append(a)
+    block_ids = np.concatenate(arrs) if arrs else np.empty(0, np.int32)
+    return layer_ids, block_ids, offsets
+
+
+def _as_int_list(v: Any) -> List[int]:
+    # Already-normalized lists pass through; anything else (ndarray, tensor,
+    # generic sequence) converts in one C pass instead of map(int, ...).
+    if type(v) is list and (not v or type(v[0]) is int):
+        return v
+    return np.asarray(v, dtype=np.int64).tolist()
+
+
+def make_sglang_collector(engine: Any, csr: bool = False):
+    """Build a collector(state) for SGLang-like engines.
+
+    By default returns Dict[layer, List[int]] for compatibility. With
+    csr=True, returns the (layer_ids, block_ids, offsets) CSR triple from
+    csr_from_layer_blocks, skipping Python-level int conversion entirely.
+    """
     bm = getattr(engine, "block_manager", None) or getattr(engine, "cache_engine", None)
 
-    def collector(state: Any) -> Dict[int, List[int]]:
+    def _normalise(out: Dict[Any, Any]):
+        if csr:
+            return csr_from_layer_blocks(out)
+        return {int(k): _as_int_list(v) for k, v in out.items()}
+
+    def collector(state: Any):
         if bm is not None:
             for name in ("next_required_blocks", "get_required_blocks", "collect_required_blocks"):
                 fn = getattr(bm, name, None)
                 if callable(fn):
                     out = fn(state)
                     if out is not None:
-                        return {int(k): list(map(int, v)) for k, v in out.items()}
+                        return _normalise(out)
         for name in ("next_required_blocks", "get_required_blocks", "collect_required_blocks"):
             fn = getattr(engine, name, None)
             if callable(fn):
                 out = fn(state)
                 if out is not None:
-                    return {int(k): list(map(int, v)) for k, v in out.items()}
+                    return _normalise(out)
         m = getattr(state, "layer_to_blocks", None)
         if isinstance(m, dict):
-            return {int(k): list(map(int, v)) for k, v in m.items()}
+            return _normalise(m)
         raise RuntimeError("could not collect required blocks from engine/state")
 
     return collector
@@ -13,15 +13,6 @@ DestResolverFn = Callable[[Dict[str, Any]], Any]
 GetConfigFn = Callable[[Any], VLLMCacheConfig]
 
 
-def _safe_get(obj: Any, path: Sequence[str], default: Any = None) -> Any:
-    cur = obj
-    for name in path:
-        if cur is None:
-            return default
-        cur = getattr(cur, name, None)
-    return default if cur is None else cur
-
-
 def _maybe_int(x: Any, default: int = 0) -> int:
     try:
         return int(x)
@@ -37,14 +28,19 @@ def _maybe_str(x: Any, default: str = "") -> str:
 
 
 def _derive_config(engine: Any) -> VLLMCacheConfig:
-    # SGLang-like detection with similar fields
-    block_size = _maybe_int(_safe_get(engine, ("cache_config", "block_size"), 16), 16)
-    kv_dtype = _maybe_str(
-        _safe_get(engine, ("cache_config", "cache_dtype"), None)
-        or _safe_get(engine, ("cache_config", "kv_dtype"), "float16"),
-        "float16",
+    # SGLang-like detection with similar fields. Attributes are fetched
+    # directly instead of through a generic path-walking helper; each probe
+    # is a single getattr with a None sentinel.
+    cc = getattr(engine, "cache_config", None)
+    bs = getattr(cc, "block_size", None) if cc is not None else None
+    block_size = _maybe_int(bs if bs is not None else 16, 16)
+    dt = None
+    if cc is not None:
+        dt = getattr(cc, "cache_dtype", None) or getattr(cc, "kv_dtype", None)
+    kv_dtype = _maybe_str(dt if dt is not None else "float16", "float16")
+    mc = getattr(engine, "model_config", None) or getattr(
+        getattr(engine, "engine", None), "model_config", None
     )
-    mc = getattr(engine, "model_config", None) or _safe_get(engine, ("engine", "model_config"), None)
     num_layers = _maybe_int(getattr(mc, "num_hidden_layers", None), 0)
     num_kv_heads = 0
     if mc is not None:
@@ -99,10 +95,26 @@ class SGLangIntegration:
         self._dest_resolver = dest_resolver
         self._kv_overrides = kv_overrides
         self._deadline_offset_ms = deadline_offset_ms
+        # _derive_config walks the engine's attribute tree; the result only
+        # changes on a model swap, so cache it per engine identity and let
+        # callers invalidate explicitly.
+        self._cfg_cache: Optional[VLLMCacheConfig] = None
+        self._cfg_engine_id: Optional[int] = None
+
+    def invalidate_config(self) -> None:
+        """Drop the cached config; call after swapping the engine's model."""
+        self._cfg_cache = None
+        self._cfg_engine_id = None
 
     def _config(self) -> VLLMCacheConfig:
+        if self._cfg_cache is not None and self._cfg_engine_id == id(self.engine):
+            return self._cfg_cache
         cfg = self._get_config(self.engine) if self._get_config is not None else _derive_config(self.engine)
-        return apply_kv_overrides(cfg, self._kv_overrides)
+        if self._kv_overrides is not None:
+            cfg = apply_kv_overrides(cfg, self._kv_overrides)
+        self._cfg_cache = cfg
+        self._cfg_engine_id = id(self.engine)
+        return cfg
 
     def prefetch_step(
         self,
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import operator
 import time
 
+import numpy as np
 import pandas as pd
 
 from bodocache.planner.scheduler import run_window
@@ -16,6 +20,32 @@ ReadyCallback = Callable[[Dict[str, Any]], None]
 HintProvider = Callable[[int, Sequence[KVRequest]], Sequence[KVRequest]]
 
 
+# Dedup key for merging live and hint requests. attrgetter builds the tuple
+# in one C call per request, versus a Python frame per _request_key call.
+_request_key = operator.attrgetter(
+    "prefix_id", "layer", "page_start", "page_end", "tenant", "tier_src", "tier_dst"
+)
+
+
+def _empty_frame(schema: Dict[str, Any]) -> pd.DataFrame:
+    return pd.DataFrame({name: pd.Series(dtype=dt) for name, dt in schema.items()})
+
+
+# Shared zero-row results for idle decode steps, matching the planner's
+# output schemas so downstream consumers see the usual columns.
+_EMPTY_PLAN_DF = _empty_frame({
+    "node": object, "tier_src": np.int64, "tier_dst": np.int64,
+    "pcluster": np.int64, "layer": np.int64, "run_id": np.int64,
+    "bytes": np.int64, "deadline_ms": np.int64, "fanout": np.int64,
+    "overlap": np.int64, "priority": np.float64,
+    "start_pid": np.int64, "end_pid": np.int64, "page_bytes": np.int64,
+})
+_EMPTY_EVICT_DF = _empty_frame({"layer": np.int64, "page_id": np.int64})
+_EMPTY_ADMISSION_DF = _empty_frame({
+    "layer": np.int64, "page_id": np.int64, "tier_dst": np.int64,
+})
+
+
 @dataclass
 class PrefetchResult:
     plan_df: pd.DataFrame
@@ -73,6 +103,7 @@ class VLLMBCacheAdapter:
         capture_metrics: bool = True,
         trace: Optional[TraceRecorder] = None,
         hint_provider: Optional[HintProvider] = None,
+        emit_route_hints: bool = False,
     ) -> None:
         self.agent = agent
         self.node = node
@@ -92,18 +123,16 @@ class VLLMBCacheAdapter:
         self.capture_metrics = capture_metrics
         self.trace = trace
         self.hint_provider = hint_provider
-
-    @staticmethod
-    def _request_key(req: KVRequest) -> Tuple[str, int, int, int, str, int, int]:
-        return (
-            req.prefix_id,
-            int(req.layer),
-            int(req.page_start),
-            int(req.page_end),
-            req.tenant,
-            int(req.tier_src),
-            int(req.tier_dst),
-        )
+        # Opt-in: annotating plan rows with route hints costs time
+        # proportional to plan size, so callers that never read the column
+        # leave it off.
+        self.emit_route_hints = emit_route_hints
+        # Identifier columns are the same string broadcast over every row;
+        # single-category dtypes make each assignment an int8 codes array
+        # plus a shared category table instead of an object array.
+        self._node_dtype = pd.CategoricalDtype([node])
+        self._model_id_dtype = pd.CategoricalDtype([model_id])
+        self._model_version_dtype = pd.CategoricalDtype([model_version])
 
     def prefetch(
         self,
@@ -129,15 +158,15 @@ class VLLMBCacheAdapter:
         combined: Dict[Tuple[str, int, int, int, str, int, int], KVRequest] = {}
         source_by_key: Dict[Tuple[str, int, int, int, str, int, int], str] = {}
         for req in live_requests:
-            key = self._request_key(req)
+            key = _request_key(req)
             combined[key] = req
             source_by_key[key] = "live"
         for hint in hint_requests:
-            key = self._request_key(hint)
-            if key in combined:
-                continue
-            combined[key] = hint
-            source_by_key[key] = "hint"
+            key = _request_key(hint)
+            # setdefault folds the membership test and insert into one lookup;
+            # identity tells us whether the hint actually landed.
+            if combined.setdefault(key, hint) is hint:
+                source_by_key[key] = "hint"
 
         merged_requests: List[KVRequest] = list(combined.values())
 
@@ -149,36 +178,42 @@ class VLLMBCacheAdapter:
             sharded: List[KVRequest] = []
             sharded_sources: Dict[Tuple[str, int, int, int, str, int, int], str] = {}
             for r in merged_requests:
-                # Split into single-page requests owned by this rank.
                 start = int(r.page_start)
                 end = int(r.page_end)
                 if end < start:
                     continue
-                origin_source = source_by_key.get(self._request_key(r), "live")
-                for pid in range(start, end + 1):
-                    if (pid % ws) != rk:
-                        continue
-                    new_req = KVRequest(
-                        req_id=f"{r.req_id}-sh{pid}",
-                        node=r.node,
-                        model_id=r.model_id,
-                        model_version=r.model_version,
-                        prefix_id=r.prefix_id,
-                        layer=int(r.layer),
-                        page_start=pid,
-                        page_end=pid,
-                        page_bytes=int(r.page_bytes),
-                        tenant=r.tenant,
-                        est_fill_ms=float(r.est_fill_ms),
-                        tier_src=int(r.tier_src),
-                        tier_dst=int(r.tier_dst),
-                        deadline_ms=int(r.deadline_ms),
-                    )
+                # Owned pages form an arithmetic progression; jump straight to
+                # the first one instead of testing every page id.
+                first = start + ((rk - start) % ws)
+                if first > end:
+                    continue
+                parent_key = _request_key(r)
+                origin_source = source_by_key.get(parent_key, "live")
+                req_id = r.req_id
+                for pid in range(first, end + 1, ws):
+                    # Child requests differ from the parent only in id/pages;
+                    # derive both the dataclass and its key accordingly.
+                    new_req = replace(r, req_id=f"{req_id}-sh{pid}", page_start=pid, page_end=pid)
                     sharded.append(new_req)
-                    sharded_sources[self._request_key(new_req)] = origin_source
+                    sharded_sources[
+                        parent_key[:2] + (pid, pid) + parent_key[4:]
+                    ] = origin_source
             merged_requests = sharded
             source_by_key = sharded_sources
 
+        # Idle step: skip the planner and agent entirely rather than pushing
+        # empty frames through them. Copies keep the cached frames immutable
+        # to callers (copying an empty frame is trivial), and the stats dict
+        # matches what agent.execute returns for an empty plan.
+        if not merged_requests:
+            return PrefetchResult(
+                plan_df=_EMPTY_PLAN_DF.copy(),
+                evict_df=_EMPTY_EVICT_DF.copy(),
+                admission_df=_EMPTY_ADMISSION_DF.copy(),
+                exec_stats={"ops": 0, "bytes": 0, "duration_ms": 0.0},
+                metrics=None,
+            )
+
         # Prepare planner inputs
         pi = PlannerInputs(
             requests=list(merged_requests),
@@ -193,23 +228,23 @@ class VLLMBCacheAdapter:
 
         # Inject node/model identifiers for all rows
         if not req_df.empty:
-            req_df["node"] = self.node
-            req_df["model_id"] = self.model_id
-            req_df["model_version"] = self.model_version
+            codes = np.zeros(len(req_df), dtype=np.int8)
+            req_df["node"] = pd.Categorical.from_codes(codes, dtype=self._node_dtype)
+            req_df["model_id"] = pd.Categorical.from_codes(codes, dtype=self._model_id_dtype)
+            req_df["model_version"] = pd.Categorical.from_codes(codes, dtype=self._model_version_dtype)
             if source_by_key:
-                def _row_source(row: pd.Series) -> str:
-                    key = (
-                        row["prefix_id"],
-                        int(row["layer"]),
-                        int(row["page_start"]),
-                        int(row["page_end"]),
-                        row["tenant"],
-                        int(row["tier_src"]),
-                        int(row["tier_dst"]),
-                    )
-                    return source_by_key.get(key, "live")
-
-                req_df["request_source"] = req_df.apply(_row_source, axis=1)
+                # Tag rows via a C-level hash join on the request key columns
+                # instead of a per-row Python apply.
+                key_cols = [
+                    "prefix_id", "layer", "page_start", "page_end",
+                    "tenant", "tier_src", "tier_dst",
+                ]
+                src_df = pd.DataFrame(
+                    [k + (v,) for k, v in source_by_key.items()],
+                    columns=key_cols + ["request_source"],
+                )
+                req_df = req_df.merge(src_df, on=key_cols, how="left")
+                req_df["request_source"] = req_df["request_source"].fillna("live")
 
         # Plan
         plan_df, evict_df, admission_df = run_window(
@@ -231,31 +266,45 @@ class VLLMBCacheAdapter:
             enforce_tier_caps=self.enforce_caps,
         )
 
-        if not plan_df.empty:
+        if self.emit_route_hints and not plan_df.empty:
+            # Bucket requests by (layer, tier_src, tier_dst) with page
+            # intervals sorted by start, so each plan row does one dict hit
+            # plus a bisect instead of scanning every merged request. Entries
+            # keep their merged_requests position so the live-first /
+            # first-candidate preference is unchanged.
+            buckets: Dict[Tuple[int, int, int], List[Tuple[int, int, int, bool, str]]] = defaultdict(list)
+            for pos, req in enumerate(merged_requests):
+                is_live = source_by_key.get(_request_key(req), "live") == "live"
+                buckets[(int(req.layer), int(req.tier_src), int(req.tier_dst))].append(
+                    (int(req.page_start), int(req.page_end), pos, is_live, req.prefix_id)
+                )
+            for entries in buckets.values():
+                entries.sort()
+            starts_by_bucket = {k: [e[0] for e in v] for k, v in buckets.items()}
+
             route_hints: List[Optional[str]] = []
             for row in plan_df.itertuples(index=False):
-                row_layer = int(getattr(row, "layer", -1))
-                row_src = int(getattr(row, "tier_src", -1))
-                row_dst = int(getattr(row, "tier_dst", -1))
                 row_start = int(getattr(row, "start_pid", -1))
                 row_end = int(getattr(row, "end_pid", -1))
-                candidates: List[KVRequest] = [
-                    req
-                    for req in merged_requests
-                    if int(req.layer) == row_layer
-                    and int(req.tier_src) == row_src
-                    and int(req.tier_dst) == row_dst
-                    and int(req.page_end) >= row_start
-                    and int(req.page_start) <= row_end
-                ]
-                chosen: Optional[KVRequest] = None
-                for req in candidates:
-                    if source_by_key.get(self._request_key(req), "live") == "live":
-                        chosen = req
-                        break
-                if chosen is None and candidates:
-                    chosen = candidates[0]
-                route_hints.append(f"prefix:{chosen.prefix_id}" if chosen is not None else None)
+                bkey = (
+                    int(getattr(row, "layer", -1)),
+                    int(getattr(row, "tier_src", -1)),
+                    int(getattr(row, "tier_dst", -1)),
+                )
+                entries = buckets.get(bkey)
+                best_live: Optional[Tuple[int, str]] = None
+                best_any: Optional[Tuple[int, str]] = None
+                if entries:
+                    hi = bisect_right(starts_by_bucket[bkey], row_end)
+                    for p_start, p_end, pos, is_live, prefix_id in entries[:hi]:
+                        if p_end < row_start:
+                            continue
+                        if best_any is None or pos < best_any[0]:
+                            best_any = (pos, prefix_id)
+                        if is_live and (best_live is None or pos < best_live[0]):
+                            best_live = (pos, prefix_id)
+                chosen = best_live or best_any
+                route_hints.append(f"prefix:{chosen[1]}" if chosen is not None else None)
             plan_df = plan_df.assign(route_hint=route_hints)
 
         # Optional eviction/admission side-effects
@@ -271,28 +320,48 @@ class VLLMBCacheAdapter:
                 pass
 
         # Execute via NodeAgent (simulated or native engine)
-        deadlines: Dict[tuple, float] = {}
+        # The agent tags every info dict with the plan row it came from, so
+        # deadline lookups are a plain array index — no keys, no dict.
+        deadlines_arr: Optional[np.ndarray] = None
         if self.capture_metrics and not plan_df.empty:
-            base = float(now_ms)
-            for r in plan_df.itertuples(index=False):
-                key = (int(getattr(r, 'layer', -1)), int(getattr(r, 'start_pid', -1)), int(getattr(r, 'end_pid', -1)))
-                deadlines[key] = float(getattr(r, 'deadline_ms', base)) - base
+            deadlines_arr = plan_df['deadline_ms'].to_numpy(dtype=np.float64) - float(now_ms)
 
-        ready_count = 0
-        on_time_count = 0
+        # Completions only append (info, perf_counter stamp) to a batch; the
+        # wall-clock anchor below is read once per window and all deadline
+        # math plus trace recording happens in one flush after execute().
+        ready_batch: List[Tuple[Dict[str, Any], int]] = []
 
         def _wrap_on_ready(info: Dict[str, Any]):
-            nonlocal ready_count, on_time_count
-            ready_count += 1
-            if self.capture_metrics and deadlines:
-                key = (int(info.get('layer', -1)), int(info.get('start_pid', -1)), int(info.get('end_pid', -1)))
-                finish = (time.time() * 1000.0) - float(now_ms)
-                deadline = deadlines.get(key, float('inf'))
-                if finish <= deadline:
+            ready_batch.append((info, time.perf_counter_ns()))
+            if on_ready is not None:
+                on_ready(info)
+
+        anchor_wall_ms = time.time() * 1000.0
+        anchor_ns = time.perf_counter_ns()
+
+        stats = self.agent.execute(
+            plan_df,
+            model_id=self.model_id,
+            model_version=self.model_version,
+            on_ready=_wrap_on_ready if (self.capture_metrics or on_ready is not None) else None,
+            dest_resolver=dest_resolver,
+        )
+
+        ready_count = len(ready_batch)
+        on_time_count = 0
+        if self.capture_metrics and ready_batch and deadlines_arr is not None:
+            stamps = np.array([s for _, s in ready_batch], dtype=np.int64)
+            finishes = (stamps - anchor_ns) / 1e6 + (anchor_wall_ms - float(now_ms))
+            events: List[PrefetchEvent] = []
+            for (info, _), finish in zip(ready_batch, finishes.tolist()):
+                idx = int(info.get('plan_idx', -1))
+                deadline = float(deadlines_arr[idx]) if 0 <= idx < len(deadlines_arr) else float('inf')
+                on_time = finish <= deadline
+                if on_time:
                     on_time_count += 1
                 if self.trace is not None:
-                    try:
-                        ev = PrefetchEvent(
+                    events.append(
+                        PrefetchEvent(
                             window_ms=self.window_ms,
                             now_ms=int(now_ms),
                             node=self.node,
@@ -304,21 +373,14 @@ class VLLMBCacheAdapter:
                             bytes=int(info.get('bytes', 0)),
                             deadline_rel_ms=float(deadline),
                             finish_rel_ms=float(finish),
-                            on_time=int(1 if finish <= deadline else 0),
+                            on_time=int(1 if on_time else 0),
                         )
-                        self.trace.record(ev)
-                    except Exception:
-                        pass
-            if on_ready is not None:
-                on_ready(info)
-
-        stats = self.agent.execute(
-            plan_df,
-            model_id=self.model_id,
-            model_version=self.model_version,
-            on_ready=_wrap_on_ready if (self.capture_metrics or on_ready is not None) else None,
-            dest_resolver=dest_resolver,
-        )
+                    )
+            if events:
+                try:
+                    self.trace.record_batch(events)
+                except Exception:
+                    pass
 
         metrics = None
         if self.capture_metrics and ready_count > 0:
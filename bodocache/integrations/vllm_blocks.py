@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
 
-from .base import KVRequest
+import numpy as np
+
+from .base import KVRequest, REQUEST_DTYPE
 
 
 _DTYPE_BYTES = {
@@ -23,27 +25,100 @@ class VLLMCacheConfig:
     head_size: int
     kv_dtype: str = "float16"
 
-    def bytes_per_block(self) -> int:
-        # 2 for K and V tensors
+    def __post_init__(self) -> None:
+        # Computed once here; bytes_per_block sits in per-layer per-step
+        # loops, so it should not redo the dtype lookup and multiplies.
+        # 2 for K and V tensors.
         bpe = _DTYPE_BYTES.get(self.kv_dtype, 2)
-        return 2 * self.num_kv_heads * self.block_size * self.head_size * bpe
+        self._bytes_per_block = 2 * self.num_kv_heads * self.block_size * self.head_size * bpe
+
+    def bytes_per_block(self) -> int:
+        return self._bytes_per_block
+
+
+@dataclass(frozen=True)
+class LayerBlocks:
+    """Structure-of-arrays form of a layer -> block-ids mapping.
+
+    Blocks for layer_ids[i] live at blocks[offsets[i]:offsets[i+1]]. Two
+    flat int arrays replace a dict of Python int lists, so per-step
+    collectors can hand the planner engine arrays without boxing.
+    """
+
+    layer_ids: np.ndarray
+    blocks: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def from_dict(cls, layer_to_blocks: Dict[int, Sequence[int]]) -> "LayerBlocks":
+        n = len(layer_to_blocks)
+        layer_ids = np.fromiter(layer_to_blocks.keys(), np.int64, count=n)
+        offsets = np.zeros(n + 1, np.int64)
+        arrs = []
+        for i, v in enumerate(layer_to_blocks.values()):
+            a = np.asarray(v, dtype=np.int64)
+            offsets[i + 1] = offsets[i] + a.size
+            arrs.append(a)
+        blocks = np.concatenate(arrs) if arrs else np.empty(0, np.int64)
+        return cls(layer_ids=layer_ids, blocks=blocks, offsets=offsets)
+
+
+def _coalesce_arrays(block_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dedup/sort block ids and return contiguous-run (starts, ends) arrays."""
+    a = np.unique(np.asarray(block_ids, dtype=np.int64))
+    if a.size == 0:
+        return a, a
+    breaks = np.flatnonzero(np.diff(a) != 1)
+    starts = np.concatenate(([a[0]], a[breaks + 1]))
+    ends = np.concatenate((a[breaks], [a[-1]]))
+    return starts, ends
 
 
 def coalesce_blocks(block_ids: Sequence[int]) -> List[Tuple[int, int]]:
-    if not block_ids:
-        return []
-    s = sorted(set(int(b) for b in block_ids))
-    ranges = []
-    a = s[0]
-    prev = a
-    for b in s[1:]:
-        if b == prev + 1:
-            prev = b
-            continue
-        ranges.append((a, prev))
-        a = prev = b
-    ranges.append((a, prev))
-    return ranges
+    # Run detection happens in C; only the final (start, end) pairs touch
+    # Python.
+    starts, ends = _coalesce_arrays(block_ids)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _coalesce_layer_arrays(
+    layer_to_blocks: Union[Dict[int, Sequence[int]], LayerBlocks],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Coalesce all layers in one flat pass.
+
+    One lexsort over (layer, block) replaces a sort+unique per layer; runs
+    break where the layer changes or the block gap exceeds 1. Accepts the
+    mapping either as a dict or already flattened as LayerBlocks. Returns
+    per-run (layers, starts, ends) arrays ordered by layer then block.
+    """
+    if isinstance(layer_to_blocks, LayerBlocks):
+        counts = np.diff(layer_to_blocks.offsets)
+        la = np.repeat(layer_to_blocks.layer_ids.astype(np.int64), counts)
+        ba = layer_to_blocks.blocks.astype(np.int64, copy=False)
+    else:
+        parts = [
+            (np.full(len(b), int(layer), np.int64), np.asarray(b, dtype=np.int64))
+            for layer, b in layer_to_blocks.items()
+        ]
+        if not parts:
+            empty = np.empty(0, np.int64)
+            return empty, empty, empty
+        la = np.concatenate([p[0] for p in parts])
+        ba = np.concatenate([p[1] for p in parts])
+    if la.size == 0:
+        return la, ba, ba
+    order = np.lexsort((ba, la))
+    la = la[order]
+    ba = ba[order]
+    keep = np.ones(la.size, dtype=bool)
+    keep[1:] = (la[1:] != la[:-1]) | (ba[1:] != ba[:-1])
+    la = la[keep]
+    ba = ba[keep]
+    breaks = np.flatnonzero((la[1:] != la[:-1]) | (ba[1:] != ba[:-1] + 1))
+    run_starts = np.concatenate(([0], breaks + 1))
+    starts = ba[run_starts]
+    ends = ba[np.append(breaks, la.size - 1)]
+    return la[run_starts], starts, ends
 
 
 def build_requests_from_blocks(
@@ -54,31 +129,75 @@ def build_requests_from_blocks(
     model_version: str,
     tenant: str,
     prefix_id: str,
-    layer_to_blocks: Dict[int, Sequence[int]],
+    layer_to_blocks: Union[Dict[int, Sequence[int]], LayerBlocks],
     now_ms: int,
     deadline_offset_ms: int = 20,
 ) -> List[KVRequest]:
-    page_bytes = cfg.bytes_per_block()
+    page_bytes = int(cfg.bytes_per_block())
+    deadline_ms = int(now_ms + deadline_offset_ms)
+    layers, starts, ends = _coalesce_layer_arrays(layer_to_blocks)
     reqs: List[KVRequest] = []
-    for layer, blocks in layer_to_blocks.items():
-        for start, end in coalesce_blocks(blocks):
-            reqs.append(
-                KVRequest(
-                    req_id=f"{prefix_id}:{layer}:{start}-{end}",
-                    node=node,
-                    model_id=model_id,
-                    model_version=model_version,
-                    prefix_id=prefix_id,
-                    layer=int(layer),
-                    page_start=int(start),
-                    page_end=int(end),
-                    page_bytes=int(page_bytes),
-                    tenant=tenant,
-                    est_fill_ms=1.0,
-                    tier_src=0,
-                    tier_dst=2,
-                    deadline_ms=int(now_ms + deadline_offset_ms),
-                )
+    for layer, start, end in zip(layers.tolist(), starts.tolist(), ends.tolist()):
+        reqs.append(
+            KVRequest(
+                req_id=f"{prefix_id}:{layer}:{start}-{end}",
+                node=node,
+                model_id=model_id,
+                model_version=model_version,
+                prefix_id=prefix_id,
+                layer=layer,
+                page_start=start,
+                page_end=end,
+                page_bytes=page_bytes,
+                tenant=tenant,
+                est_fill_ms=1.0,
+                tier_src=0,
+                tier_dst=2,
+                deadline_ms=deadline_ms,
             )
+        )
     return reqs
 
+
+def build_request_soa(
+    cfg: VLLMCacheConfig,
+    *,
+    node: str,
+    model_id: str,
+    model_version: str,
+    tenant: str,
+    prefix_id: str,
+    layer_to_blocks: Union[Dict[int, Sequence[int]], LayerBlocks],
+    now_ms: int,
+    deadline_offset_ms: int = 20,
+) -> np.ndarray:
+    """Columnar sibling of build_requests_from_blocks.
+
+    Returns a REQUEST_DTYPE structured array for PlannerInputs.from_soa, so
+    large prefixes skip the per-range KVRequest allocations entirely —
+    coalescing, page columns and the scalar broadcasts all stay in NumPy.
+    """
+    page_bytes = cfg.bytes_per_block()
+    layer_arr, start_arr, end_arr = _coalesce_layer_arrays(layer_to_blocks)
+    if layer_arr.size == 0:
+        return np.empty(0, REQUEST_DTYPE)
+    rec = np.empty(layer_arr.size, REQUEST_DTYPE)
+    rec["req_id"] = [
+        f"{prefix_id}:{l}:{s}-{e}"
+        for l, s, e in zip(layer_arr.tolist(), start_arr.tolist(), end_arr.tolist())
+    ]
+    rec["node"] = node
+    rec["model_id"] = model_id
+    rec["model_version"] = model_version
+    rec["prefix_id"] = prefix_id
+    rec["layer"] = layer_arr
+    rec["page_start"] = start_arr
+    rec["page_end"] = end_arr
+    rec["tier_src"] = 0
+    rec["tier_dst"] = 2
+    rec["deadline_ms"] = int(now_ms + deadline_offset_ms)
+    rec["page_bytes"] = int(page_bytes)
+    rec["tenant"] = tenant
+    rec["est_fill_ms"] = 1.0
+    return rec
+
@@ -1,37 +1,60 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from .ptr import from_torch_tensor
 
+_COLLECT_METHOD_NAMES = (
+    "next_required_blocks",
+    "get_required_blocks",
+    "collect_required_blocks",
+)
+
+
+def _as_int32_array(v: Any) -> np.ndarray:
+    # Keep block ids as a compact int32 array end to end: downstream
+    # coalescing (build_requests_from_blocks, contiguous_runs) converts to
+    # NumPy anyway, so boxing to Python ints here was pure double work.
+    if hasattr(v, "cpu") and hasattr(v, "numpy"):  # torch tensor
+        return v.cpu().numpy().astype(np.int32, copy=False)
+    return np.asarray(v, dtype=np.int32)
+
 
 def make_vllm_collector(engine: Any):
-    """Return a collector(state) -> Dict[layer, List[int]] for vLLM-like engines.
+    """Return a collector(state) -> Dict[layer, np.ndarray] for vLLM-like engines.
 
-    Tries several common APIs; override if your engine differs.
+    Block ids come back as int32 arrays, which downstream request building
+    accepts directly. Tries several common APIs; override if your engine
+    differs. Candidate methods are probed once here, at construction, so the
+    per-step collector calls a single pre-resolved bound method instead of
+    re-walking the name list every time.
     """
 
     bm = getattr(engine, "block_manager", None) or getattr(engine, "cache_engine", None)
 
-    def collector(state: Any) -> Dict[int, List[int]]:
-        # Preferred engine APIs
-        if bm is not None:
-            for name in ("next_required_blocks", "get_required_blocks", "collect_required_blocks"):
-                fn = getattr(bm, name, None)
-                if callable(fn):
-                    out = fn(state)
-                    if out is not None:
-                        return {int(k): list(map(int, v)) for k, v in out.items()}
-        for name in ("next_required_blocks", "get_required_blocks", "collect_required_blocks"):
-            fn = getattr(engine, name, None)
+    fetch: Optional[Any] = None
+    for obj in (bm, engine):
+        if obj is None:
+            continue
+        for name in _COLLECT_METHOD_NAMES:
+            fn = getattr(obj, name, None)
             if callable(fn):
-                out = fn(state)
-                if out is not None:
-                    return {int(k): list(map(int, v)) for k, v in out.items()}
+                fetch = fn
+                break
+        if fetch is not None:
+            break
+
+    def collector(state: Any) -> Dict[int, np.ndarray]:
+        if fetch is not None:
+            out = fetch(state)
+            if out is not None:
+                return {int(k): _as_int32_array(v) for k, v in out.items()}
         # Fallback: accept a mapping on state directly
         m = getattr(state, "layer_to_blocks", None)
         if isinstance(m, dict):
-            return {int(k): list(map(int, v)) for k, v in m.items()}
+            return {int(k): _as_int32_array(v) for k, v in m.items()}
         raise RuntimeError("could not collect required blocks from engine/state")
 
     return collector
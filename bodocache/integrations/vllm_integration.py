@@ -13,6 +13,9 @@ DestResolverFn = Callable[[Dict[str, Any]], Any]
 GetConfigFn = Callable[[Any], VLLMCacheConfig]
 ContextParallelResolver = Callable[[Any], Optional[ContextParallelSpec]]
 
+# Sentinel for "not probed yet" in the context-parallel cache.
+_CP_UNSET = object()
+
 
 def _safe_get(obj: Any, path: Sequence[str], default: Any = None) -> Any:
     cur = obj
@@ -38,16 +41,21 @@ def _maybe_str(x: Any, default: str = "") -> str:
 
 
 def _derive_config(engine: Any) -> VLLMCacheConfig:
-    # Attempt to introspect vLLM-like engine configs; fall back to sensible defaults.
-    block_size = _maybe_int(_safe_get(engine, ("cache_config", "block_size"), 16), 16)
-    kv_dtype = _maybe_str(
-        _safe_get(engine, ("cache_config", "cache_dtype"), None)
-        or _safe_get(engine, ("cache_config", "kv_dtype"), "float16"),
-        "float16",
-    )
+    # Attempt to introspect vLLM-like engine configs; fall back to sensible
+    # defaults. Cache-config fields are fetched directly rather than through
+    # the generic path-walking helper.
+    cc = getattr(engine, "cache_config", None)
+    bs = getattr(cc, "block_size", None) if cc is not None else None
+    block_size = _maybe_int(bs if bs is not None else 16, 16)
+    dt = None
+    if cc is not None:
+        dt = getattr(cc, "cache_dtype", None) or getattr(cc, "kv_dtype", None)
+    kv_dtype = _maybe_str(dt if dt is not None else "float16", "float16")
 
     # Try typical vLLM locations for model config
-    mc = getattr(engine, "model_config", None) or _safe_get(engine, ("llm_engine", "model_config"), None)
+    mc = getattr(engine, "model_config", None) or getattr(
+        getattr(engine, "llm_engine", None), "model_config", None
+    )
     num_layers = _maybe_int(getattr(mc, "num_hidden_layers", None), 0)
 
     # num_kv_heads may be exposed via a method or attribute, else fall back
@@ -116,10 +124,30 @@ class VLLMIntegration:
         self._kv_overrides = kv_overrides
         self._deadline_offset_ms = deadline_offset_ms
         self._context_parallel = context_parallel
+        # _derive_config and _auto_context_parallel both walk the engine's
+        # attribute tree; the results only change on a model swap or topology
+        # change, so cache them per engine identity and let callers invalidate
+        # explicitly. The context-parallel cache needs a sentinel because None
+        # ("no sharding") is itself a valid cached answer.
+        self._cfg_cache: Optional[VLLMCacheConfig] = None
+        self._cfg_engine_id: Optional[int] = None
+        self._cp_cache: Any = _CP_UNSET
+
+    def invalidate_config(self) -> None:
+        """Drop cached derived config and context-parallel topology."""
+        self._cfg_cache = None
+        self._cfg_engine_id = None
+        self._cp_cache = _CP_UNSET
 
     def _config(self) -> VLLMCacheConfig:
+        if self._cfg_cache is not None and self._cfg_engine_id == id(self.engine):
+            return self._cfg_cache
         cfg = self._get_config(self.engine) if self._get_config is not None else _derive_config(self.engine)
-        return apply_kv_overrides(cfg, self._kv_overrides)
+        if self._kv_overrides is not None:
+            cfg = apply_kv_overrides(cfg, self._kv_overrides)
+        self._cfg_cache = cfg
+        self._cfg_engine_id = id(self.engine)
+        return cfg
 
     def prefetch_step(
         self,
@@ -174,6 +202,12 @@ class VLLMIntegration:
 
     def _auto_context_parallel(self) -> Optional[ContextParallelSpec]:
         # Heuristics over engine attributes; returns None if world size <= 1 or unavailable.
+        if self._cp_cache is not _CP_UNSET:
+            return self._cp_cache
+        self._cp_cache = self._probe_context_parallel()
+        return self._cp_cache
+
+    def _probe_context_parallel(self) -> Optional[ContextParallelSpec]:
         engine = self.engine
         world_size_paths = (
             ("cache_config", "context_parallel_size"),
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import functools
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+try:  # pragma: no cover - optional JIT for large batches
+    from numba import njit as _njit, prange
+except ImportError:  # pragma: no cover - numba not installed
+    _njit = None
+    prange = range
+
 # Optional blake3 dependency with safe fallback
 try:  # pragma: no cover - trivial import/fallback
     from blake3 import blake3 as _blake3_ctor  # type: ignore
@@ -20,6 +28,28 @@ except Exception:  # pragma: no cover - fallback path
         return hashlib.blake2b(b, digest_size=32).digest()
 
 
+# Most prefixes persist across planner windows, so both assigners memoize
+# per-prefix values in a bounded LRU instead of rehashing every window. The
+# cached values are bucket-independent (raw digest / combined band key), so
+# one entry serves any `buckets` argument.
+_PREFIX_HASH_CACHE: "OrderedDict[str, int]" = OrderedDict()
+_BAND_KEY_CACHE: "OrderedDict[Tuple[str, int, int, int], int]" = OrderedDict()
+_PCLUSTER_CACHE_MAX = 1 << 20
+
+
+def _cache_get(cache: OrderedDict, key) -> Optional[int]:
+    v = cache.get(key)
+    if v is not None:
+        cache.move_to_end(key)
+    return v
+
+
+def _cache_put(cache: OrderedDict, key, value: int) -> None:
+    cache[key] = value
+    if len(cache) > _PCLUSTER_CACHE_MAX:
+        cache.popitem(last=False)
+
+
 def hash_bucket(s: str, buckets: int = 64) -> int:
     d = _blake_digest(s.encode('utf-8'))
     return int.from_bytes(d[:4], 'little') % max(1, buckets)
@@ -34,21 +64,160 @@ def assign_pclusters(df: pd.DataFrame, buckets: int = 64) -> pd.DataFrame:
     if 'prefix_id' not in df.columns:
         raise KeyError('prefix_id column required')
     out = df.copy()
-    out['pcluster'] = out['prefix_id'].apply(lambda s: hash_bucket(str(s), buckets)).astype(np.int64)
+    # Hash each distinct prefix once, then broadcast through factorize codes;
+    # recurring prefixes come straight out of the LRU without a digest call.
+    codes, uniques = pd.factorize(df['prefix_id'], use_na_sentinel=False)
+    arr = np.empty(len(uniques), np.int64)
+    for i, s in enumerate(uniques):
+        key = str(s)
+        v = _cache_get(_PREFIX_HASH_CACHE, key)
+        if v is None:
+            v = int.from_bytes(_blake_digest(key.encode('utf-8'))[:4], 'little')
+            _cache_put(_PREFIX_HASH_CACHE, key, v)
+        arr[i] = v
+    out['pcluster'] = (arr % max(1, buckets))[codes]
     return out
 
 
-def _k_shingles(s: str, k: int = 5):
-    s = str(s)
-    if len(s) <= k:
-        return [s]
-    return [s[i:i+k] for i in range(len(s) - k + 1)]
+# MinHash arithmetic runs in a 31-bit Mersenne field: coefficients, gram
+# fingerprints and signatures all stay below 2^31, so the a*g+b products fit
+# int64 and every step is a plain vector op.
+_MH_PRIME = (1 << 31) - 1
+_MH_BASE = 1_000_003
+
+
+@functools.lru_cache(maxsize=4)
+def _minhash_coeffs(num_hashes: int):
+    # Fixed seed: the hash family must agree across processes and runs.
+    rng = np.random.default_rng(0xB0D0CACE)
+    a = rng.integers(1, _MH_PRIME, size=num_hashes, dtype=np.int64)
+    b = rng.integers(0, _MH_PRIME, size=num_hashes, dtype=np.int64)
+    return a, b
+
+
+def _poly_fold(mat: np.ndarray) -> np.ndarray:
+    """Horner-fold matrix columns into one field-element fingerprint per row."""
+    fp = np.zeros(len(mat), np.int64)
+    for col in range(mat.shape[1]):
+        fp = (fp * _MH_BASE + (mat[:, col] % _MH_PRIME)) % _MH_PRIME
+    return fp
+
+
+def _rolling_gram_kernel_py(values, k, pop):
+    """Rabin-Karp rolling fingerprints; identical output to the windowed fold.
+
+    `pop` is _MH_BASE**(k-1) mod _MH_PRIME, the factor that retires the
+    leaving element. One pass, no window materialization; values stay below
+    2^31 after reduction so every product fits int64.
+    """
+    n = values.shape[0] - k + 1
+    out = np.empty(n, np.int64)
+    fp = 0
+    for c in range(k):
+        fp = (fp * _MH_BASE + values[c] % _MH_PRIME) % _MH_PRIME
+    out[0] = fp
+    for i in range(1, n):
+        fp = (fp - (values[i - 1] % _MH_PRIME) * pop) % _MH_PRIME
+        fp = (fp * _MH_BASE + values[i + k - 1] % _MH_PRIME) % _MH_PRIME
+        out[i] = fp
+    return out
+
+
+_rolling_gram_kernel = (
+    _njit(cache=True)(_rolling_gram_kernel_py) if _njit else _rolling_gram_kernel_py
+)
+
 
+def _gram_fingerprints(values: np.ndarray, k: int) -> np.ndarray:
+    """Fingerprint the k-grams of a 1-D int sequence (one gram if shorter)."""
+    if values.size == 0:
+        return values
+    if values.size < k:
+        return _poly_fold(values[None, :])
+    if _njit is not None:
+        # O(L) rolling hash beats the O(L*k) windowed fold, but only the JIT
+        # makes its per-element loop cheap; interpreted, the k vector ops win.
+        return _rolling_gram_kernel(
+            values, k, pow(_MH_BASE, k - 1, _MH_PRIME)
+        )
+    return _poly_fold(np.lib.stride_tricks.sliding_window_view(values, k))
 
-def _hash_with_seed(x: str, seed: int) -> int:
-    # Mix seed in first 4 bytes for simple families
-    h = _blake_digest((str(seed) + '|' + x).encode('utf-8'))
-    return int.from_bytes(h[:4], 'little') & 0x7FFFFFFF
+
+# Optional compiled band-hash kernel. A prebuilt extension (Cython/C) can
+# provide bandhash_rows(sig_mat, bands, r) -> int64[:] for very high window
+# rates; the vectorized fold below is the always-available fallback.
+try:  # pragma: no cover - optional accelerator
+    from ._planner_ext import bandhash_rows as _bandhash_rows  # type: ignore
+except ImportError:  # pragma: no cover - extension not built
+    _bandhash_rows = None
+
+
+def _row_signature(grams: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Minhash signature for one row's gram fingerprints."""
+    if grams.size == 0:
+        return np.zeros(len(a), np.int64)
+    return np.min((grams[:, None] * a[None, :] + b[None, :]) % _MH_PRIME, axis=0)
+
+
+def _band_keys_rows(sig_mat: np.ndarray, bands: int, r: int) -> np.ndarray:
+    """Combined band keys for a (rows, num_hashes) signature matrix.
+
+    All rows fold together: the per-band Horner fold runs as r vector ops
+    over the whole matrix, then the band keys fold once more into the final
+    per-row combo key.
+    """
+    if _bandhash_rows is not None:
+        return _bandhash_rows(np.ascontiguousarray(sig_mat), bands, r)
+    mat = sig_mat.reshape(len(sig_mat), bands, r)
+    band_keys = np.zeros((len(sig_mat), bands), np.int64)
+    for c in range(r):
+        band_keys = (band_keys * _MH_BASE + mat[:, :, c] % _MH_PRIME) % _MH_PRIME
+    return _poly_fold(band_keys)
+
+
+def _minhash_token_kernel_py(token_mat, lengths, a, b, k, bands, r):
+    """Band keys for padded token rows; mirrors the vectorized path exactly.
+
+    Per-row work is independent integer arithmetic, so the JIT-compiled
+    variant runs rows in parallel without the GIL.
+    """
+    n = token_mat.shape[0]
+    num_hashes = a.shape[0]
+    out = np.empty(n, np.int64)
+    for i in prange(n):
+        length = lengths[i]
+        sig = np.zeros(num_hashes, np.int64)
+        if length > 0:
+            g_len = k if length >= k else length
+            n_grams = length - k + 1 if length >= k else 1
+            for j in range(num_hashes):
+                sig[j] = _MH_PRIME
+            for gidx in range(n_grams):
+                fp = 0
+                for c in range(g_len):
+                    fp = (fp * _MH_BASE + token_mat[i, gidx + c] % _MH_PRIME) % _MH_PRIME
+                for j in range(num_hashes):
+                    v = (a[j] * fp + b[j]) % _MH_PRIME
+                    if v < sig[j]:
+                        sig[j] = v
+        combo = 0
+        for bidx in range(bands):
+            bk = 0
+            for c in range(r):
+                bk = (bk * _MH_BASE + sig[bidx * r + c]) % _MH_PRIME
+            combo = (combo * _MH_BASE + bk) % _MH_PRIME
+        out[i] = combo
+    return out
+
+
+_minhash_token_kernel = (
+    _njit(cache=True, parallel=True)(_minhash_token_kernel_py)
+    if _njit
+    else _minhash_token_kernel_py
+)
+
+# Below this row count the padded-matrix setup outweighs the kernel win.
+_MINHASH_KERNEL_MIN_ROWS = 64
 
 
 def assign_pclusters_minhash(
@@ -57,68 +226,73 @@ def assign_pclusters_minhash(
     bands: int = 8,
     k: int = 5,
 ) -> pd.DataFrame:
-    """Assign numeric clusters via simple minhash + banding.
+    """Assign numeric clusters via minhash + banding.
 
     Prefer token-level minhash over `prefix_tokens` (list of ints). If not present,
-    fall back to minhash over string `prefix_id` shingles.
+    fall back to minhash over string `prefix_id` shingles (byte k-grams).
+
+    Signatures use a universal hash family over a Mersenne field, so the
+    seeds × grams work is a single matrix-min per row rather than per-shingle
+    digest calls, and results are deterministic across processes.
 
     Returns a copy of df with an added int64 column 'pcluster'.
     """
     if num_hashes % bands != 0:
         raise ValueError('num_hashes must be divisible by bands')
-    use_tokens = 'prefix_tokens' in df.columns
-    rows: List[int] = []
     r = num_hashes // bands
-    seeds = list(range(num_hashes))
+    a, b = _minhash_coeffs(num_hashes)
+    sig_rows: List[np.ndarray] = []
 
-    if use_tokens:
-        # Token-level: build k-grams from integer token ids
-        token_seqs: List[List[int]] = df['prefix_tokens'].tolist()
+    if 'prefix_tokens' in df.columns:
+        token_seqs = df['prefix_tokens'].tolist()
+        if len(token_seqs) > _MINHASH_KERNEL_MIN_ROWS:
+            # Pad rows into one int64 matrix and hand the whole batch to the
+            # (optionally JIT-parallel) kernel.
+            lengths = np.array(
+                [len(t) if t is not None else 0 for t in token_seqs], np.int64
+            )
+            mat = np.zeros((len(token_seqs), max(int(lengths.max()), 1)), np.int64)
+            for i, t in enumerate(token_seqs):
+                if lengths[i] > 0:
+                    mat[i, : lengths[i]] = np.asarray(t, dtype=np.int64)
+            keys = _minhash_token_kernel(mat, lengths, a, b, k, bands, r)
+            out = df.copy()
+            pcodes, _ = pd.factorize(keys, sort=False)
+            out['pcluster'] = pcodes.astype(np.int64)
+            return out
         for toks in token_seqs:
-            toks = list(map(int, toks)) if toks is not None else []
-            if len(toks) < k:
-                grams = [tuple(toks)] if toks else []
-            else:
-                grams = [tuple(toks[i:i+k]) for i in range(len(toks) - k + 1)]
-            sig: List[int] = []
-            for seed in seeds:
-                # hash each gram with seed, take min
-                vals = []
-                for g in grams:
-                    # Mix seed and ints into bytes deterministically
-                    b = seed.to_bytes(4, 'little') + b''.join(int(x).to_bytes(4, 'little', signed=False) for x in g)
-                    h = _blake_digest(b)[:4]
-                    vals.append(int.from_bytes(h, 'little') & 0x7FFFFFFF)
-                sig.append(min(vals) if vals else 0)
-            band_keys: List[int] = []
-            for bidx in range(bands):
-                start = bidx * r
-                end = start + r
-                chunk = tuple(sig[start:end])
-                band_h = _blake_digest(str(chunk).encode('utf-8'))[:4]
-                band_keys.append(int.from_bytes(band_h, 'little'))
-            combo = _blake_digest(b''.join(int(x).to_bytes(4, 'little') for x in band_keys))[:4]
-            rows.append(int.from_bytes(combo, 'little'))
+            values = np.asarray(toks if toks is not None else (), dtype=np.int64)
+            sig_rows.append(_row_signature(_gram_fingerprints(values, k), a, b))
     else:
         if 'prefix_id' not in df.columns:
             raise KeyError('prefix_tokens or prefix_id column required')
-        for s in df['prefix_id'].astype(str).tolist():
-            shingles = _k_shingles(s, k=k)
-            sig: List[int] = []
-            for seed in seeds:
-                vals = [_hash_with_seed(sh, seed) for sh in shingles]
-                sig.append(min(vals) if vals else 0)
-            band_keys: List[int] = []
-            for bidx in range(bands):
-                start = bidx * r
-                end = start + r
-                chunk = tuple(sig[start:end])
-                band_h = _blake_digest(str(chunk).encode('utf-8'))[:4]
-                band_keys.append(int.from_bytes(band_h, 'little'))
-            combo = _blake_digest(b''.join(int(x).to_bytes(4, 'little') for x in band_keys))[:4]
-            rows.append(int.from_bytes(combo, 'little'))
+        # Each distinct prefix string is shingled and hashed once.
+        codes, uniques = pd.factorize(df['prefix_id'], use_na_sentinel=False)
+        keys = np.empty(len(uniques), np.int64)
+        miss_keys: List[Tuple[str, int, int, int]] = []
+        miss_idx: List[int] = []
+        for i, s in enumerate(uniques):
+            ck = (str(s), num_hashes, bands, k)
+            v = _cache_get(_BAND_KEY_CACHE, ck)
+            if v is None:
+                values = np.frombuffer(ck[0].encode('utf-8'), np.uint8).astype(np.int64)
+                sig_rows.append(_row_signature(_gram_fingerprints(values, k), a, b))
+                miss_keys.append(ck)
+                miss_idx.append(i)
+            else:
+                keys[i] = v
+        if sig_rows:
+            fresh = _band_keys_rows(np.stack(sig_rows), bands, r)
+            for j, i in enumerate(miss_idx):
+                keys[i] = fresh[j]
+                _cache_put(_BAND_KEY_CACHE, miss_keys[j], int(fresh[j]))
+        out = df.copy()
+        pcodes, _ = pd.factorize(keys[codes], sort=False)
+        out['pcluster'] = pcodes.astype(np.int64)
+        return out
 
+    sigs = np.stack(sig_rows) if sig_rows else np.empty((0, num_hashes), np.int64)
     out = df.copy()
-    codes, _ = pd.factorize(pd.Series(rows), sort=False)
-    out['pcluster'] = pd.Series(codes).astype(np.int64)
+    codes, _ = pd.factorize(_band_keys_rows(sigs, bands, r), sort=False)
+    out['pcluster'] = codes.astype(np.int64)
     return out
@@ -1,9 +1,31 @@
 from __future__ import annotations
 
+import heapq
 import math
 import time
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Key hashing must not depend on PYTHONHASHSEED: sketches from different
+# processes have to agree cell-for-cell before they can be compared or
+# merged. Prefer xxhash when installed; blake2b keyed with the seed is the
+# deterministic fallback.
+try:  # pragma: no cover - trivial import/fallback
+    import xxhash  # type: ignore
+
+    def _key_digest64(x: str, seed: int) -> int:
+        return xxhash.xxh3_64_intdigest(x, seed=seed)
+
+except ImportError:  # pragma: no cover - fallback path
+    import hashlib
+
+    def _key_digest64(x: str, seed: int) -> int:
+        h = hashlib.blake2b(
+            x.encode('utf-8'), digest_size=8, key=seed.to_bytes(8, 'little')
+        )
+        return int.from_bytes(h.digest(), 'little')
 
 
 @dataclass
@@ -13,39 +35,116 @@ class CountMinSketch:
     seed: int = 1337
 
     def __post_init__(self):
-        self.table = [[0] * self.width for _ in range(self.depth)]
-
-    def _hash(self, x: str, i: int) -> int:
-        # Simple mixed hash; for production switch to a better family
-        return (hash((x, i, self.seed)) & 0x7FFFFFFF) % self.width
+        # Contiguous int64 rows: an add or query touches its depth cells via
+        # fancy indexing instead of chasing a Python list per row.
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self._rows = np.arange(self.depth)
+        self._seed64 = (self.seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+    def _cols(self, x: str) -> np.ndarray:
+        # One seeded digest per key; per-row columns come from double hashing
+        # the two halves rather than hashing a fresh tuple per row.
+        h = _key_digest64(x, self._seed64)
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return (h1 + self._rows * h2) % self.width
 
     def add(self, x: str, c: int = 1):
-        for i in range(self.depth):
-            j = self._hash(x, i)
-            self.table[i][j] += c
+        self.table[self._rows, self._cols(x)] += c
+
+    def add_batch(self, keys: Sequence[str], counts: Optional[np.ndarray] = None):
+        """Add many keys in one table update.
+
+        Hashes each key once and applies all depth x keys increments with a
+        single np.add.at, which also handles repeated keys correctly.
+        """
+        n = len(keys)
+        if n == 0:
+            return
+        cols = np.empty((self.depth, n), dtype=np.int64)
+        for idx, x in enumerate(keys):
+            cols[:, idx] = self._cols(x)
+        c = np.asarray(counts, dtype=np.int64) if counts is not None else 1
+        np.add.at(self.table, (self._rows[:, None], cols), c)
 
     def query(self, x: str) -> int:
-        return min(self.table[i][self._hash(x, i)] for i in range(self.depth))
+        return int(self.table[self._rows, self._cols(x)].min())
 
 
 class SpaceSaving:
     def __init__(self, k: int):
         self.k = k
         self.counters: Dict[str, Tuple[int, int]] = {}  # key -> (count, err)
+        # Lazy-deletion min-heap over (count, entry_id, key): replacing the
+        # minimum is O(log k) instead of a linear scan of all counters. An
+        # entry is live only while _entry[key] still holds its id; stale
+        # entries are dropped when popped, and the authoritative count is
+        # always re-read from `counters` on replacement. Counts pushed
+        # before and after a rescale are not comparable, so rescale()
+        # rebuilds the heap rather than leaving old-scale entries live.
+        self._heap: List[Tuple[int, int, str]] = []
+        self._entry: Dict[str, int] = {}
+        self._next_id = 0
+
+    def _push(self, key: str, cnt: int):
+        self._next_id += 1
+        self._entry[key] = self._next_id
+        heapq.heappush(self._heap, (cnt, self._next_id, key))
+        # Stale entries are otherwise only reclaimed by replace-min pops,
+        # so hot-key churn without evictions would grow the heap without
+        # bound; compact once it exceeds twice the live entry count.
+        if len(self._heap) > 2 * self.k:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        """Rebuild the heap with one live entry per key from `counters`."""
+        self._heap = []
+        self._entry = {}
+        for key, (cnt, _err) in self.counters.items():
+            self._next_id += 1
+            self._entry[key] = self._next_id
+            self._heap.append((cnt, self._next_id, key))
+        heapq.heapify(self._heap)
 
     def add(self, x: str, c: int = 1):
         if x in self.counters:
             cnt, err = self.counters[x]
             self.counters[x] = (cnt + c, err)
+            self._push(x, cnt + c)
             return
         if len(self.counters) < self.k:
             self.counters[x] = (c, 0)
+            self._push(x, c)
             return
         # Replace min
-        min_k = min(self.counters, key=lambda k: self.counters[k][0])
-        min_cnt, _ = self.counters[min_k]
-        del self.counters[min_k]
+        while True:
+            _, eid, key = heapq.heappop(self._heap)
+            if self._entry.get(key) == eid:
+                break
+        min_cnt, _ = self.counters[key]
+        del self.counters[key]
+        del self._entry[key]
         self.counters[x] = (min_cnt + c, min_cnt)
+        self._push(x, min_cnt + c)
+
+    def rescale(self, f: float):
+        """Scale every count and error by f, keeping the heap consistent.
+
+        The scaling runs as two vectorized multiplies with the dict rebuilt
+        through C-level zips. Entries already in the heap hold pre-scale
+        counts, which would compare wrongly against anything pushed after
+        the rescale, so the heap is rebuilt with one live entry per key.
+        """
+        counters = self.counters
+        if not counters:
+            return
+        n = len(counters)
+        cnts = np.fromiter((v[0] for v in counters.values()), np.int64, n)
+        errs = np.fromiter((v[1] for v in counters.values()), np.int64, n)
+        cnts = (cnts * f).astype(np.int64)
+        errs = (errs * f).astype(np.int64)
+        self.counters = dict(zip(counters.keys(), zip(cnts.tolist(), errs.tolist())))
+        self._rebuild_heap()
 
     def topk(self) -> Iterable[Tuple[str, int, int]]:
         for k, (cnt, err) in self.counters.items():
@@ -58,29 +157,37 @@ class HeatSketch:
     Values decay by exp(-lambda * dt) where dt is seconds since last decay.
     """
 
+    # Decays closer together than this are skipped: the factor rounds to ~1
+    # and the elapsed time still accumulates toward the next applied decay.
+    _MIN_DECAY_NS = 1_000_000
+
     def __init__(self, width: int = 4096, depth: int = 4, k: int = 4096, decay_lambda: float = 0.01):
         self.cms = CountMinSketch(width, depth)
         self.ss = SpaceSaving(k)
         self.decay_lambda = decay_lambda
-        self._last_decay_ts = time.time()
+        # Monotonic so NTP adjustments can't produce negative or huge dt;
+        # callers that already hold a timestamp can pass it to decay().
+        self._last_decay_ns = time.monotonic_ns()
 
-    def _decay_factor(self) -> float:
-        now = time.time()
-        dt = max(0.0, now - self._last_decay_ts)
-        self._last_decay_ts = now
-        return math.exp(-self.decay_lambda * dt)
+    def _decay_factor(self, now_ns: int) -> float:
+        dt_ns = max(0, now_ns - self._last_decay_ns)
+        self._last_decay_ns = now_ns
+        return math.exp(-self.decay_lambda * (dt_ns / 1e9))
 
     def add(self, key: str, c: int = 1):
         self.cms.add(key, c)
         self.ss.add(key, c)
 
-    def decay(self):
-        f = self._decay_factor()
-        # Decay SS counters in-place; CMS typically not decayed, we emulate by scaling top-k only
-        for k, (cnt, err) in list(self.ss.counters.items()):
-            new_cnt = int(cnt * f)
-            new_err = int(err * f)
-            self.ss.counters[k] = (new_cnt, new_err)
+    def decay(self, now_ns: Optional[int] = None):
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        if now_ns - self._last_decay_ns < self._MIN_DECAY_NS:
+            return
+        f = self._decay_factor(now_ns)
+        # Decay SS counters; CMS typically not decayed, we emulate by scaling
+        # top-k only. rescale() also rebuilds the SpaceSaving heap so counts
+        # pushed after the decay stay comparable with the surviving entries.
+        self.ss.rescale(f)
 
     def estimate(self, key: str) -> int:
         # Use CMS for guaranteed upper bound; intersect with SS if present
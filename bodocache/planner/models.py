@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 class Tier(Enum):
@@ -11,7 +11,39 @@ class Tier(Enum):
     GPU = 2
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class PageShape:
+    """The five PageKey fields shared by every page of one model config.
+
+    Shapes are interned: within a planner run there are only a handful of
+    distinct (model, version, dtype, heads, head-dim) combinations, so each
+    gets a small integer id that PageKey folds into its hash.
+    """
+
+    model_id: str
+    model_version: str
+    dtype: str
+    n_kv_heads: int
+    d_head: int
+    shape_id: int = field(init=False, repr=False, compare=False)
+
+
+_shape_intern: Dict[Tuple[str, str, str, int, int], PageShape] = {}
+
+
+def _intern_shape(
+    model_id: str, model_version: str, dtype: str, n_kv_heads: int, d_head: int
+) -> PageShape:
+    t = (model_id, model_version, dtype, n_kv_heads, d_head)
+    shape = _shape_intern.get(t)
+    if shape is None:
+        shape = PageShape(*t)
+        object.__setattr__(shape, 'shape_id', len(_shape_intern))
+        _shape_intern[t] = shape
+    return shape
+
+
+@dataclass(frozen=True, slots=True)
 class PageKey:
     model_id: str
     model_version: str
@@ -20,6 +52,41 @@ class PageKey:
     d_head: int
     layer: int
     page_id: int
+    # Page-table lookups call encode() once per access, so the string is
+    # formatted a single time here instead of on every call. Likewise the
+    # hash: the shared fields collapse to an interned shape id packed with
+    # (layer, page_id) into one int, so dict operations hash a precomputed
+    # value instead of all seven fields.
+    _encoded: str = field(init=False, repr=False, compare=False)
+    _shape: PageShape = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            '_encoded',
+            f"{self.model_id}:{self.model_version}:{self.dtype}:"
+            f"{self.n_kv_heads}:{self.d_head}:{self.layer}:{self.page_id}",
+        )
+        shape = _intern_shape(
+            self.model_id, self.model_version, self.dtype,
+            self.n_kv_heads, self.d_head,
+        )
+        object.__setattr__(self, '_shape', shape)
+        object.__setattr__(
+            self,
+            '_hash',
+            (shape.shape_id << 40)
+            | ((self.layer & 0xFFFF) << 24)
+            | (self.page_id & 0xFFFFFF),
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @property
+    def shape(self) -> PageShape:
+        return self._shape
 
     def as_tuple(self) -> Tuple:
         return (
@@ -34,10 +101,7 @@ class PageKey:
 
     def encode(self) -> str:
         # Compact string key for hashing and storage adapters
-        return (
-            f"{self.model_id}:{self.model_version}:{self.dtype}:"
-            f"{self.n_kv_heads}:{self.d_head}:{self.layer}:{self.page_id}"
-        )
+        return self._encoded
 
 
 @dataclass(frozen=True)
@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+
 from .models import PageKey, Tier
 
 
@@ -21,53 +23,62 @@ class PageTable:
     """
 
     def __init__(self):
-        self._loc: Dict[str, Location] = {}
+        # Keyed on PageKey directly (hash/eq come from the frozen dataclass);
+        # the string encoding is only for storage adapters. _by_layer is a
+        # secondary index so per-layer iteration touches only that layer's
+        # keys instead of scanning the whole table.
+        self._loc: Dict[PageKey, Location] = {}
+        self._by_layer: Dict[Tuple[str, str, int], List[PageKey]] = {}
 
     @staticmethod
     def encode_key(k: PageKey) -> str:
         return k.encode()
 
     def set(self, key: PageKey, location: Location):
-        self._loc[self.encode_key(key)] = location
+        if key not in self._loc:
+            self._by_layer.setdefault(
+                (key.model_id, key.model_version, key.layer), []
+            ).append(key)
+        self._loc[key] = location
 
     def get(self, key: PageKey) -> Optional[Location]:
-        return self._loc.get(self.encode_key(key))
+        return self._loc.get(key)
 
     def exists(self, key: PageKey) -> bool:
-        return self.encode_key(key) in self._loc
+        return key in self._loc
 
     def bulk_get(self, keys: Iterable[PageKey]) -> List[Optional[Location]]:
-        return [self.get(k) for k in keys]
+        loc = self._loc
+        return [loc.get(k) for k in keys]
 
     def iter_layer_pages(
         self, model_id: str, model_version: str, layer: int
     ) -> Iterable[Tuple[PageKey, Location]]:
-        for encoded, loc in self._loc.items():
-            parts = encoded.split(":")
-            if len(parts) != 7:
-                continue
-            mid, mver, dtype, nheads, dhead, lay, pid = parts
-            if mid == model_id and mver == model_version and int(lay) == layer:
-                yield (
-                    PageKey(mid, mver, dtype, int(nheads), int(dhead), int(lay), int(pid)),
-                    loc,
-                )
+        for key in self._by_layer.get((model_id, model_version, layer), ()):
+            yield key, self._loc[key]
 
     @staticmethod
     def contiguous_runs(page_ids: List[int]) -> List[Tuple[int, int]]:
         if not page_ids:
             return []
-        page_ids = sorted(page_ids)
-        runs = []
-        start = page_ids[0]
-        prev = start
-        for p in page_ids[1:]:
-            if p == prev + 1:
+        if len(page_ids) < 32:
+            # Small lists: the Python loop beats NumPy setup overhead.
+            page_ids = sorted(page_ids)
+            runs = []
+            start = page_ids[0]
+            prev = start
+            for p in page_ids[1:]:
+                if p == prev + 1:
+                    prev = p
+                    continue
+                runs.append((start, prev))
+                start = p
                 prev = p
-                continue
             runs.append((start, prev))
-            start = p
-            prev = p
-        runs.append((start, prev))
-        return runs
+            return runs
+        ids = np.sort(np.asarray(page_ids, dtype=np.int64))
+        breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+        starts = ids[np.concatenate(([0], breaks))]
+        ends = ids[np.append(breaks - 1, len(ids) - 1)]
+        return list(zip(starts.tolist(), ends.tolist()))
 
@@ -3,6 +3,41 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+try:  # pragma: no cover - optional JIT for the coalescing hot loop
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - numba not installed
+    _njit = None
+
+# Columns worth narrowing before the sort/groupby stages. The stages are
+# memory-bound, so halving key width roughly halves their DRAM traffic.
+# Downcasting is value-dependent: epoch-scale deadlines simply stay int64.
+_INT_SHRINK_COLS = (
+    "layer", "tier_src", "tier_dst", "page_start", "page_end",
+    "pcluster", "page_bytes", "deadline_ms",
+)
+_FLOAT_SHRINK_COLS = ("est_fill_ms", "tenant_weight", "urgency", "pop")
+
+
+def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast wide numeric columns to the narrowest dtype their values fit.
+
+    Returns the input unchanged when nothing narrows; never mutates it.
+    Accumulator columns (bytes_row, cum_bytes_tenant, bytes) are computed
+    as int64 downstream regardless, so only the group/sort keys narrow.
+    """
+    repl = {}
+    for c in _INT_SHRINK_COLS:
+        if c in df.columns and pd.api.types.is_integer_dtype(df[c]):
+            s = pd.to_numeric(df[c], downcast="integer")
+            if s.dtype != df[c].dtype:
+                repl[c] = s
+    for c in _FLOAT_SHRINK_COLS:
+        if c in df.columns and pd.api.types.is_float_dtype(df[c]):
+            s = pd.to_numeric(df[c], downcast="float")
+            if s.dtype != df[c].dtype:
+                repl[c] = s
+    return df.assign(**repl) if repl else df
+
 
 def score_and_filter(
     requests_df: pd.DataFrame,
@@ -17,21 +52,32 @@ def score_and_filter(
 
     Returns a copy of requests with added columns: decay_hits, tenant_weight, pop, urgency.
     """
-    df = requests_df.copy()
-    heat = heat_df.copy()
-    df["page_id"] = df["page_start"]
+    requests_df = _shrink(requests_df)
+    heat = heat_df
     heat_cols = ["layer", "page_id", "decay_hits", "tenant_weight"]
     # Ensure optional columns exist
     if "tenant_weight" not in heat.columns:
-        heat["tenant_weight"] = 1.0
+        heat = heat.assign(tenant_weight=1.0)
     heat = heat[heat_cols]
-    df = df.merge(heat, on=["layer", "page_id"], how="left")
-    df["decay_hits"] = df["decay_hits"].fillna(0).astype(np.int64)
-    df["tenant_weight"] = df["tenant_weight"].astype(float).where(df["tenant_weight"].notna(), 1.0)
-    df["pop"] = float(alpha) * df["decay_hits"] + float(beta) * df["tenant_weight"]
-    denom = np.maximum(df["est_fill_ms"].astype(float), 1.0)
-    df["urgency"] = (df["deadline_ms"] - now_ms) / denom
-    return df[(df["pop"] > float(pmin)) | (df["urgency"] > float(umin))].copy()
+    # The merge already yields a fresh frame, so no up-front copy is needed.
+    df = requests_df.assign(page_id=requests_df["page_start"]).merge(
+        heat, on=["layer", "page_id"], how="left"
+    )
+    # Scores run on raw arrays: to_numpy(na_value=...) folds the NaN fills
+    # into the extraction, and the arithmetic makes one pass per expression
+    # instead of allocating a temporary Series per step.
+    decay = df["decay_hits"].to_numpy(dtype=np.float64, na_value=0.0)
+    tw = df["tenant_weight"].to_numpy(dtype=np.float64, na_value=1.0)
+    ef = df["est_fill_ms"].to_numpy(dtype=np.float64)
+    dl = df["deadline_ms"].to_numpy(dtype=np.float64)
+    pop = float(alpha) * decay + float(beta) * tw
+    urgency = (dl - float(now_ms)) / np.maximum(ef, 1.0)
+    mask = (pop > float(pmin)) | (urgency > float(umin))
+    df["decay_hits"] = decay.astype(np.int64)
+    df["tenant_weight"] = tw
+    df["pop"] = pop
+    df["urgency"] = urgency
+    return df[mask]
 
 
 def apply_tenant_caps(cand: pd.DataFrame, tenant_caps_df: pd.DataFrame) -> pd.DataFrame:
@@ -39,18 +85,153 @@ def apply_tenant_caps(cand: pd.DataFrame, tenant_caps_df: pd.DataFrame) -> pd.Da
 
     Expects columns: tenant, tier_dst, page_start, page_end, page_bytes.
     """
-    out = cand.copy()
-    out["length"] = (out["page_end"] - out["page_start"] + 1).astype(np.int64)
-    out["bytes_row"] = out["length"].astype(np.int64) * out["page_bytes"].astype(np.int64)
+    # The merge yields a fresh frame, so no defensive copy is needed; the
+    # demand columns compute once as arrays and ride in via assign.
+    length = (
+        cand["page_end"].to_numpy(np.int64) - cand["page_start"].to_numpy(np.int64) + 1
+    )
     tcap = tenant_caps_df.rename(columns={"tier": "tier_dst", "bandwidth_caps": "tenant_cap"})
-    out = out.merge(tcap[["tenant", "tier_dst", "tenant_cap"]], on=["tenant", "tier_dst"], how="left")
+    out = cand.assign(
+        length=length, bytes_row=length * cand["page_bytes"].to_numpy(np.int64)
+    ).merge(tcap[["tenant", "tier_dst", "tenant_cap"]], on=["tenant", "tier_dst"], how="left")
     out["tenant_cap"] = out["tenant_cap"].astype(float).where(out["tenant_cap"].notna(), 9_223_372_036_854_775_807)
     out = out.sort_values(by=["node", "tier_dst", "tenant", "deadline_ms"]).reset_index(drop=True)
     grp_t = ["node", "tier_dst", "tenant"]
-    out["cum_bytes_tenant"] = out.groupby(grp_t)["bytes_row"].cumsum()
+    if _njit is not None:
+        # Rows are sorted by the group keys, so the cumsum is a boundary-
+        # reset linear scan instead of a hashed groupby.
+        out["cum_bytes_tenant"] = _segmented_cumsum_kernel(
+            _group_breaks(out, grp_t), out["bytes_row"].to_numpy(np.int64)
+        )
+    else:
+        out["cum_bytes_tenant"] = out.groupby(grp_t)["bytes_row"].cumsum()
     return out[out["cum_bytes_tenant"] <= out["tenant_cap"]]
 
 
+def _segmented_cumsum_kernel_py(breaks, vals):
+    """Running sum over a group-sorted array, reset at each group break.
+
+    Equivalent to groupby(keys).cumsum() when rows are already sorted by
+    the group keys, without hashing the keys or building a group index.
+    """
+    n = vals.shape[0]
+    out = np.empty(n, np.int64)
+    acc = 0
+    for i in range(n):
+        if breaks[i]:
+            acc = 0
+        acc += vals[i]
+        out[i] = acc
+    return out
+
+
+_segmented_cumsum_kernel = (
+    _njit(cache=True)(_segmented_cumsum_kernel_py)
+    if _njit
+    else _segmented_cumsum_kernel_py
+)
+
+
+def _coalesce_reduce_kernel_py(new_group, ps, pe, pb, dl, urg, min_io):
+    """Run detection fused with the per-run reductions and min_io filter.
+
+    Mirrors the groupby shift/cummax/agg chain exactly: a run breaks on
+    the previous row's end (not the cumulative max), run ids count breaks
+    within the group, and pages are clipped against the running cumulative
+    max of ends inside the run. Instead of emitting per-row run ids for a
+    second groupby pass, each run's seven reductions accumulate in its
+    output slot as the scan goes, and a run that closes below min_io
+    bytes is overwritten by the next one rather than materialized. Returns
+    (first_row_idx, run_id, pages, page_bytes, deadline_ms, fanout,
+    urgency_min, start_pid, end_pid) arrays trimmed to surviving runs, in
+    scan order (which equals group-key order on the sorted frame).
+    """
+    n = ps.shape[0]
+    idx0 = np.empty(n, np.int64)
+    run_ids = np.empty(n, np.int64)
+    pages_s = np.empty(n, np.int64)
+    pb_max = np.empty(n, np.int64)
+    dl_min = np.empty(n, np.int64)
+    fan = np.empty(n, np.int64)
+    urg_min = np.empty(n, np.float64)
+    sp_min = np.empty(n, np.int64)
+    ep_max = np.empty(n, np.int64)
+    m = 0
+    open_run = False
+    run = 0
+    last_end = -1
+    last_cmx = -1
+    for i in range(n):
+        if new_group[i]:
+            run = 0
+            last_end = -1
+            last_cmx = -1
+        gap = ps[i] > last_end + 1
+        if gap:
+            run += 1
+            last_cmx = -1
+        if new_group[i] or gap:
+            if open_run and pages_s[m] * pb_max[m] >= min_io:
+                m += 1
+            idx0[m] = i
+            run_ids[m] = run
+            pages_s[m] = 0
+            pb_max[m] = pb[i]
+            dl_min[m] = dl[i]
+            fan[m] = 0
+            urg_min[m] = urg[i]
+            sp_min[m] = ps[i]
+            ep_max[m] = pe[i]
+            open_run = True
+        eff = ps[i] if ps[i] > last_cmx + 1 else last_cmx + 1
+        p = pe[i] - eff + 1
+        pages_s[m] += p if p > 0 else 0
+        fan[m] += 1
+        if pb[i] > pb_max[m]:
+            pb_max[m] = pb[i]
+        if dl[i] < dl_min[m]:
+            dl_min[m] = dl[i]
+        if urg[i] < urg_min[m]:
+            urg_min[m] = urg[i]
+        if ps[i] < sp_min[m]:
+            sp_min[m] = ps[i]
+        if pe[i] > ep_max[m]:
+            ep_max[m] = pe[i]
+        if pe[i] > last_cmx:
+            last_cmx = pe[i]
+        last_end = pe[i]
+    if open_run and pages_s[m] * pb_max[m] >= min_io:
+        m += 1
+    return (
+        idx0[:m], run_ids[:m], pages_s[:m], pb_max[:m], dl_min[:m],
+        fan[:m], urg_min[:m], sp_min[:m], ep_max[:m],
+    )
+
+
+_coalesce_reduce_kernel = (
+    _njit(cache=True)(_coalesce_reduce_kernel_py)
+    if _njit
+    else _coalesce_reduce_kernel_py
+)
+
+
+def _group_breaks(c: pd.DataFrame, grp: list) -> np.ndarray:
+    """Boolean mask marking the first row of each key group in a sorted frame."""
+    n = len(c)
+    new_group = np.zeros(n, dtype=np.bool_)
+    if n:
+        new_group[0] = True
+    for col in grp:
+        s = c[col]
+        v = (
+            s.cat.codes.to_numpy()
+            if isinstance(s.dtype, pd.CategoricalDtype)
+            else s.to_numpy()
+        )
+        new_group[1:] |= v[1:] != v[:-1]
+    return new_group
+
+
 def coalesce_intervals(
     cand: pd.DataFrame,
     min_io_bytes: int,
@@ -60,25 +241,56 @@ def coalesce_intervals(
     Returns columns: node,tier_src,tier_dst,pcluster,layer,run_id,bytes,deadline_ms,fanout,urgency_min,start_pid,end_pid,page_bytes.
     """
     sort_cols = ["node", "tier_src", "tier_dst", "pcluster", "layer", "page_start", "page_end"]
+    # sort_values already returns a fresh frame both branches may write to
     c = cand.sort_values(by=sort_cols)
     grp = ["node", "tier_src", "tier_dst", "pcluster", "layer"]
-    prev_end = c.groupby(grp)["page_end"].shift(1).fillna(-1)
-    new_run = (c["page_start"] > (prev_end + 1)).astype(np.int64)
-    c = c.copy()
-    c["new_run"] = new_run
-    c["run_id"] = c.groupby(grp)["new_run"].cumsum()
+    if _njit is not None:
+        # The frame is already group-sorted, so run detection, the per-run
+        # reductions and the min_io filter all happen in one linear scan;
+        # only surviving runs materialize.
+        (
+            idx0, run_ids, pages_s, pb_max, dl_min, fan, urg_min, sp_min, ep_max,
+        ) = _coalesce_reduce_kernel(
+            _group_breaks(c, grp),
+            c["page_start"].to_numpy(np.int64),
+            c["page_end"].to_numpy(np.int64),
+            c["page_bytes"].to_numpy(np.int64),
+            c["deadline_ms"].to_numpy(np.int64),
+            c["urgency"].to_numpy(np.float64),
+            int(min_io_bytes),
+        )
+        plan = c.iloc[idx0][grp].reset_index(drop=True)
+        plan["run_id"] = run_ids
+        plan["bytes"] = pages_s * pb_max
+        plan["deadline_ms"] = dl_min
+        plan["fanout"] = fan
+        plan["urgency_min"] = urg_min
+        plan["start_pid"] = sp_min
+        plan["end_pid"] = ep_max
+        plan["page_bytes"] = pb_max
+        return plan[[
+            "node", "tier_src", "tier_dst", "pcluster", "layer", "run_id", "bytes",
+            "deadline_ms", "fanout", "urgency_min", "start_pid", "end_pid", "page_bytes",
+        ]]
+    else:
+        prev_end = c.groupby(grp)["page_end"].shift(1).fillna(-1)
+        new_run = (c["page_start"] > (prev_end + 1)).astype(np.int64)
+        c["new_run"] = new_run
+        c["run_id"] = c.groupby(grp)["new_run"].cumsum()
+        run_grp = grp + ["run_id"]
+        # Previous cumulative max of end within each run, shifting inside
+        # the group
+        g = c.groupby(run_grp)
+        cummax_end = g["page_end"].cummax()
+        prev_cummax_end = (
+            c.assign(_cummax_end=cummax_end)
+             .groupby(run_grp)["_cummax_end"].shift(1)
+             .fillna(-1)
+        )
+        eff_start = np.maximum(c["page_start"].astype(np.int64), (prev_cummax_end + 1).astype(np.int64))
+        pages = np.maximum(0, c["page_end"].astype(np.int64) - eff_start + 1)
+        c["_pages"] = pages
     run_grp = grp + ["run_id"]
-    # Compute previous cumulative max of end within each run, shifting inside the group
-    g = c.groupby(run_grp)
-    cummax_end = g["page_end"].cummax()
-    prev_cummax_end = (
-        c.assign(_cummax_end=cummax_end)
-         .groupby(run_grp)["_cummax_end"].shift(1)
-         .fillna(-1)
-    )
-    eff_start = np.maximum(c["page_start"].astype(np.int64), (prev_cummax_end + 1).astype(np.int64))
-    pages = np.maximum(0, c["page_end"].astype(np.int64) - eff_start + 1)
-    c["_pages"] = pages
     runs = (
         c.groupby(run_grp)
         .agg(
@@ -119,26 +331,33 @@ def apply_caps(
     plan["lat_ms"] = plan["lat_ms"].astype(float).where(plan["lat_ms"].notna(), 1.0)
     plan = plan.sort_values(by=["node", "tier_src", "tier_dst", "deadline_ms"]).reset_index(drop=True)
     grp2 = ["node", "tier_src", "tier_dst"]
-    plan["cum_bytes"] = plan.groupby(grp2)["bytes"].cumsum()
+    if _njit is not None:
+        plan["cum_bytes"] = _segmented_cumsum_kernel(
+            _group_breaks(plan, grp2), plan["bytes"].to_numpy(np.int64)
+        )
+    else:
+        plan["cum_bytes"] = plan.groupby(grp2)["bytes"].cumsum()
     eff_cap = np.minimum(
         plan["bandwidth_caps"].fillna(9_223_372_036_854_775_807),
         plan["free_bytes"].fillna(9_223_372_036_854_775_807),
     )
     if enforce_tier_caps:
         plan = plan[plan["cum_bytes"] <= eff_cap]
-    # Limit ops per (node,tier_dst)
-    MAX_OPS = np.int64(max_ops_per_tier)
-    plan["one"] = np.int64(1)
-    plan["op_rank"] = plan.groupby(["node", "tier_dst"])['one'].cumsum()
-    # Estimate copy time per op
-    bc = plan["bandwidth_caps"].astype(float)
-    denom_cap = bc.where(bc > 0, 1.0)
-    plan["est_copy_ms"] = (plan["bytes"].astype(float) / np.maximum(denom_cap, 1.0)) * float(window_ms)
-    plan = plan[plan["op_rank"] <= MAX_OPS]
-    # Overlap hint
-    gt1 = (plan["est_copy_ms"] > plan["lat_ms"]).astype(np.int64)
-    gt2 = (plan["est_copy_ms"] > (2.0 * plan["lat_ms"]).astype(float)).astype(np.int64)
-    plan["overlap"] = np.minimum(np.int64(3), np.int64(1) + gt1 + gt2)
+    # Limit ops per (node,tier_dst); cumcount replaces the helper ones column
+    plan["op_rank"] = plan.groupby(["node", "tier_dst"]).cumcount() + 1
+    # Estimate copy time per op on raw arrays (NaN caps count as uncapped)
+    bc = plan["bandwidth_caps"].to_numpy(dtype=np.float64, na_value=0.0)
+    denom_cap = np.maximum(np.where(bc > 0, bc, 1.0), 1.0)
+    plan["est_copy_ms"] = (
+        plan["bytes"].to_numpy(dtype=np.float64) / denom_cap
+    ) * float(window_ms)
+    plan = plan[plan["op_rank"] <= np.int64(max_ops_per_tier)]
+    # Overlap hint: 1 + I(copy>lat) + I(copy>2*lat) is already capped at 3,
+    # so the two comparisons add straight onto an int8 with no clip pass
+    # and no widened boolean temporaries.
+    ec = plan["est_copy_ms"].to_numpy()
+    lm = plan["lat_ms"].to_numpy(dtype=np.float64)
+    plan["overlap"] = np.int8(1) + (ec > lm) + (ec > 2.0 * lm)
     plan["priority"] = plan["urgency_min"]
     plan = plan[[
         "node", "tier_src", "tier_dst", "pcluster", "layer", "run_id",
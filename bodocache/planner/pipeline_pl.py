@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import pandas as pd
+import polars as pl
+
+_I64_MAX = 9_223_372_036_854_775_807
+
+
+def run_window_core_pl(
+    requests_df: pd.DataFrame,
+    heat_df: pd.DataFrame,
+    tier_caps_df: pd.DataFrame,
+    tenant_caps_df: pd.DataFrame,
+    layer_lat_df: pd.DataFrame,
+    now_ms: int,
+    pmin: float,
+    umin: float,
+    min_io_bytes: int,
+    alpha: float,
+    beta: float,
+    window_ms: int,
+    max_ops_per_tier: int,
+    enforce_tier_caps: bool,
+) -> pd.DataFrame:
+    """Polars-lazy equivalent of the four pandas pipeline stages.
+
+    One lazy query per stage boundary lets Polars fuse the join, filter,
+    sort and window work over Arrow buffers with its own multi-threaded
+    planner, and the intermediate frames the pandas stages copy never
+    materialize. Converts from/to pandas only at the API boundary; column
+    semantics mirror pipeline.py exactly.
+    """
+    req = pl.from_pandas(requests_df)
+    heat = pl.from_pandas(heat_df)
+
+    # score_and_filter
+    if "tenant_weight" not in heat.columns:
+        heat = heat.with_columns(pl.lit(1.0).alias("tenant_weight"))
+    lf = (
+        req.lazy()
+        .with_columns(pl.col("page_start").alias("page_id"))
+        .join(
+            heat.lazy().select(["layer", "page_id", "decay_hits", "tenant_weight"]),
+            on=["layer", "page_id"],
+            how="left",
+        )
+        .with_columns(
+            pl.col("decay_hits").fill_null(0).cast(pl.Int64),
+            pl.col("tenant_weight").cast(pl.Float64).fill_null(1.0),
+        )
+        .with_columns(
+            (float(alpha) * pl.col("decay_hits") + float(beta) * pl.col("tenant_weight")).alias("pop"),
+            (
+                (pl.col("deadline_ms") - now_ms)
+                / pl.max_horizontal(pl.col("est_fill_ms").cast(pl.Float64), pl.lit(1.0))
+            ).alias("urgency"),
+        )
+        .filter((pl.col("pop") > float(pmin)) | (pl.col("urgency") > float(umin)))
+    )
+
+    # apply_tenant_caps
+    tcap = (
+        pl.from_pandas(tenant_caps_df)
+        .lazy()
+        .rename({"tier": "tier_dst", "bandwidth_caps": "tenant_cap"})
+        .select(["tenant", "tier_dst", "tenant_cap"])
+    )
+    grp_t = ["node", "tier_dst", "tenant"]
+    lf = (
+        lf.with_columns(
+            (pl.col("page_end") - pl.col("page_start") + 1).cast(pl.Int64).alias("length"),
+        )
+        .with_columns(
+            (pl.col("length") * pl.col("page_bytes").cast(pl.Int64)).alias("bytes_row"),
+        )
+        .join(tcap, on=["tenant", "tier_dst"], how="left")
+        .with_columns(pl.col("tenant_cap").cast(pl.Float64).fill_null(float(_I64_MAX)))
+        .sort(["node", "tier_dst", "tenant", "deadline_ms"])
+        .with_columns(pl.col("bytes_row").cum_sum().over(grp_t).alias("cum_bytes_tenant"))
+        .filter(pl.col("cum_bytes_tenant") <= pl.col("tenant_cap"))
+    )
+
+    # coalesce_intervals
+    grp = ["node", "tier_src", "tier_dst", "pcluster", "layer"]
+    run_grp = grp + ["run_id"]
+    lf = (
+        lf.sort(grp + ["page_start", "page_end"])
+        .with_columns(
+            pl.col("page_end").shift(1).over(grp).fill_null(-1).alias("_prev_end"),
+        )
+        .with_columns(
+            (pl.col("page_start") > (pl.col("_prev_end") + 1)).cast(pl.Int64).alias("new_run"),
+        )
+        .with_columns(pl.col("new_run").cum_sum().over(grp).alias("run_id"))
+        .with_columns(pl.col("page_end").cum_max().over(run_grp).alias("_cummax_end"))
+        .with_columns(
+            pl.col("_cummax_end").shift(1).over(run_grp).fill_null(-1).alias("_prev_cummax"),
+        )
+        .with_columns(
+            pl.max_horizontal(
+                pl.lit(0, dtype=pl.Int64),
+                pl.col("page_end").cast(pl.Int64)
+                - pl.max_horizontal(
+                    pl.col("page_start").cast(pl.Int64),
+                    (pl.col("_prev_cummax") + 1).cast(pl.Int64),
+                )
+                + 1,
+            ).alias("_pages"),
+        )
+        .group_by(run_grp)
+        .agg(
+            pages=pl.col("_pages").sum(),
+            page_bytes=pl.col("page_bytes").max(),
+            deadline_ms=pl.col("deadline_ms").min(),
+            fanout=pl.col("page_start").count().cast(pl.Int64),
+            urgency_min=pl.col("urgency").min(),
+            start_pid=pl.col("page_start").min(),
+            end_pid=pl.col("page_end").max(),
+        )
+        .with_columns(
+            (pl.col("pages").cast(pl.Int64) * pl.col("page_bytes").cast(pl.Int64)).alias("bytes"),
+        )
+        .filter(pl.col("bytes") >= int(min_io_bytes))
+    )
+
+    # apply_caps
+    caps = (
+        pl.from_pandas(tier_caps_df)
+        .lazy()
+        .select(["tier", "bandwidth_caps", "free_bytes"])
+        .rename({"tier": "tier_dst"})
+    )
+    lat = pl.from_pandas(layer_lat_df).lazy().select(["layer", "lat_ms"])
+    lf = (
+        lf.join(caps, on="tier_dst", how="left")
+        .join(lat, on="layer", how="left")
+        .with_columns(pl.col("lat_ms").cast(pl.Float64).fill_null(1.0))
+        .sort(["node", "tier_src", "tier_dst", "deadline_ms"])
+        .with_columns(
+            pl.col("bytes").cum_sum().over(["node", "tier_src", "tier_dst"]).alias("cum_bytes"),
+        )
+    )
+    if enforce_tier_caps:
+        lf = lf.filter(
+            pl.col("cum_bytes")
+            <= pl.min_horizontal(
+                pl.col("bandwidth_caps").fill_null(_I64_MAX),
+                pl.col("free_bytes").fill_null(_I64_MAX),
+            )
+        )
+    lf = (
+        lf.with_columns(
+            pl.int_range(pl.len()).over(["node", "tier_dst"]).alias("_op_rank"),
+        )
+        .filter(pl.col("_op_rank") < int(max_ops_per_tier))
+        .with_columns(
+            (
+                pl.col("bytes").cast(pl.Float64)
+                / pl.max_horizontal(
+                    pl.when(pl.col("bandwidth_caps").cast(pl.Float64) > 0)
+                    .then(pl.col("bandwidth_caps").cast(pl.Float64))
+                    .otherwise(1.0),
+                    pl.lit(1.0),
+                )
+                * float(window_ms)
+            ).alias("est_copy_ms"),
+        )
+        .with_columns(
+            pl.min_horizontal(
+                pl.lit(3, dtype=pl.Int64),
+                1
+                + (pl.col("est_copy_ms") > pl.col("lat_ms")).cast(pl.Int64)
+                + (pl.col("est_copy_ms") > 2.0 * pl.col("lat_ms")).cast(pl.Int64),
+            ).alias("overlap"),
+            pl.col("urgency_min").alias("priority"),
+        )
+        .select(
+            [
+                "node", "tier_src", "tier_dst", "pcluster", "layer", "run_id",
+                "bytes", "deadline_ms", "fanout", "overlap", "priority",
+                "start_pid", "end_pid", "page_bytes",
+            ]
+        )
+    )
+    return lf.collect().to_pandas()
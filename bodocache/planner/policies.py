@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -9,14 +10,20 @@ def selective_write_through(cand_df: pd.DataFrame, heat_df: pd.DataFrame, reuse_
     """
     Decide which pages to persist (admission to STORAGE) using a simple reuse threshold
     on decay_hits. Returns DataFrame [page_key, tier_dst].
+
+    Heat lookups go through a single Series.map (one hash probe per
+    candidate row) instead of a merge, so no joined frame materializes
+    and no second de-duplication pass is needed.
     """
-    heat = heat_df[["page_key", "decay_hits"]].drop_duplicates()
-    df = cand_df.merge(heat, on="page_key", how="left").fillna({"decay_hits": 0})
-    admit = df[df["decay_hits"] >= reuse_threshold][["page_key"]].drop_duplicates()
-    if admit.empty:
+    # max() keeps the old merge semantics when heat has duplicate keys:
+    # a page admits if any of its heat rows crosses the threshold.
+    heat_series = heat_df.groupby("page_key")["decay_hits"].max()
+    hits = cand_df["page_key"].map(heat_series).fillna(0).to_numpy()
+    mask = hits >= reuse_threshold
+    keys = np.unique(cand_df.loc[mask, "page_key"].to_numpy())
+    if len(keys) == 0:
         return pd.DataFrame(columns=["page_key", "tier_dst"])  # none
-    admit["tier_dst"] = 0  # STORAGE
-    return admit
+    return pd.DataFrame({"page_key": keys, "tier_dst": 0})
 
 
 def eviction_candidates(heat_df: pd.DataFrame, tier_state_df: pd.DataFrame, target_free_bytes: int = 0) -> pd.DataFrame:
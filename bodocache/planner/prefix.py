@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Iterable, List
 
+import numpy as np
+
 # Optional blake3 with fallback for environments without the library
 try:  # pragma: no cover - trivial import/fallback
     from blake3 import blake3 as _blake3_ctor  # type: ignore
@@ -17,11 +19,44 @@ except Exception:  # pragma: no cover - fallback path
 
 
 def prefix_id(token_ids: Iterable[int], P: int = 128) -> str:
-    """Compute prefix identity hash for the first P tokens."""
-    buf = bytearray()
-    for t in list(token_ids)[:P]:
-        buf += int(t).to_bytes(4, "little", signed=False)
-    return _blake_digest(bytes(buf)).hex()
+    """Compute prefix identity hash for the first P tokens.
+
+    Tokens serialize as one little-endian uint32 memcpy instead of a
+    per-token to_bytes loop, so the digest gets a single contiguous buffer.
+    """
+    if not isinstance(token_ids, (list, tuple, np.ndarray)):
+        token_ids = list(token_ids)
+    arr = np.asarray(token_ids[:P], dtype="<u4")
+    return _blake_digest(arr.tobytes()).hex()
+
+
+def prefix_cluster_codes(tokens, P: int = 128) -> np.ndarray:
+    """64-bit cluster codes for many token prefixes in one call.
+
+    Accepts an (N, W) integer matrix or a list of token sequences; each
+    row's first P tokens serialize once (uint32 little-endian) and hash to
+    an 8-byte digest, gathered into a single int64 array. The codes are
+    planner-ready numeric cluster ids: assign them to the `pcluster`
+    column and run_window skips its factorize pass entirely, with no hex
+    strings materialized in between.
+    """
+    if isinstance(tokens, np.ndarray) and tokens.ndim == 2:
+        mat = np.ascontiguousarray(tokens[:, :P], dtype="<u4")
+        rows = iter(mat)
+        n = len(mat)
+    else:
+        rows = (
+            np.asarray(
+                (t if isinstance(t, (list, tuple, np.ndarray)) else list(t))[:P],
+                dtype="<u4",
+            )
+            for t in tokens
+        )
+        n = len(tokens)
+    if n == 0:
+        return np.empty(0, np.int64)
+    digests = b"".join(_blake_digest(r.tobytes())[:8] for r in rows)
+    return np.frombuffer(digests, dtype="<u8").view(np.int64)
 
 
 def minhash_bucket(ngrams: List[int], bands: int = 16, rows: int = 4) -> int:
@@ -20,7 +20,28 @@ except Exception:  # Bodo not available; define a minimal shim with a no-op jit
 
     bodo = _NoBodo()  # type: ignore
 
-from .pipeline import score_and_filter, apply_tenant_caps, coalesce_intervals, apply_caps
+from .pipeline import _shrink, score_and_filter, apply_tenant_caps, coalesce_intervals, apply_caps
+
+# Optional Polars path for the pure-Python fallback: the fused lazy query
+# avoids the per-stage frame copies of the pandas pipeline.
+try:  # pragma: no cover - optional dependency
+    from .pipeline_pl import run_window_core_pl
+except ImportError:  # pragma: no cover - polars not installed
+    run_window_core_pl = None
+
+# Pure-Python mode is a process-level switch (see README); read it once at
+# import instead of parsing the environment on every window.
+_FORCE_PY = str(os.environ.get("BODOCACHE_PURE_PY", "")).lower() in ("1", "true", "yes")
+
+# First-failure latches for the alternate cores. A core that raises (e.g.
+# Bodo compilation failure, a Polars-side error) is remembered by identity
+# so later windows dispatch straight to the pandas implementation without
+# re-entering the failing path; rebinding the core (module reload,
+# monkeypatch teardown) clears the latch automatically.
+_run_core_failed = None
+_evict_core_failed = None
+_admit_core_failed = None
+_pl_core_failed = None
 
 @bodo.jit
 def run_window_core(
@@ -187,7 +208,31 @@ def run_window_core_py(
     max_ops_per_tier: int,
     enforce_tier_caps: bool,
 ) -> pd.DataFrame:
-    # Pure-Python fallback with structured stages mirroring the JIT path
+    # Pure-Python fallback with structured stages mirroring the JIT path.
+    # When polars is installed the fused lazy query takes over, with the
+    # pandas stages as the safety net; a failure latches the polars core
+    # the same way the bodo core latches instead of retrying every window.
+    global _pl_core_failed
+    if run_window_core_pl is not None and run_window_core_pl is not _pl_core_failed:
+        try:
+            return run_window_core_pl(
+                requests_df,
+                heat_df,
+                tier_caps_df,
+                tenant_caps_df,
+                layer_lat_df,
+                now_ms,
+                pmin,
+                umin,
+                min_io_bytes,
+                alpha,
+                beta,
+                window_ms,
+                max_ops_per_tier,
+                enforce_tier_caps,
+            )
+        except Exception:
+            _pl_core_failed = run_window_core_pl
     cand0 = score_and_filter(
         requests_df, heat_df, now_ms, pmin, umin, alpha, beta
     )
@@ -227,82 +272,92 @@ def run_window(
         codes, _ = pd.factorize(requests_df["prefix_id"], sort=False)
         requests_df = requests_df.copy()
         requests_df["pcluster"] = codes.astype(np.int64)
-
-    FORCE_PY = str(os.environ.get("BODOCACHE_PURE_PY", "")).lower() in ("1", "true", "yes")
-    if FORCE_PY:
-        plan_df = run_window_core_py(
-            requests_df,
-            heat_df,
-            tier_caps_df,
-            tenant_caps_df,
-            layer_lat_df,
-            now_ms,
-            pmin,
-            umin,
-            min_io_bytes,
-            alpha,
-            beta,
-            window_ms,
-            max_ops_per_tier,
-            bool(enforce_tier_caps),
+    # Narrow group/sort key columns before the cores run over them.
+    requests_df = _shrink(requests_df)
+    # String keys group and sort as packed categorical codes instead of
+    # object arrays. Categories are sorted, so categorical sorts match the
+    # previous lexical ordering; tenant uses one dtype across both frames so
+    # the tenant-caps merge stays categorical instead of upcasting to object.
+    if "node" in requests_df.columns and pd.api.types.is_string_dtype(
+        requests_df["node"]
+    ):
+        requests_df = requests_df.assign(node=requests_df["node"].astype("category"))
+    if (
+        "tenant" in requests_df.columns
+        and pd.api.types.is_string_dtype(requests_df["tenant"])
+        and "tenant" in tenant_caps_df.columns
+    ):
+        tenant_dtype = pd.CategoricalDtype(
+            sorted(
+                set(requests_df["tenant"].unique())
+                | set(tenant_caps_df["tenant"].unique())
+            )
+        )
+        requests_df = requests_df.assign(
+            tenant=requests_df["tenant"].astype(tenant_dtype)
+        )
+        tenant_caps_df = tenant_caps_df.assign(
+            tenant=tenant_caps_df["tenant"].astype(tenant_dtype)
         )
+
+    global _run_core_failed
+    core_args = (
+        requests_df,
+        heat_df,
+        tier_caps_df,
+        tenant_caps_df,
+        layer_lat_df,
+        now_ms,
+        pmin,
+        umin,
+        min_io_bytes,
+        alpha,
+        beta,
+        window_ms,
+        max_ops_per_tier,
+        bool(enforce_tier_caps),
+    )
+    if _FORCE_PY or run_window_core is _run_core_failed:
+        plan_df = run_window_core_py(*core_args)
     else:
         try:
-            plan_df = run_window_core(
-                requests_df,
-                heat_df,
-                tier_caps_df,
-                tenant_caps_df,
-                layer_lat_df,
-                now_ms,
-                pmin,
-                umin,
-                min_io_bytes,
-                alpha,
-                beta,
-                window_ms,
-                max_ops_per_tier,
-                bool(enforce_tier_caps),
-            )
+            plan_df = run_window_core(*core_args)
         except Exception:
             # Fallback to pure-Python core if JIT compilation/execution fails
-            plan_df = run_window_core_py(
-                requests_df,
-                heat_df,
-                tier_caps_df,
-                tenant_caps_df,
-                layer_lat_df,
-                now_ms,
-                pmin,
-                umin,
-                min_io_bytes,
-                alpha,
-                beta,
-                window_ms,
-                max_ops_per_tier,
-                bool(enforce_tier_caps),
-            )
-    # Prepare heat_df for JIT eviction (ensure size_bytes present)
-    heat2 = heat_df.copy()
-    if "size_bytes" not in heat2.columns:
-        heat2["size_bytes"] = np.int64(256 * 1024)
+            _run_core_failed = run_window_core
+            plan_df = run_window_core_py(*core_args)
+    # The categorical keys are an internal speedup; the plan keeps its
+    # string node column so consumers see the same schema as before.
+    if "node" in plan_df.columns and isinstance(
+        plan_df["node"].dtype, pd.CategoricalDtype
+    ):
+        plan_df = plan_df.assign(node=plan_df["node"].astype(str))
+    # Prepare heat_df for JIT eviction (ensure size_bytes present); only
+    # materialize a new frame when the column is actually missing
+    if "size_bytes" not in heat_df.columns:
+        heat2 = heat_df.assign(size_bytes=np.int64(256 * 1024))
+    else:
+        heat2 = heat_df
+    global _evict_core_failed, _admit_core_failed
     if bool(enable_eviction):
-        if FORCE_PY:
+        if _FORCE_PY or eviction_core is _evict_core_failed:
             evict = eviction_core_py(plan_df, heat2, tier_caps_df)
         else:
             try:
                 evict = eviction_core(plan_df, heat2, tier_caps_df)
             except Exception:
+                _evict_core_failed = eviction_core
                 evict = eviction_core_py(plan_df, heat2, tier_caps_df)
     else:
         evict = heat2[["layer", "page_id"]].head(0)
     if bool(enable_admission):
-        if FORCE_PY:
+        if _FORCE_PY or admission_core is _admit_core_failed:
             admission = admission_core_py(requests_df, heat_df, reuse_threshold=10.0)
         else:
             try:
                 admission = admission_core(requests_df, heat_df, reuse_threshold=10.0)
             except Exception:
+                _admit_core_failed = admission_core
                 admission = admission_core_py(requests_df, heat_df, reuse_threshold=10.0)
     else:
         admission = heat_df[["layer", "page_id"]].head(0)
@@ -336,12 +391,11 @@ def admission_core_py(
     heat_df: pd.DataFrame,
     reuse_threshold: float,
 ) -> pd.DataFrame:
-    df = requests_df.copy()
-    heat = heat_df.copy()
-    df["page_id"] = df["page_start"]
-    heat_cols = ["layer", "page_id", "decay_hits"]
-    heat = heat[heat_cols]
-    df = df.merge(heat, on=["layer", "page_id"], how="left")
+    heat = heat_df[["layer", "page_id", "decay_hits"]]
+    # merge yields a fresh frame; no up-front copies needed
+    df = requests_df.assign(page_id=requests_df["page_start"]).merge(
+        heat, on=["layer", "page_id"], how="left"
+    )
     df["decay_hits"] = df["decay_hits"].fillna(0).astype(np.int64)
     mask = df["decay_hits"].astype(float) >= float(reuse_threshold)
     admit = df[["layer", "page_id"]].copy()
@@ -391,9 +445,28 @@ def eviction_core_py(
     need = need[need["deficit"] > 0][["tier_dst", "deficit"]]
     if len(need) == 0:
         return heat_df[["layer", "page_id"]].head(0)
-    df = heat_df.copy()
-    df = df.sort_values("decay_hits", ascending=True)[["layer", "page_id", "size_bytes"]]
-    df["cum"] = df["size_bytes"].cumsum()
-    target = need["deficit"].sum()
-    ev = df[df["cum"] <= target][["layer", "page_id"]]
+    target = int(need["deficit"].sum())
+    dh = heat_df["decay_hits"].to_numpy()
+    sb = heat_df["size_bytes"].to_numpy(dtype=np.int64)
+    n = len(dh)
+    if n == 0:
+        return heat_df[["layer", "page_id"]].head(0)
+    # Partial selection: partition out the coldest k pages and only sort
+    # those; the full heat table never sorts when the deficit is small.
+    # Grow k when the candidate pool's cumulative size falls short.
+    k = min(n, int(target // max(int(sb.min()), 1)) * 4 + 16)
+    while True:
+        if k >= n:
+            order = np.argsort(dh, kind="stable")
+            pool = n
+        else:
+            idx = np.argpartition(dh, k)[:k]
+            order = idx[np.argsort(dh[idx], kind="stable")]
+            pool = k
+        cum = np.cumsum(sb[order])
+        cut = int(np.searchsorted(cum, target, side="right"))
+        if cut < pool or pool == n:
+            break
+        k = min(n, k * 2)
+    ev = heat_df.iloc[order[:cut]][["layer", "page_id"]]
     return ev.reset_index(drop=True)
@@ -4,14 +4,69 @@ import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Any, Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
+# Optional orjson for fast (de)serialization of large plan payloads
+try:  # pragma: no cover - trivial import/fallback
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - fallback path
+    orjson = None  # type: ignore
+
 from bodocache.planner.scheduler import run_window
 
 
+def _dumps(body: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(body).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+# Wire dtypes for numeric columns: columnar payloads decode straight into
+# typed arrays, skipping pandas' per-value inference. String columns
+# (node, tenant, ids) are absent on purpose and pass through as-is.
+_WIRE_DTYPES: Dict[str, str] = {
+    "layer": "int64",
+    "page_id": "int64",
+    "page_start": "int64",
+    "page_end": "int64",
+    "tier": "int64",
+    "tier_src": "int64",
+    "tier_dst": "int64",
+    "deadline_ms": "int64",
+    "page_bytes": "int64",
+    "est_fill_ms": "float64",
+    "decay_hits": "int64",
+    "tenant_weight": "float64",
+    "bandwidth_caps": "int64",
+    "free_bytes": "int64",
+    "lat_ms": "float64",
+}
+
+
 def df_from_json(obj: Any, columns: list[str]) -> pd.DataFrame:
+    """Build a table from either wire representation.
+
+    A dict is treated as column-oriented (``{col: [vals...]}``): each
+    numeric column decodes in one shot into a typed contiguous array,
+    with no per-row dicts built and no dtype inference. A list keeps the
+    original record-oriented behaviour for older clients.
+    """
     if obj is None:
         return pd.DataFrame(columns=columns)
+    if isinstance(obj, dict):
+        data: Dict[str, Any] = {}
+        for c in columns:
+            vals = obj.get(c, [])
+            dt = _WIRE_DTYPES.get(c)
+            data[c] = np.asarray(vals, dtype=dt) if dt is not None else vals
+        return pd.DataFrame(data, columns=columns)
     return pd.DataFrame(obj, columns=columns)
 
 
@@ -42,9 +97,25 @@ def plan_from_payload(payload: Dict[str, Any]) -> Tuple[pd.DataFrame, pd.DataFra
     return plan_df, evict_df, admission_df
 
 
+def _plan_response(payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    # Columnar in, columnar out: clients sending column-oriented tables
+    # get column-oriented frames back (one list per column instead of one
+    # dict per plan row).
+    orient = "list" if isinstance(payload.get("requests"), dict) else "records"
+    try:
+        plan_df, evict_df, admission_df = plan_from_payload(payload)
+    except Exception as e:
+        return 500, {"error": str(e)}
+    return 200, {
+        "plan": plan_df.to_dict(orient=orient),
+        "evict": evict_df.to_dict(orient=orient),
+        "admission": admission_df.to_dict(orient=orient),
+    }
+
+
 class PlannerHandler(BaseHTTPRequestHandler):
     def _send(self, code: int, body: Dict[str, Any]):
-        data = json.dumps(body).encode("utf-8")
+        data = _dumps(body)
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(data)))
@@ -55,21 +126,13 @@ class PlannerHandler(BaseHTTPRequestHandler):
         length = int(self.headers.get("Content-Length", "0"))
         raw = self.rfile.read(length)
         try:
-            payload = json.loads(raw.decode("utf-8"))
+            payload = _loads(raw)
         except Exception as e:
             self._send(400, {"error": f"invalid json: {e}"})
             return
         if self.path == "/get_plan":
-            try:
-                plan_df, evict_df, admission_df = plan_from_payload(payload)
-                body = {
-                    "plan": plan_df.to_dict(orient="records"),
-                    "evict": evict_df.to_dict(orient="records"),
-                    "admission": admission_df.to_dict(orient="records"),
-                }
-                self._send(200, body)
-            except Exception as e:
-                self._send(500, {"error": str(e)})
+            code, body = _plan_response(payload)
+            self._send(code, body)
         elif self.path == "/report":
             # Accept perf counters and acknowledge
             self._send(200, {"ok": True})
@@ -81,3 +144,45 @@ def serve(host: str = "0.0.0.0", port: int = 8080):
     httpd = HTTPServer((host, port), PlannerHandler)
     httpd.serve_forever()
 
+
+def serve_asgi(host: str = "0.0.0.0", port: int = 8080):
+    """Async variant of serve() that handles requests concurrently.
+
+    Planning itself is CPU-bound pandas work, so it runs in the ASGI
+    threadpool; the event loop stays free to read/write other requests
+    while a window is being planned. Requires the optional starlette and
+    uvicorn packages (the stdlib serve() remains the default).
+    """
+    try:  # pragma: no cover - optional dependency
+        import uvicorn  # type: ignore
+        from starlette.applications import Starlette  # type: ignore
+        from starlette.concurrency import run_in_threadpool  # type: ignore
+        from starlette.responses import Response  # type: ignore
+        from starlette.routing import Route  # type: ignore
+    except ImportError as e:  # pragma: no cover - fallback path
+        raise RuntimeError(
+            "serve_asgi requires the starlette and uvicorn packages; "
+            "use serve() for the stdlib server"
+        ) from e
+
+    def _json_response(code: int, body: Dict[str, Any]) -> Any:
+        return Response(_dumps(body), status_code=code, media_type="application/json")
+
+    async def get_plan(request):
+        raw = await request.body()
+        try:
+            payload = _loads(raw)
+        except Exception as e:
+            return _json_response(400, {"error": f"invalid json: {e}"})
+        code, body = await run_in_threadpool(_plan_response, payload)
+        return _json_response(code, body)
+
+    async def report(request):
+        return _json_response(200, {"ok": True})
+
+    app = Starlette(routes=[
+        Route("/get_plan", get_plan, methods=["POST"]),
+        Route("/report", report, methods=["POST"]),
+    ])
+    uvicorn.run(app, host=host, port=port)
+
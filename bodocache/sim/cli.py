@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import time
 import secrets
+from dataclasses import replace
 
 import pandas as pd
 
@@ -53,33 +54,39 @@ def parse_args() -> argparse.Namespace:
 def main():
     args = parse_args()
     cfg = load_config_typed()
-    # Apply CLI overrides
+    # Apply CLI overrides; the config is frozen (and shared via the loader
+    # cache), so derive copies instead of mutating.
+    top: dict = {}
     if args.window_ms is not None:
-        cfg.window_ms = int(args.window_ms)
+        top['window_ms'] = int(args.window_ms)
     if args.min_io is not None:
-        cfg.min_io_bytes = int(args.min_io)
+        top['min_io_bytes'] = int(args.min_io)
     if args.max_ops is not None:
-        cfg.max_ops_per_tier = int(args.max_ops)
+        top['max_ops_per_tier'] = int(args.max_ops)
+    thr: dict = {}
     if args.pmin is not None:
-        cfg.thresholds.pmin = float(args.pmin)
+        thr['pmin'] = float(args.pmin)
     if args.umin is not None:
-        cfg.thresholds.umin = float(args.umin)
+        thr['umin'] = float(args.umin)
+    if thr:
+        top['thresholds'] = replace(cfg.thresholds, **thr)
+    pop: dict = {}
     if args.alpha is not None:
-        cfg.popularity.alpha = float(args.alpha)
+        pop['alpha'] = float(args.alpha)
     if args.beta is not None:
-        cfg.popularity.beta = float(args.beta)
-    if args.enable_prefix_fanout is not None:
-        cfg.ab_flags.enable_prefix_fanout = bool(args.enable_prefix_fanout)
-    if args.enable_tenant_credits is not None:
-        cfg.ab_flags.enable_tenant_credits = bool(args.enable_tenant_credits)
-    if args.enable_admission is not None:
-        cfg.ab_flags.enable_admission = bool(args.enable_admission)
-    if args.enable_eviction is not None:
-        cfg.ab_flags.enable_eviction = bool(args.enable_eviction)
-    if args.enable_overlap is not None:
-        cfg.ab_flags.enable_overlap = bool(args.enable_overlap)
-    if args.enforce_tier_caps is not None:
-        cfg.ab_flags.enforce_tier_caps = bool(args.enforce_tier_caps)
+        pop['beta'] = float(args.beta)
+    if pop:
+        top['popularity'] = replace(cfg.popularity, **pop)
+    flags: dict = {}
+    for name in ('enable_prefix_fanout', 'enable_tenant_credits', 'enable_admission',
+                 'enable_eviction', 'enable_overlap', 'enforce_tier_caps'):
+        val = getattr(args, name)
+        if val is not None:
+            flags[name] = bool(val)
+    if flags:
+        top['ab_flags'] = replace(cfg.ab_flags, **flags)
+    if top:
+        cfg = replace(cfg, **top)
 
     req = synthetic_requests()
     if cfg.ab_flags.enable_prefix_fanout:
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+
+
+class TelemetryLogger:
+    """Append-only CSV logger for per-window planner telemetry.
+
+    Each window's inputs (requests, heat, tier caps, latencies) and outputs
+    (plan, exec metrics, evictions, admissions) are appended to per-table CSV
+    files under `base_dir`, tagged with a wall-clock timestamp column.
+    """
+
+    def __init__(self, base_dir: str = "telemetry"):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _append(self, name: str, df: Optional[pd.DataFrame], ts: str) -> None:
+        if df is None or df.empty:
+            return
+        path = os.path.join(self.base_dir, f"{name}.csv")
+        out = df.copy()
+        out["ts"] = ts
+        out.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+    def log_window(
+        self,
+        req_df: pd.DataFrame,
+        heat_df: pd.DataFrame,
+        tier_caps_df: pd.DataFrame,
+        layer_lat_df: pd.DataFrame,
+        plan_df: pd.DataFrame,
+        exec_df: Optional[pd.DataFrame] = None,
+        evict_df: Optional[pd.DataFrame] = None,
+        admission_df: Optional[pd.DataFrame] = None,
+    ) -> None:
+        ts = datetime.now(timezone.utc).isoformat()
+        self._append("requests", req_df, ts)
+        self._append("heat", heat_df, ts)
+        self._append("tiers", tier_caps_df, ts)
+        self._append("latencies", layer_lat_df, ts)
+        self._append("plans", plan_df, ts)
+        self._append("exec", exec_df, ts)
+        self._append("evictions", evict_df, ts)
+        self._append("admissions", admission_df, ts)
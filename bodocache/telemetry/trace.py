@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict, field
+from typing import List
+
+import pandas as pd
+
+
+@dataclass
+class PrefetchEvent:
+    """One completed prefetch copy, with its deadline outcome."""
+
+    window_ms: int
+    now_ms: int
+    node: str
+    model_id: str
+    model_version: str
+    layer: int
+    start_pid: int
+    end_pid: int
+    bytes: int
+    deadline_rel_ms: float
+    finish_rel_ms: float
+    on_time: int
+
+
+@dataclass
+class TraceRecorder:
+    """In-memory recorder for prefetch events emitted by adapters."""
+
+    events: List[PrefetchEvent] = field(default_factory=list)
+
+    def record(self, ev: PrefetchEvent) -> None:
+        self.events.append(ev)
+
+    def record_batch(self, evs: List[PrefetchEvent]) -> None:
+        """Append a whole window's events in one call."""
+        self.events.extend(evs)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        if not self.events:
+            return pd.DataFrame()
+        return pd.DataFrame.from_records([asdict(e) for e in self.events])
+
+    def clear(self) -> None:
+        self.events.clear()
@@ -2,6 +2,9 @@
 #include <pybind11/pytypes.h>
 #include <pybind11/functional.h>
 #include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+#include <string>
+#include <vector>
 #include <fcntl.h>
 #include <unistd.h>
 #include <string.h>
@@ -77,7 +80,89 @@ static ssize_t read_range_into(const std::string& path, uint64_t offset, size_t
   return static_cast<ssize_t>(submitted);
 }
 
+static void* writable_ptr(py::handle out_buf, size_t min_size) {
+  void* dst = nullptr; size_t nbytes = 0;
+  if (PyMemoryView_Check(out_buf.ptr())) {
+    py::memoryview mv = py::reinterpret_borrow<py::memoryview>(out_buf);
+    if (mv.readonly()) throw std::runtime_error("buffer must be writable");
+    dst = mv.data(); nbytes = mv.nbytes();
+  } else if (PyObject_CheckBuffer(out_buf.ptr())) {
+    py::buffer buf = py::reinterpret_borrow<py::buffer>(out_buf);
+    py::buffer_info info = buf.request();
+    dst = info.ptr; nbytes = (size_t)info.size * (size_t)info.itemsize;
+  } else {
+    throw std::runtime_error("out_buf must support buffer protocol");
+  }
+  if (nbytes < min_size) throw std::runtime_error("out_buf too small");
+  return dst;
+}
+
+// Batched variant: N reads share one ring, one io_uring_submit and one
+// wait-for-N reap instead of a syscall round-trip per range.
+static std::vector<ssize_t> read_ranges_into(const std::vector<std::string>& paths,
+                                             const std::vector<uint64_t>& offsets,
+                                             const std::vector<uint64_t>& sizes,
+                                             py::list out_bufs) {
+  const size_t n = paths.size();
+  if (offsets.size() != n || sizes.size() != n || (size_t)py::len(out_bufs) != n)
+    throw std::runtime_error("paths/offsets/sizes/out_bufs length mismatch");
+  if (n == 0) return {};
+
+  // Resolve buffers and open fds while we still hold the GIL.
+  std::vector<void*> dsts(n);
+  std::vector<int> fds(n);
+  for (size_t i = 0; i < n; ++i) {
+    dsts[i] = writable_ptr(out_bufs[i], sizes[i]);
+    fds[i] = ::open(paths[i].c_str(), O_RDONLY);
+    if (fds[i] < 0) {
+      for (size_t j = 0; j < i; ++j) ::close(fds[j]);
+      throw std::runtime_error("open failed: " + std::string(strerror(errno)));
+    }
+  }
+
+  std::vector<ssize_t> done(n, 0);
+  std::string error;
+  {
+    py::gil_scoped_release release;
+    io_uring ring;
+    unsigned depth = n < 256 ? (unsigned)n : 256u;
+    if (io_uring_queue_init(depth, &ring, 0) < 0) {
+      error = "io_uring_queue_init failed";
+    } else {
+      size_t queued = 0, reaped = 0;
+      while (reaped < n && error.empty()) {
+        while (queued < n) {
+          io_uring_sqe* sqe = io_uring_get_sqe(&ring);
+          if (!sqe) break;  // SQ full; submit and reap first
+          io_uring_prep_read(sqe, fds[queued], dsts[queued], sizes[queued], offsets[queued]);
+          io_uring_sqe_set_data64(sqe, queued);
+          ++queued;
+        }
+        io_uring_submit(&ring);
+        io_uring_cqe* cqe = nullptr;
+        if (io_uring_wait_cqe(&ring, &cqe) < 0) {
+          error = "io_uring_wait_cqe failed";
+          break;
+        }
+        size_t idx = (size_t)io_uring_cqe_get_data64(cqe);
+        if (cqe->res < 0) {
+          error = "read failed: errno " + std::to_string(-cqe->res);
+        } else {
+          done[idx] = cqe->res;
+        }
+        io_uring_cqe_seen(&ring, cqe);
+        ++reaped;
+      }
+      io_uring_queue_exit(&ring);
+    }
+  }
+  for (size_t i = 0; i < n; ++i) ::close(fds[i]);
+  if (!error.empty()) throw std::runtime_error(error);
+  return done;
+}
+
 PYBIND11_MODULE(bodocache_agent_io_uring, m) {
   m.def("read_range_into", &read_range_into, py::arg("path"), py::arg("offset"), py::arg("size"), py::arg("out_buf"));
+  m.def("read_ranges_into", &read_ranges_into, py::arg("paths"), py::arg("offsets"), py::arg("sizes"), py::arg("out_bufs"));
 }
 
@@ -0,0 +1,68 @@
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <unistd.h>
+#include <string.h>
+#include <string>
+
+namespace py = pybind11;
+
+// Bulk pread helper: read N (offset, size) extents from one fd into a single
+// destination buffer, packed back-to-back, with the GIL released around the
+// pread loop so planner threads keep running during I/O.
+static ssize_t read_range_into_bulk(int fd,
+                                    py::array_t<uint64_t, py::array::c_style | py::array::forcecast> offsets,
+                                    py::array_t<uint64_t, py::array::c_style | py::array::forcecast> sizes,
+                                    py::object out_buf) {
+  const size_t n = (size_t)offsets.size();
+  if ((size_t)sizes.size() != n) throw std::runtime_error("offsets/sizes length mismatch");
+  if (n == 0) return 0;
+
+  void* dst = nullptr; size_t nbytes = 0;
+  if (PyMemoryView_Check(out_buf.ptr())) {
+    py::memoryview mv = py::reinterpret_borrow<py::memoryview>(out_buf);
+    if (mv.readonly()) throw std::runtime_error("buffer must be writable");
+    dst = mv.data(); nbytes = mv.nbytes();
+  } else if (PyObject_CheckBuffer(out_buf.ptr())) {
+    py::buffer buf = py::reinterpret_borrow<py::buffer>(out_buf);
+    py::buffer_info info = buf.request();
+    dst = info.ptr; nbytes = (size_t)info.size * (size_t)info.itemsize;
+  } else {
+    throw std::runtime_error("out_buf must support buffer protocol");
+  }
+
+  const uint64_t* off = offsets.data();
+  const uint64_t* sz = sizes.data();
+  size_t total = 0;
+  for (size_t i = 0; i < n; ++i) total += (size_t)sz[i];
+  if (nbytes < total) throw std::runtime_error("out_buf too small");
+
+  ssize_t done = 0;
+  std::string error;
+  {
+    py::gil_scoped_release release;
+    char* p = reinterpret_cast<char*>(dst);
+    for (size_t i = 0; i < n && error.empty(); ++i) {
+      size_t remaining = (size_t)sz[i];
+      uint64_t file_off = off[i];
+      while (remaining > 0) {
+        ssize_t r = ::pread(fd, p, remaining, (off_t)file_off);
+        if (r < 0) {
+          error = "pread failed: " + std::string(strerror(errno));
+          break;
+        }
+        if (r == 0) {
+          error = "short read: hit EOF";
+          break;
+        }
+        p += r; file_off += (uint64_t)r; remaining -= (size_t)r; done += r;
+      }
+    }
+  }
+  if (!error.empty()) throw std::runtime_error(error);
+  return done;
+}
+
+PYBIND11_MODULE(bodocache_segio, m) {
+  m.def("read_range_into_bulk", &read_range_into_bulk,
+        py::arg("fd"), py::arg("offsets"), py::arg("sizes"), py::arg("out_buf"));
+}
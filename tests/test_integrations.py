@@ -17,7 +17,9 @@ def test_vllm_adapter_prefetch_sim(tmp_path):
     for pid in range(8):
         be.write_page("m", "v", 0, pid, 4096, secrets.token_bytes(4096))
     agent = NodeAgent(be, page_bytes=4096)
-    adapter = VLLMBCacheAdapter(agent, node="n0", model_id="m", model_version="v", min_io_bytes=0)
+    adapter = VLLMBCacheAdapter(
+        agent, node="n0", model_id="m", model_version="v", min_io_bytes=0, emit_route_hints=True
+    )
     now_ms = int(time.time() * 1000)
     reqs = [
         KVRequest(
@@ -133,6 +135,7 @@ def test_vllm_adapter_prefetch_hints(tmp_path):
         model_version="v",
         min_io_bytes=0,
         hint_provider=hint_provider,
+        emit_route_hints=True,
     )
     now_ms = int(time.time() * 1000)
     live_req = KVRequest(
@@ -176,6 +179,7 @@ def test_vllm_adapter_prefetch_hint_dedup(tmp_path):
         model_version="v",
         min_io_bytes=0,
         hint_provider=hint_provider,
+        emit_route_hints=True,
     )
     now_ms = int(time.time() * 1000)
     req = KVRequest(